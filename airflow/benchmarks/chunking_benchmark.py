@@ -0,0 +1,130 @@
+"""
+Microbenchmark of cluster_based_chunking: documents/second before and after vectorizing
+the adjacent-similarity computation, and with the multi-document batch API.
+
+"boundaries" times boundary detection alone on precomputed random embeddings;
+"end-to-end" includes the encoder, comparing one encoder call per document with one
+shared call for the whole batch. Both check that the chunks match the old implementation.
+
+Usage (from airflow/):
+    PYTHONPATH=. python benchmarks/chunking_benchmark.py --documents 200
+    PYTHONPATH=. python benchmarks/chunking_benchmark.py --documents 50 --end-to-end
+"""
+import argparse
+import random
+import time
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+from scripts.chunking import (
+    cluster_based_chunking_batch,
+    cluster_based_chunking_with_embeddings,
+    cluster_sentences,
+    compute_embeddings,
+    tokenize_sentences,
+)
+
+SENTENCES = [
+    "The onsite loop had four rounds.",
+    "Two of them were coding interviews with medium and hard problems.",
+    "The system design round asked for a rate limiter.",
+    "Behavioural questions focused on ownership and conflict.",
+    "I prepared with mock interviews for six weeks!",
+    "Did anyone else get a take-home assignment?",
+    "The recruiter was responsive throughout the process.",
+    "Compensation negotiation took another two weeks.",
+]
+
+
+def legacy_cluster_sentences(sentences, embeddings, max_chunk_size=500, similarity_threshold=0.75):
+    # The per-pair scikit-learn loop the chunker used before, kept as the baseline.
+    clusters, current_chunk, current_size = [], [], 0
+    for i, sentence in enumerate(sentences):
+        if i == 0:
+            current_chunk, current_size = [i], len(sentence)
+            continue
+        similarity = cosine_similarity([embeddings[i]], [embeddings[i - 1]])[0][0]
+        if similarity > similarity_threshold and (current_size + len(sentence)) <= max_chunk_size:
+            current_chunk.append(i)
+            current_size += len(sentence)
+        else:
+            clusters.append(current_chunk)
+            current_chunk, current_size = [i], len(sentence)
+    if current_chunk:
+        clusters.append(current_chunk)
+    return clusters
+
+
+def make_documents(count, sentences_per_document, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SENTENCES) for _ in range(sentences_per_document)) for _ in range(count)]
+
+
+def rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def bench_boundaries(documents, dimension=384, seed=0):
+    rng = np.random.default_rng(seed)
+    prepared = []
+    for document in documents:
+        sentences = tokenize_sentences(document)
+        # Correlated neighbours, so both merges and boundaries occur.
+        embeddings = np.cumsum(rng.normal(size=(len(sentences), dimension)), axis=0).astype(np.float32)
+        prepared.append((sentences, embeddings))
+
+    start = time.perf_counter()
+    legacy = [legacy_cluster_sentences(s, e) for s, e in prepared]
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized = [cluster_sentences(s, e) for s, e in prepared]
+    vectorized_seconds = time.perf_counter() - start
+
+    assert legacy == vectorized, "vectorized boundaries differ from the legacy implementation"
+    print(f"boundaries  legacy     {rate(len(documents), legacy_seconds):>10.0f} docs/s")
+    print(f"boundaries  vectorized {rate(len(documents), vectorized_seconds):>10.0f} docs/s "
+          f"({legacy_seconds / vectorized_seconds:.1f}x)")
+
+
+def bench_end_to_end(documents):
+    compute_embeddings(["warm up the encoder"])
+
+    start = time.perf_counter()
+    legacy = []
+    for document in documents:
+        sentences = tokenize_sentences(document)
+        clusters = legacy_cluster_sentences(sentences, compute_embeddings(sentences))
+        legacy.append([" ".join(sentences[i] for i in cluster) for cluster in clusters])
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_document = [cluster_based_chunking_with_embeddings(d, embedding_mode="none")[0] for d in documents]
+    per_document_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = [chunks for chunks, _ in cluster_based_chunking_batch(documents, embedding_mode="none")]
+    batched_seconds = time.perf_counter() - start
+
+    # Batch composition can shift embeddings in the last decimals, so only per-document runs must match exactly.
+    assert legacy == per_document, "chunks differ from the legacy implementation"
+    changed = sum(a != b for a, b in zip(legacy, batched))
+    print(f"end-to-end  legacy       {rate(len(documents), legacy_seconds):>8.1f} docs/s")
+    print(f"end-to-end  per-document {rate(len(documents), per_document_seconds):>8.1f} docs/s")
+    print(f"end-to-end  batched      {rate(len(documents), batched_seconds):>8.1f} docs/s "
+          f"({legacy_seconds / batched_seconds:.1f}x; {changed} documents chunked differently)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=30, help="Sentences per document")
+    parser.add_argument("--end-to-end", action="store_true", help="Also time chunking with the real encoder")
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents, args.sentences)
+    bench_boundaries(documents)
+    if args.end_to_end:
+        bench_end_to_end(documents)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from airflow.models import Variable
 import pandas as pd
 
 from scripts.coursera_scrapper import scrape_coursera_courses
+from scripts.catalog_replica import refresh_catalog_replica
 
 default_args = {
     "start_date": days_ago(1),
@@ -80,5 +81,11 @@ with DAG(
         provide_context=True,
     )
 
+    refresh_replica_task = PythonOperator(
+        task_id="refresh_catalog_replica",
+        python_callable=refresh_catalog_replica,
+        provide_context=True,
+    )
+
     # Set task dependencies
-    scrape_task >> dbt_deps_task >> dbt_seed_task >> dbt_run_task >> dbt_test_task >> delete_csv
\ No newline at end of file
+    scrape_task >> dbt_deps_task >> dbt_seed_task >> dbt_run_task >> dbt_test_task >> delete_csv >> refresh_replica_task
\ No newline at end of file
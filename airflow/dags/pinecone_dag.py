@@ -8,10 +8,15 @@ from airflow.models import Variable
  
 import os
 from scripts.pinecone_rag import embed_texts, fetch_interview_tips, add_chunks_to_pinecone
-from scripts.chunking import cluster_based_chunking
+from scripts.chunking import cluster_based_chunking_batch
+from scripts.local_vector_store import export_pinecone_index, publish_local_vector_store
+from scripts.bm25_index import publish_bm25_index
 import asyncio
  
  
+# "pooled" reuses the sentence embeddings computed while chunking; "reencode" embeds each chunk again.
+CHUNK_EMBEDDING_MODE = os.getenv("CHUNK_EMBEDDING_MODE", "pooled").lower()
+ 
 default_args = {
     'owner': 'airflow',
     'depends_on_past': False,
@@ -64,11 +69,13 @@ def chunk_task_fn(**kwargs):
     ti = kwargs['ti']
     posts = ti.xcom_pull(task_ids='fetch_reddit_posts')
     all_chunks = []
-    for post in posts:
-        text = post["title"] + "\n\n" + post["text"]
-        chunks = cluster_based_chunking(text, max_chunk_size=500)
+    # All posts' sentences go through the encoder together.
+    texts = [post["title"] + "\n\n" + post["text"] for post in posts]
+    chunked = cluster_based_chunking_batch(texts, max_chunk_size=500, embedding_mode=CHUNK_EMBEDDING_MODE)
+    for post, (chunks, embeddings) in zip(posts, chunked):
         print(f"Post: {post['title'][:50]}... → Generated {len(chunks)} chunks")
-        all_chunks.append({"post": post, "chunks": chunks})
+        # CHUNK_EMBEDDING_MODE=none leaves the vectors to embed_task_fn.
+        all_chunks.append({"post": post, "chunks": chunks, "embeddings": embeddings.tolist() if embeddings is not None else None})
     return all_chunks
  
 def embed_task_fn(**kwargs):
@@ -78,7 +85,10 @@ def embed_task_fn(**kwargs):
     for entry in chunked_data:
         post = entry["post"]
         chunks = entry["chunks"]
-        embeddings = embed_texts(chunks).tolist()
+        # Only chunks that arrive without vectors are encoded here.
+        embeddings = entry.get("embeddings")
+        if embeddings is None:
+            embeddings = embed_texts(chunks).tolist()
         embedded_data.append({"post": post, "chunks": chunks, "embeddings": embeddings})
     return embedded_data
  
@@ -102,11 +112,21 @@ def upload_task_fn(**kwargs):
         company = post.get("company", "Unknown")
         count = add_chunks_to_pinecone(
             chunks, post, role=role, company=company,
-            api_key=pinecone_api_key, environment=pinecone_env, index_name=index_name
+            api_key=pinecone_api_key, environment=pinecone_env, index_name=index_name,
+            embeddings=entry["embeddings"]
         )
         print(f"Uploaded {count} vectors to Pinecone for post ID: {post.get('id')}")
     print("Upload complete.")
  
+def publish_indexes_task_fn(**kwargs):
+    # Snapshots of the whole corpus: the vectors for VECTOR_STORE=local and the BM25 index for hybrid retrieval.
+    pinecone_api_key = Variable.get("PINECONE_API_KEY")
+    index_name = Variable.get("INDEX_NAME", default_var="fp-reddit-test")
+    ids, vectors, metadatas = export_pinecone_index(pinecone_api_key, index_name)
+    publish_local_vector_store(ids, vectors, metadatas)
+    publish_bm25_index(ids, metadatas)
+    print(f"Published local vector store and BM25 index over {len(ids)} chunks.")
+ 
 fetch_task = PythonOperator(
     task_id='fetch_reddit_posts',
     python_callable=fetch_task_fn,
@@ -131,4 +151,10 @@ upload_task = PythonOperator(
     dag=dag,
 )
  
-fetch_task >> chunk_task >> embed_task >> upload_task
\ No newline at end of file
+publish_indexes_task = PythonOperator(
+    task_id='publish_retrieval_indexes',
+    python_callable=publish_indexes_task_fn,
+    dag=dag,
+)
+ 
+fetch_task >> chunk_task >> embed_task >> upload_task >> publish_indexes_task
\ No newline at end of file
@@ -8,6 +8,7 @@ from airflow.utils.dates import days_ago
 import pandas as pd
 import os
 from scripts.linkedin_job_scraper import scrape_jobs_for_role
+from scripts.catalog_replica import refresh_catalog_replica
 
 def scrape_and_save(**context):
     role = context['dag_run'].conf.get("job_role", "Data Scientist") 
@@ -78,4 +79,10 @@ with DAG(
         python_callable=delete_seed_csv,
     )
 
-    scrape_task >> seed_task >> run_task >> test_task >> cleanup_task
\ No newline at end of file
+    refresh_replica_task = PythonOperator(
+        task_id="refresh_catalog_replica",
+        python_callable=refresh_catalog_replica,
+        provide_context=True,
+    )
+
+    scrape_task >> seed_task >> run_task >> test_task >> cleanup_task >> refresh_replica_task
\ No newline at end of file
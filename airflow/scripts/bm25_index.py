@@ -0,0 +1,57 @@
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from dotenv import load_dotenv
+from scripts.catalog_replica import upload_catalog_file
+
+load_dotenv()
+
+# Read by the backend's LocalBM25Index for hybrid retrieval (RETRIEVAL_MODE=hybrid).
+BM25_INDEX_S3_KEY = os.getenv("BM25_INDEX_S3_KEY", "rag/faq_bm25.json")
+
+# Must match the tokenizer and STOPWORDS in backend/utils/bm25_index.py (checked by
+# backend/tests/test_airflow_scripts.py); keeps "c++", "c#" and "l5" whole.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+# Function words dropped at build and query time, so a chunk never matches on "the" or "for" alone.
+STOPWORDS = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any", "are",
+    "as", "at", "be", "because", "been", "before", "being", "below", "between", "both", "but",
+    "by", "can", "could", "did", "do", "does", "doing", "down", "during", "each", "few", "for",
+    "from", "further", "had", "has", "have", "having", "he", "her", "here", "hers", "him",
+    "his", "how", "i", "if", "in", "into", "is", "it", "its", "itself", "just", "me", "more",
+    "most", "my", "no", "nor", "not", "of", "off", "on", "once", "only", "or", "other", "our",
+    "ours", "out", "over", "own", "same", "she", "should", "so", "some", "such", "than",
+    "that", "the", "their", "theirs", "them", "then", "there", "these", "they", "this",
+    "those", "through", "to", "too", "under", "until", "up", "very", "was", "we", "were",
+    "what", "when", "where", "which", "while", "who", "whom", "why", "will", "with", "would",
+    "you", "your", "yours",
+})
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def build_bm25_index(ids, texts, metadatas):
+    """Inverted index over the chunk texts: postings map each term to [row, term frequency] pairs."""
+    postings, doc_lengths = {}, []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text or "")
+        doc_lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            postings.setdefault(term, []).append([row, tf])
+    return {"ids": list(ids), "metadata": list(metadatas), "doc_lengths": doc_lengths, "postings": postings}
+
+
+def publish_bm25_index(ids, metadatas):
+    """Build the BM25 index over the chunks' text metadata and publish it to S3."""
+    index = build_bm25_index(ids, [m.get("text", "") for m in metadatas], metadatas)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "faq_bm25.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        print(f"Built BM25 index over {len(ids)} chunks with {len(index['postings'])} terms")
+        upload_catalog_file(path, BM25_INDEX_S3_KEY)
+    return len(ids)
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import tempfile
+import time
+# Not in poetry.lock: boto3 comes with apache-airflow-providers-amazon, which the apache/airflow base image ships.
+import boto3
+import numpy as np
+import snowflake.connector
+from dotenv import load_dotenv
+from scripts.embeddings import get_embedder
+
+load_dotenv()
+
+CATALOG_REPLICA_S3_KEY = os.getenv("CATALOG_REPLICA_S3_KEY", "catalog/catalog_replica.db")
+CATALOG_EMBEDDINGS_S3_KEY = os.getenv("CATALOG_EMBEDDINGS_S3_KEY", "catalog/catalog_embeddings.npz")
+
+# Replica tables mirror the dbt marts. The trigram tokenizer lets the backend run
+# case-insensitive substring searches (the Snowflake ILIKE '%term%' semantics) off the index.
+REPLICA_SCHEMA = """
+CREATE VIRTUAL TABLE courses USING fts5(
+    title, skills, job_role,
+    url UNINDEXED, rating UNINDEXED, reviews UNINDEXED,
+    tokenize = 'trigram'
+);
+CREATE VIRTUAL TABLE jobs USING fts5(
+    job_title, description, role,
+    company_name UNINDEXED, location UNINDEXED, job_url UNINDEXED,
+    tokenize = 'trigram'
+);
+CREATE TABLE replica_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+COURSES_QUERY = "SELECT TITLE, SKILLS, JOB_ROLE, URL, RATING, REVIEWS FROM COURSES_CLEANED"
+JOBS_QUERY = "SELECT JOB_TITLE, DESCRIPTION, ROLE, COMPANY_NAME, LOCATION, JOB_URL FROM CLEANED_LINKEDIN_JOBS"
+
+
+def get_snowflake_connection():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "FINAL_PROJECT"),
+        schema=os.getenv("SNOWFLAKE_SCHEMA", "DATA_STORE"),
+        role=os.getenv("SNOWFLAKE_ROLE"),
+    )
+
+
+def fetch_catalog_rows():
+    conn = get_snowflake_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(COURSES_QUERY)
+        courses = cursor.fetchall()
+        cursor.execute(JOBS_QUERY)
+        jobs = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return courses, jobs
+
+
+def build_catalog_replica(db_path, courses, jobs, build_id):
+    """
+    Write both catalogs into a fresh SQLite file at db_path.
+
+    The file is built next to db_path and moved into place, so readers never see a partial replica.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(db_path)))
+    os.close(fd)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(REPLICA_SCHEMA)
+        # Rows get rowids 1..n in fetch order; the embedding index refers to them by rowid.
+        conn.executemany("INSERT INTO courses(rowid, title, skills, job_role, url, rating, reviews) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         [(i, *row) for i, row in enumerate(courses, start=1)])
+        conn.executemany("INSERT INTO jobs(rowid, job_title, description, role, company_name, location, job_url) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         [(i, *row) for i, row in enumerate(jobs, start=1)])
+        conn.executemany(
+            "INSERT INTO replica_meta VALUES (?, ?)",
+            [("build_id", build_id), ("courses", str(len(courses))), ("jobs", str(len(jobs)))]
+        )
+        conn.execute("INSERT INTO courses(courses) VALUES ('optimize')")
+        conn.execute("INSERT INTO jobs(jobs) VALUES ('optimize')")
+        conn.commit()
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, db_path)
+    print(f"Built catalog replica at {db_path}: {len(courses)} courses, {len(jobs)} jobs")
+    return db_path
+
+
+def embed_catalog_texts(texts):
+    embedder = get_embedder()
+    if not texts:
+        return np.zeros((0, embedder.dimension), dtype=np.float16)
+    return embedder.encode(texts, batch_size=64).astype(np.float16)
+
+
+def build_catalog_embeddings(out_path, courses, jobs, build_id):
+    """
+    Embed course titles + skills and job titles + descriptions with the chunking model.
+
+    Vectors are unit-normalised and stored as float16; row i of each matrix belongs to
+    the replica row whose rowid is course_ids[i] / job_ids[i]. The build_id ties the
+    index to the replica built from the same rows.
+    """
+    course_texts = [f"{title}. Skills: {skills}" for title, skills, *_ in courses]
+    job_texts = [f"{job_title}. {description}" for job_title, description, *_ in jobs]
+    np.savez(
+        out_path,
+        course_vectors=embed_catalog_texts(course_texts),
+        course_ids=np.arange(1, len(courses) + 1, dtype=np.int64),
+        job_vectors=embed_catalog_texts(job_texts),
+        job_ids=np.arange(1, len(jobs) + 1, dtype=np.int64),
+        build_id=np.array(build_id),
+    )
+    print(f"Built catalog embeddings at {out_path}: {len(courses)} courses, {len(jobs)} jobs")
+    return out_path
+
+
+def upload_catalog_file(path, s3_key):
+    s3 = boto3.client(
+        "s3",
+        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_ACCESS_KEY"),
+        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+        region_name=os.getenv("AWS_DEFAULT_REGION"),
+    )
+    bucket = os.getenv("S3_BUCKET_NAME")
+    s3.upload_file(path, bucket, s3_key, ExtraArgs={"ServerSideEncryption": "AES256"})
+    print(f"Uploaded {os.path.basename(path)} to s3://{bucket}/{s3_key}")
+
+
+def refresh_catalog_replica(**context):
+    """Airflow task: rebuild the replica and embedding index of both catalogs from Snowflake and publish them to S3."""
+    courses, jobs = fetch_catalog_rows()
+    build_id = str(int(time.time()))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = build_catalog_replica(os.path.join(tmp_dir, "catalog_replica.db"), courses, jobs, build_id)
+        embeddings_path = build_catalog_embeddings(os.path.join(tmp_dir, "catalog_embeddings.npz"), courses, jobs, build_id)
+        upload_catalog_file(db_path, CATALOG_REPLICA_S3_KEY)
+        upload_catalog_file(embeddings_path, CATALOG_EMBEDDINGS_S3_KEY)
@@ -1,22 +1,29 @@
 ### Modified chunking.py: Keeping only Cluster-Based Chunking
 import re
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Load Sentence Transformer model (cached)
-embedding_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", cache_folder="/opt/airflow/huggingface_cache")
+import numpy as np
+from scripts.embeddings import get_embedder
 
 # Function to tokenize sentences
 def tokenize_sentences(text):
     return re.split(r'(?<=[.!?])\s+', text)
 
 # Function to compute embeddings
-def compute_embeddings(sentences):
-    return embedding_model.encode(sentences, convert_to_numpy=True, batch_size=8)
+def compute_embeddings(sentences, batch_size=8):
+    return get_embedder().encode(sentences, batch_size=batch_size)
 
-def cluster_based_chunking(document, max_chunk_size=500, similarity_threshold=0.75):
-    sentences = tokenize_sentences(document)
-    embeddings = compute_embeddings(sentences)
+# Cosine similarity of every sentence with the one before it, in one pass
+def adjacent_similarities(embeddings):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if len(embeddings) < 2:
+        return np.zeros(0, dtype=np.float32)
+    normalized = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+    return np.einsum("ij,ij->i", normalized[1:], normalized[:-1])
+
+# Group consecutive sentences into clusters of sentence indices
+def cluster_sentences(sentences, embeddings, max_chunk_size=500, similarity_threshold=0.75):
+    # Semantic boundaries are decided for all pairs at once; only the size limit,
+    # which depends on where the previous chunk started, is left to the loop.
+    continues = [False] + (adjacent_similarities(embeddings) > similarity_threshold).tolist()
 
     clusters = []
     current_chunk = []
@@ -26,21 +33,76 @@ def cluster_based_chunking(document, max_chunk_size=500, similarity_threshold=0.
         sentence_length = len(sentence)
 
         if i == 0:
-            current_chunk.append(sentence)
+            current_chunk.append(i)
             current_size += sentence_length
             continue
 
-        similarity = cosine_similarity([embeddings[i]], [embeddings[i-1]])[0][0]
-
-        if similarity > similarity_threshold and (current_size + sentence_length) <= max_chunk_size:
-            current_chunk.append(sentence)
+        if continues[i] and (current_size + sentence_length) <= max_chunk_size:
+            current_chunk.append(i)
             current_size += sentence_length
         else:
-            clusters.append(" ".join(current_chunk))
-            current_chunk = [sentence]
+            clusters.append(current_chunk)
+            current_chunk = [i]
             current_size = sentence_length
 
     if current_chunk:
-        clusters.append(" ".join(current_chunk))
+        clusters.append(current_chunk)
+
+    return clusters
+
+# Length-weighted mean of the sentence embeddings, unit-normalised like the encoder's own output
+def pool_chunk_embeddings(sentences, embeddings, clusters):
+    pooled = np.zeros((len(clusters), embeddings.shape[1]), dtype=np.float32)
+    for c, cluster in enumerate(clusters):
+        weights = np.array([len(sentences[i]) for i in cluster], dtype=np.float32)
+        pooled[c] = weights @ embeddings[cluster] / max(weights.sum(), 1.0)
+    return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+def cluster_based_chunking(document, max_chunk_size=500, similarity_threshold=0.75):
+    chunks, _ = cluster_based_chunking_with_embeddings(document, max_chunk_size, similarity_threshold, embedding_mode="none")
+    return chunks
+
+def cluster_based_chunking_with_embeddings(document, max_chunk_size=500, similarity_threshold=0.75, embedding_mode="pooled"):
+    """
+    Chunk a document and return an embedding per chunk along with the chunks.
+
+    embedding_mode "pooled" derives each chunk's vector from the sentence embeddings the
+    chunking already computed, so chunks are never encoded again; "reencode" encodes the
+    chunk texts instead (closer to what a query embedding sees, at the cost of a second
+    encoder pass); "none" returns no embeddings.
+    """
+    return cluster_based_chunking_batch([document], max_chunk_size, similarity_threshold, embedding_mode)[0]
+
+def cluster_based_chunking_batch(documents, max_chunk_size=500, similarity_threshold=0.75, embedding_mode="pooled", batch_size=64):
+    """
+    Chunk many documents with one encoder call for all of their sentences.
+
+    Same output as cluster_based_chunking_with_embeddings for each document, in order;
+    batching across documents keeps the encoder's batches full even for short posts.
+    """
+    if embedding_mode not in ("pooled", "reencode", "none"):
+        raise ValueError(f"Unknown chunk embedding mode '{embedding_mode}'; expected 'pooled', 'reencode' or 'none'")
+    if not documents:
+        return []
+
+    sentences_per_document = [tokenize_sentences(document) for document in documents]
+    all_embeddings = compute_embeddings([s for sentences in sentences_per_document for s in sentences], batch_size)
+
+    chunked, start = [], 0
+    for sentences in sentences_per_document:
+        embeddings = all_embeddings[start:start + len(sentences)]
+        start += len(sentences)
+        clusters = cluster_sentences(sentences, embeddings, max_chunk_size, similarity_threshold)
+        chunks = [" ".join(sentences[i] for i in cluster) for cluster in clusters]
+        pooled = pool_chunk_embeddings(sentences, embeddings, clusters) if embedding_mode == "pooled" else None
+        chunked.append((chunks, pooled))
 
-    return clusters
\ No newline at end of file
+    if embedding_mode == "reencode":
+        all_chunks = [chunk for chunks, _ in chunked for chunk in chunks]
+        chunk_embeddings = compute_embeddings(all_chunks, batch_size)
+        reencoded, start = [], 0
+        for chunks, _ in chunked:
+            reencoded.append((chunks, chunk_embeddings[start:start + len(chunks)]))
+            start += len(chunks)
+        return reencoded
+    return chunked
\ No newline at end of file
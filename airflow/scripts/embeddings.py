@@ -0,0 +1,112 @@
+# Same backends as backend/utils/embeddings.py, so the vectors written here match the
+# vectors the backend queries with; backend/tests/test_airflow_scripts.py checks the two agree.
+# The ONNX model is exported there (python -m utils.embeddings) into ONNX_MODEL_DIR, which
+# docker-compose mounts from airflow/huggingface_cache.
+import os
+import threading
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384
+# MiniLM's max_seq_length; longer inputs are truncated, as SentenceTransformer does.
+EMBEDDING_MAX_TOKENS = 256
+
+# "torch" runs the reference SentenceTransformer; "onnx" runs the int8-quantized export of the same model.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+HUGGINGFACE_CACHE = "/opt/airflow/huggingface_cache"
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", f"{HUGGINGFACE_CACHE}/all-MiniLM-L6-v2-onnx-int8")
+ONNX_MODEL_FILE = "model_int8.onnx"
+# 0 lets ONNX Runtime use one thread per physical core.
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average the token embeddings over the non-padding tokens, then L2-normalize."""
+    mask = attention_mask[..., np.newaxis].astype(np.float32)
+    pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+
+class TorchEmbedder:
+    """The SentenceTransformer model in PyTorch; the reference the ONNX backend is checked against."""
+
+    name = "torch"
+    dimension = EMBEDDING_DIMENSION
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, cache_folder: str = HUGGINGFACE_CACHE):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, cache_folder=cache_folder)
+
+    def encode(self, texts, batch_size: int = 32) -> np.ndarray:
+        embeddings = self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+        return embeddings.astype(np.float32)
+
+
+class OnnxEmbedder:
+    """The same model exported to ONNX with int8 weights, run on ONNX Runtime's CPU provider."""
+
+    name = "onnx"
+    dimension = EMBEDDING_DIMENSION
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR):
+        if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            raise FileNotFoundError(
+                f"No ONNX model in {model_dir}. Export it from backend/ with "
+                f"PYTHONPATH=. python -m utils.embeddings ../airflow/huggingface_cache/all-MiniLM-L6-v2-onnx-int8, "
+                f"or set EMBEDDING_BACKEND=torch."
+            )
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, ONNX_MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts, batch_size: int = 32) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        # Batch texts of similar length together so little of each batch is padding.
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [texts[i] for i in batch], padding=True, truncation=True,
+                max_length=EMBEDDING_MAX_TOKENS, return_tensors="np"
+            )
+            inputs = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+            embeddings[batch] = mean_pool(token_embeddings, tokens["attention_mask"])
+
+        return embeddings[0] if single else embeddings
+
+
+def create_embedder(backend: str = None):
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "torch":
+        return TorchEmbedder()
+    if backend == "onnx":
+        return OnnxEmbedder()
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'; expected 'torch' or 'onnx'")
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """Process-wide embedder for the configured backend, loaded on first use rather than at DAG parse time."""
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = create_embedder()
+        return _embedder
+
@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import numpy as np
+from dotenv import load_dotenv
+from pinecone import Pinecone
+from scripts.catalog_replica import upload_catalog_file
+from scripts.embeddings import EMBEDDING_DIMENSION
+
+load_dotenv()
+
+# Read by the backend's LocalVectorStore when VECTOR_STORE=local.
+VECTOR_STORE_S3_KEY = os.getenv("VECTOR_STORE_S3_KEY", "rag/faq_vectors.bin")
+# Same layout as backend/utils/local_vector_store.py; backend/tests/test_airflow_scripts.py compares the files.
+VECTOR_STORE_MAGIC = b"VSTORE01"
+VECTOR_STORE_ALIGNMENT = 64
+FETCH_BATCH_SIZE = 100
+
+
+def export_pinecone_index(api_key, index_name):
+    """Read every vector and its metadata from the Pinecone index."""
+    index = Pinecone(api_key=api_key).Index(index_name)
+    ids, vectors, metadatas = [], [], []
+    for id_page in index.list():
+        for start in range(0, len(id_page), FETCH_BATCH_SIZE):
+            fetched = index.fetch(ids=id_page[start:start + FETCH_BATCH_SIZE]).vectors
+            for vector_id, vector in fetched.items():
+                ids.append(vector_id)
+                vectors.append(vector.values)
+                metadatas.append(vector.metadata or {})
+    return ids, vectors, metadatas
+
+
+def write_vector_store(path, ids, vectors, metadatas, dimension=EMBEDDING_DIMENSION):
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), dimension)
+    vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    header = json.dumps({"count": len(ids), "dimension": dimension, "ids": list(ids), "metadata": list(metadatas)}).encode("utf-8")
+    prefix_length = len(VECTOR_STORE_MAGIC) + 8
+    header += b" " * (-(prefix_length + len(header)) % VECTOR_STORE_ALIGNMENT)
+
+    with open(path, "wb") as f:
+        f.write(VECTOR_STORE_MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(vectors.tobytes())
+    print(f"Wrote {len(ids)} vectors to {path}")
+    return path
+
+
+def publish_local_vector_store(ids, vectors, metadatas):
+    """Write the exported Pinecone vectors to a local vector store file and publish it to S3."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_vector_store(os.path.join(tmp_dir, "faq_vectors.bin"), ids, vectors, metadatas)
+        upload_catalog_file(path, VECTOR_STORE_S3_KEY)
+    return len(ids)
@@ -3,13 +3,14 @@ import asyncpraw
 import time
 from datetime import datetime
 from pinecone import Pinecone, ServerlessSpec
-from scripts.chunking import embedding_model
+from scripts.embeddings import get_embedder
 import uuid
+import numpy as np
 from scripts.validations import is_valid_post
 
 # Embed text using the sentence transformer model
 def embed_texts(texts):
-    return embedding_model.encode(texts, convert_to_numpy=True)
+    return get_embedder().encode(texts)
 
 # Ensure Pinecone index exists
 def get_or_create_index(api_key, environment, index_name):
@@ -23,7 +24,7 @@ def get_or_create_index(api_key, environment, index_name):
         )
     return pc.Index(index_name)
 
-def add_chunks_to_pinecone(chunks, post, role=None, company=None, api_key=None, environment=None, index_name=None):
+def add_chunks_to_pinecone(chunks, post, role=None, company=None, api_key=None, environment=None, index_name=None, embeddings=None):
 
     if not chunks:
         print("No chunks to upload.")
@@ -31,7 +32,10 @@ def add_chunks_to_pinecone(chunks, post, role=None, company=None, api_key=None,
     
     index = get_or_create_index(api_key, environment, index_name)
 
-    embeddings = embed_texts(chunks)
+    # Chunks embedded upstream (pooled from the chunking's sentence embeddings) are not encoded again.
+    if embeddings is None:
+        embeddings = embed_texts(chunks)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
     ids = [f"{post['id']}_chunk_{i}_{uuid.uuid4().hex[:6]}" for i in range(len(chunks))]
 
     metadatas = [{
@@ -5,19 +5,49 @@ from typing import List, Tuple, Literal
 from pprint import pprint
 from agents.recommender_agent import recommender_agent
 from agents.summary_generator import generate_summary_from_tasks
-from data_processing.resume_processing import process_pdf
-from data_processing.skill_matcher import extract_jd_skills_with_openai, compare_skills
+from data_processing.resume_processing import discard_resume_markdown, parse_resume, upload_resume_markdown
+from data_processing.skill_matcher import compare_skills
+from data_processing.skill_extractor import extract_jd_skills, extract_resume_skills
 
 from agents.tools.tools import CodeFeedbackInput, CodeFeedbackTool, FetchNextLeetQuestionInput, FetchNextLeetQuestionTool
+from agents.tools.tools import QuestionGenerationTool, InterviewEvaluationTool
 from agents.leetscrape_agent import oa_leetscrape_agent
 from agents.faq_agent import faq_agent
+from agents.faq_rag import answer_faq_directly, faq_response, response_text, retrieve_faq_context, stream_faq_completion
+from utils.faq_cache import faq_answer_cache
+from utils.metrics import timed_stage
+from utils.pinecone_query import embed_query
+from utils.stage_graph import Stage, run_stage_graph
+import logging
+import os
+import time
 
 
 load_dotenv()
 
 session_state = {}
+logger = logging.getLogger("backend.crew")
 
-def run_interview_orchestration_pipeline(
+# "direct" calls the interview tools straight away; "agentic" lets the orchestrator agent pick the tool.
+INTERVIEW_ORCHESTRATION_MODE = os.getenv("INTERVIEW_ORCHESTRATION_MODE", "direct").lower()
+
+# "direct" answers FAQ questions with one retrieval and one LLM call; "agentic" runs the FAQ agent.
+FAQ_PIPELINE_MODE = os.getenv("FAQ_PIPELINE_MODE", "direct").lower()
+
+# Recommendation pipeline stages that also advance the background job's progress.
+PROGRESS_STAGES = {
+    "parse_resume": "parsing_resume",
+    "extract_jd_skills": "extracting_jd_skills",
+    "match_skills": "matching_skills",
+    "crew_recommendation": "running_crew",
+    "summarize": "summarizing",
+}
+RECOMMENDATION_STAGE_WORKERS = int(os.getenv("RECOMMENDATION_STAGE_WORKERS", "3"))
+
+question_generation_tool = QuestionGenerationTool()
+interview_evaluation_tool = InterviewEvaluationTool()
+
+def dispatch_interview_action(
     action: Literal["next_question", "evaluate"],
     role: str,
     mode: str,
@@ -25,11 +55,57 @@ def run_interview_orchestration_pipeline(
     user_answer: str = "",
     resume_summary: str = "",
     transcript: List[Tuple[str, str]] = []
+) -> str:
+    """
+    Run the tool for an interview action directly, skipping the orchestrator agent's
+    tool-selection round-trip since the caller has already chosen the action.
+    """
+    if action == "next_question":
+        return question_generation_tool._run(
+            mode=mode,
+            role=role,
+            previous_question=previous_question,
+            user_answer=user_answer,
+            resume_summary=resume_summary
+        )
+    if action == "evaluate":
+        return interview_evaluation_tool._run(
+            transcript=[tuple(pair) for pair in transcript],
+            role=role,
+            mode=mode
+        )
+    raise ValueError(f"Unsupported interview action: {action}")
+
+def run_interview_orchestration_pipeline(
+    action: Literal["next_question", "evaluate"],
+    role: str,
+    mode: str,
+    previous_question: str = "",
+    user_answer: str = "",
+    resume_summary: str = "",
+    transcript: List[Tuple[str, str]] = [],
+    orchestration_mode: str = None
 ) -> str:
     """
     A unified hierarchical CrewAI pipeline for handling both next question generation
     and interview evaluation based on user-provided action.
+
+    In "direct" orchestration mode (the default, see INTERVIEW_ORCHESTRATION_MODE) the
+    action is dispatched straight to its tool; "agentic" keeps the orchestrator agent in the loop.
     """
+    orchestration_mode = (orchestration_mode or INTERVIEW_ORCHESTRATION_MODE).lower()
+    if orchestration_mode == "direct":
+        with timed_stage(f"interview_direct_{action}"):
+            return dispatch_interview_action(
+                action=action,
+                role=role,
+                mode=mode,
+                previous_question=previous_question,
+                user_answer=user_answer,
+                resume_summary=resume_summary,
+                transcript=transcript
+            )
+
     context_blob = f"""
 ROLE CONTEXT (DO NOT TREAT AS SUBTASK)
 
@@ -85,38 +161,41 @@ Now, proceed carefully and call only the correct tool.
         tasks=[task],
         verbose=True
     )
-    print("FINAL CONTEXT PASSED TO CREW ")
-    print("DEBUG: after task type(task.context):", type(task.context))
-    print("DEBUG: after task task.context:", task.context)
-    print("DEBUG: BEFORE kickoff context:")
-    result = crew.kickoff()
-    print("DEBUG: AFTER kickoff context:")
+    logger.debug("Interview orchestration context: %s", task.context)
+    with timed_stage("crew_interview_orchestration"):
+        result = crew.kickoff()
     raw_output = result.tasks_output[0]
     final_output = raw_output.output if hasattr(raw_output, "output") else raw_output
     return result.tasks_output[0].raw
 
 
 
-def run_recommendation_pipeline(file_content: bytes, file_name: str, job_description: str, location: str):
-    try:
-        # Step 1: Extract resume skills
-        resume_result = process_pdf(file_content, file_name)
-        resume_skills = resume_result["extracted_skills"]
-
-        # Step 2: Extract JD skills
-        jd_skills = extract_jd_skills_with_openai(job_description)
+def run_recommendation_pipeline(
+    file_content: bytes,
+    file_name: str,
+    job_description: str,
+    location: str,
+    progress_callback=None,
+    jd_skills: list = None,
+    parsed_resume: dict = None
+):
+    """
+    Analyze one resume against a job description and run the recommender crew.
 
-        # Step 3: Match skills and get prompt context
-        match_result = compare_skills(resume_skills, jd_skills)
-        prompt_context = match_result["prompt_context"]
+    `jd_skills` and `parsed_resume` let batch callers pass in work already done
+    (the JD's skills, or the output of parse_resume) instead of repeating it.
+    """
+    def report_stage(stage: str):
+        if progress_callback:
+            progress_callback(stage)
 
-        # Step 4: Define the agent's task
-        task = Task(
+    def build_task(match_result: dict) -> Task:
+        return Task(
             description=(
                 f"You are an intelligent recommender system.\n\n"
-                f"{prompt_context}\n\n"
+                f"{match_result['prompt_context']}\n\n"
                 f"Use tools to:\n"
-                f"1. Recommend Coursera courses based on the top 3 missing skills.\n"
+                f"1. Recommend Coursera courses for the missing skills, passing all of them to the course tool in a single call.\n"
                 f"2. Find job listings using the candidate's skills and the target job role as filters. \n"
                 f"3. Search the web for interview tips or learning resources for the missing skills.\n\n"
                 f"Output a final recommendation report with sections for strengths, weaknesses, job matches, and upskilling suggestions."
@@ -125,27 +204,55 @@ def run_recommendation_pipeline(file_content: bytes, file_name: str, job_descrip
             agent=recommender_agent
         )
 
-        # Step 5: Assemble the crew and run it
+    def run_crew(match_result: dict):
         crew = Crew(
             agents=[recommender_agent],
-            tasks=[task],
+            tasks=[build_task(match_result)],
             verbose=True
         )
+        return crew.kickoff()
+
+    # The parsed resume's temporary markdown is removed here whatever happens to the upload stage.
+    parsed_resumes = []
+
+    def parse():
+        parsed = parsed_resume or parse_resume(file_content, file_name)
+        parsed_resumes.append(parsed)
+        return parsed
+
+    # Resume parsing and JD extraction are independent, as are the resume skill
+    # extraction and the markdown upload; the S3 upload also overlaps the crew.
+    stages = [
+        Stage("parse_resume", parse),
+        Stage("extract_jd_skills", lambda: jd_skills if jd_skills is not None else extract_jd_skills(job_description)),
+        Stage("extract_resume_skills", lambda parsed: extract_resume_skills(parsed["markdown_text"]), ["parse_resume"]),
+        Stage("upload_resume_markdown", lambda parsed: upload_resume_markdown(parsed["md_path"], file_name), ["parse_resume"]),
+        Stage("match_skills", compare_skills, ["extract_resume_skills", "extract_jd_skills"]),
+        Stage("crew_recommendation", run_crew, ["match_skills"]),
+        Stage("summarize", lambda final_report: generate_summary_from_tasks(final_report.tasks_output), ["crew_recommendation"]),
+    ]
 
-        final_report = crew.kickoff()
-
-        summary = generate_summary_from_tasks(final_report.tasks_output)
+    try:
+        results, timings = run_stage_graph(
+            stages,
+            max_workers=RECOMMENDATION_STAGE_WORKERS,
+            on_stage_start=lambda name: report_stage(PROGRESS_STAGES[name]) if name in PROGRESS_STAGES else None
+        )
+        logger.info("Recommendation stage timings: %s", timings)
 
+        parsed = results["parse_resume"]
+        match_result = results["match_skills"]
         return {
-            "resume_skills": resume_skills,
-            "jd_skills": jd_skills,
+            "resume_skills": results["extract_resume_skills"],
+            "jd_skills": results["extract_jd_skills"],
             "match_score": match_result["match_score"],
             "matched_skills": match_result["matched_skills"],
             "missing_skills": match_result["missing_skills"],
-            "markdown_s3_url": resume_result["markdown_s3_url"],
-            "recommendation_report": final_report,
-            "summary": summary,
-            "candidate_name": resume_result.get("candidate_name", "Candidate"),
+            "markdown_s3_url": results["upload_resume_markdown"],
+            "recommendation_report": results["crew_recommendation"],
+            "summary": results["summarize"],
+            "candidate_name": parsed.get("candidate_name", "Candidate"),
+            "stage_timings": timings,
         }
 
     except Exception as e:
@@ -153,6 +260,9 @@ def run_recommendation_pipeline(file_content: bytes, file_name: str, job_descrip
             "status": "error",
             "message": str(e)
         }
+    finally:
+        for parsed in parsed_resumes:
+            discard_resume_markdown(parsed["md_path"])
 
 def run_oa_session(user_input: str, code: str = None, problem: str = None, state: dict = None):
     session_state = state or {}
@@ -225,8 +335,38 @@ def run_oa_session(user_input: str, code: str = None, problem: str = None, state
             "session_state": session_state
         }
     
-def run_faq_pipeline(faq_query: str, job_role: str = None, company: str = None):
+def run_faq_pipeline(faq_query: str, job_role: str = None, company: str = None, pipeline_mode: str = None, use_cache: bool = True):
+    """
+    Answer an interview question from the Reddit FAQ corpus.
+
+    In "direct" mode (the default, see FAQ_PIPELINE_MODE) the answer comes from one retrieval
+    and one generation call; "agentic" runs the FAQ agent, which decides when to search.
+    Both return faq_response with the answer under "raw" and tasks_output[0]["raw"].
+    """
     try:
+        response_cache = faq_answer_cache if use_cache else None
+        # A sufficiently similar question for the same role and company reuses its answer.
+        query_vector = embed_query(faq_query) if response_cache else None
+        cached = response_cache.lookup(job_role, company, query_vector) if response_cache else None
+        if cached:
+            return {**cached[0], "faq_query": faq_query}
+        started = time.perf_counter()
+
+        pipeline_mode = (pipeline_mode or FAQ_PIPELINE_MODE).lower()
+        if pipeline_mode == "direct":
+            with timed_stage("faq_direct"):
+                final_output = answer_faq_directly(faq_query, job_role, company)
+            result = {
+                "faq_query": faq_query,
+                "job_role": job_role,
+                "company": company,
+                "faq_response": final_output
+            }
+            # "Nothing relevant found" is not worth serving again once new posts are indexed.
+            if response_cache and final_output["sources"]:
+                response_cache.store(job_role, company, query_vector, result, time.perf_counter() - started)
+            return result
+
         # Step 1: Define the agent's task using the user's query
         task = Task(
             description=(
@@ -249,21 +389,61 @@ def run_faq_pipeline(faq_query: str, job_role: str = None, company: str = None):
             verbose=True
         )
 
-        final_output = crew.kickoff()
+        with timed_stage("crew_faq"):
+            final_output = crew.kickoff()
 
         # Step 3 (Optional): Summarize if needed
         #summary = generate_summary_from_tasks(final_output.tasks_output)
 
-        return {
+        result = {
             "faq_query": faq_query,
             "job_role": job_role,
             "company": company,
             "faq_response": final_output,
             #"summary": summary
         }
+        if response_cache:
+            response_cache.store(job_role, company, query_vector, result, time.perf_counter() - started)
+        return result
 
     except Exception as e:
         return {
             "status": "error",
             "message": str(e)
         }
+
+
+def stream_faq_pipeline(faq_query: str, job_role: str = None, company: str = None, use_cache: bool = True):
+    """
+    Direct-mode FAQ answer as a token iterator, sharing run_faq_pipeline's semantic answer cache.
+
+    The cache lookup and retrieval happen before this returns, so callers can run it on a
+    worker pool; only generation is left to the returned iterator. A cached answer comes
+    back as a single token, and a newly generated one is cached once the stream completes.
+    """
+    response_cache = faq_answer_cache if use_cache else None
+    query_vector = embed_query(faq_query) if response_cache else None
+    cached = response_cache.lookup(job_role, company, query_vector) if response_cache else None
+    if cached:
+        return iter([response_text(cached[0]["faq_response"])])
+    started = time.perf_counter()
+
+    context, sources, message = retrieve_faq_context(faq_query, job_role, company)
+    if not context:
+        return iter([message])
+
+    def tokens():
+        parts = []
+        for token in stream_faq_completion(faq_query, context, job_role, company):
+            parts.append(token)
+            yield token
+        if response_cache:
+            result = {
+                "faq_query": faq_query,
+                "job_role": job_role,
+                "company": company,
+                "faq_response": faq_response("".join(parts).strip(), sources)
+            }
+            response_cache.store(job_role, company, query_vector, result, time.perf_counter() - started)
+
+    return tokens()
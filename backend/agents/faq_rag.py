@@ -0,0 +1,136 @@
+import os
+from dotenv import load_dotenv
+from utils.llm_gateway import chat_completion, stream_chat_completion
+from utils.metrics import timed_stage
+from utils.pinecone_query import retrieve_chunks
+
+load_dotenv()
+
+FAQ_RAG_TOP_K = int(os.getenv("FAQ_RAG_TOP_K", "8"))
+# Prompt budget for the retrieved chunks; the question and instructions come on top of it.
+FAQ_CONTEXT_TOKEN_BUDGET = int(os.getenv("FAQ_CONTEXT_TOKEN_BUDGET", "1500"))
+FAQ_ANSWER_MAX_TOKENS = int(os.getenv("FAQ_ANSWER_MAX_TOKENS", "600"))
+# Rough size of a token in English text; the Grok tokenizer is not available locally.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def format_chunk(number: int, metadata: dict, text: str) -> str:
+    return (
+        f"[{number}] {metadata.get('title')} (r/{metadata.get('subreddit')})\n"
+        f"Link: {metadata.get('permalink')}\n"
+        f"{text}"
+    )
+
+
+def pack_chunks(matches: list, token_budget: int = FAQ_CONTEXT_TOKEN_BUDGET) -> tuple[str, list]:
+    """
+    Fit the best-ranked chunks into the token budget.
+
+    Chunks are taken in rank order and skipped when they no longer fit, so a shorter
+    lower-ranked chunk can still use the remaining budget. The top chunk is truncated
+    rather than dropped if it alone exceeds the budget.
+
+    Returns:
+        tuple[str, list]: The numbered context block and the metadata of the chunks used.
+    """
+    blocks, sources, seen, used = [], [], set(), 0
+    for match in matches:
+        metadata = match.get("metadata", {}) or {}
+        text = " ".join(str(metadata.get("text", "")).split())
+        if not text or text in seen:
+            continue
+        block = format_chunk(len(blocks) + 1, metadata, text)
+        cost = estimate_tokens(block)
+        if used + cost > token_budget:
+            if blocks:
+                continue
+            block = block[:token_budget * CHARS_PER_TOKEN]
+            cost = token_budget
+        seen.add(text)
+        blocks.append(block)
+        sources.append(metadata)
+        used += cost
+    return "\n\n".join(blocks), sources
+
+
+def build_faq_messages(faq_query: str, context: str, job_role: str = None, company: str = None) -> list:
+    focus = ", ".join(f"{name} {value}" for name, value in [("the role", job_role), ("the company", company)] if value)
+    system = (
+        "You are an interview assistant answering questions with advice from Reddit discussions. "
+        "Answer only from the numbered excerpts provided; if they do not answer the question, say so. "
+        "Format your output as an answer followed by 2-5 relevant Reddit links taken from the excerpts."
+    )
+    user = (
+        (f"Focus on {focus}\n\n" if focus else "")
+        + f"Reddit excerpts:\n{context}\n\n"
+        + f"Question: {faq_query}"
+    )
+    return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+
+def retrieve_faq_context(faq_query: str, job_role: str = None, company: str = None) -> tuple[str, list, str]:
+    """
+    Retrieve and pack the chunks for a question.
+
+    Returns:
+        tuple[str, list, str]: (context, sources, message); context is empty and message
+        explains why when nothing relevant was found.
+    """
+    with timed_stage("faq_retrieval"):
+        results = retrieve_chunks(
+            query=faq_query,
+            role=job_role,
+            company=company,
+            api_key=os.getenv("PINECONE_API_KEY"),
+            index_name=os.getenv("INDEX_NAME"),
+            top_k=FAQ_RAG_TOP_K
+        )
+    if results.get("status") == "error" or not results.get("matches"):
+        return "", [], results.get("message", f"No relevant chunks found for query '{faq_query}'.")
+    context, sources = pack_chunks(results["matches"])
+    return context, sources, ""
+
+
+def faq_response(answer: str, sources: list) -> dict:
+    # Same fields the frontend reads from a CrewOutput: faq_response["tasks_output"][0]["raw"].
+    return {
+        "raw": answer,
+        "tasks_output": [{"raw": answer}],
+        "sources": [{"title": s.get("title"), "permalink": s.get("permalink")} for s in sources],
+    }
+
+
+def response_text(response) -> str:
+    """Answer text of a faq_response dict or of a CrewOutput from the agentic pipeline."""
+    if isinstance(response, dict):
+        return response["raw"]
+    return getattr(response, "raw", "") or ""
+
+
+def answer_faq_directly(faq_query: str, job_role: str = None, company: str = None) -> dict:
+    """Answer a question with one retrieval and exactly one generation call, no agent loop."""
+    context, sources, message = retrieve_faq_context(faq_query, job_role, company)
+    if not context:
+        return faq_response(message, [])
+    with timed_stage("faq_generation"):
+        answer = chat_completion(
+            model="grok",
+            messages=build_faq_messages(faq_query, context, job_role, company),
+            temperature=0.3,
+            max_tokens=FAQ_ANSWER_MAX_TOKENS
+        )
+    return faq_response(answer.strip(), sources)
+
+
+def stream_faq_completion(faq_query: str, context: str, job_role: str = None, company: str = None):
+    """Generate the answer for already retrieved context, yielding it token by token."""
+    yield from stream_chat_completion(
+        model="grok",
+        messages=build_faq_messages(faq_query, context, job_role, company),
+        temperature=0.3,
+        max_tokens=FAQ_ANSWER_MAX_TOKENS
+    )
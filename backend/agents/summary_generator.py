@@ -1,11 +1,10 @@
-from openai import OpenAI
-import os
 from typing import List
 from crewai.tasks.task_output import TaskOutput
+from utils.metrics import timed
+from utils.llm_gateway import chat_completion
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-def generate_summary_from_tasks(tasks_output: List[TaskOutput]) -> str:
+@timed("llm_report_summary")
+def generate_summary_from_tasks(tasks_output: List[TaskOutput], use_cache: bool = True) -> str:
     combined_output = "\n\n".join(
         f"Agent: {task.agent}\nDescription: {task.description}\nOutput:\n{task.raw}"
         for task in tasks_output
@@ -21,10 +20,11 @@ Summarize this into 5 key insights for a candidate preparing for their job searc
 Include strengths, weaknesses, job matches, learning resources, and interview prep tips.
 """
 
-    response = openai_client.chat.completions.create(
+    response = chat_completion(
         model="gpt-3.5-turbo",
         messages=[{"role": "user", "content": prompt}],
-        temperature=0.4
+        temperature=0.4,
+        cache=use_cache
     )
 
-    return response.choices[0].message.content.strip()
\ No newline at end of file
+    return response.strip()
\ No newline at end of file
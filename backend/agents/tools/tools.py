@@ -1,69 +1,104 @@
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 import requests
-import snowflake.connector
 import os
 from dotenv import load_dotenv
 import ast, contextlib, io
-from utils.pinecone_query import query_pinecone_chunks
-from litellm import completion
+from utils.pinecone_query import retrieve_chunks
+from utils.llm_gateway import chat_completion, stream_chat_completion
 from typing import List, Tuple
-from openai import OpenAI
+from utils.metrics import timed
+from utils.snowflake_pool import query_snowflake
+from utils.catalog_replica import catalog_replica
+from utils.catalog_embeddings import semantic_search_jobs, semantic_top_courses_per_skill
+from utils.tool_memo import current_tool_memo, memoized
 
 load_dotenv()
 
+COURSES_PER_SKILL = int(os.getenv("COURSES_PER_SKILL", "3"))
+MAX_COURSE_SKILLS = int(os.getenv("MAX_COURSE_SKILLS", "10"))
+
 # ------------------------- COURSE TOOL -------------------------
 
 class FetchRelevantCoursesInput(BaseModel):
-    skill: str = Field(..., description="Skill to search courses for")
+    skills: list[str] = Field(..., description="All missing skills to find courses for, in a single call")
     job_role: str = Field(..., description="Target job role")
+    per_skill: int = Field(default=COURSES_PER_SKILL, description="Number of courses to return for each skill")
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def split_comma_separated(cls, value):
+        # Agents sometimes pass the skills as one comma-separated string.
+        if isinstance(value, str):
+            return [s.strip() for s in value.split(",")]
+        return value
 
 class FetchRelevantCoursesTool(BaseTool):
     name: str = "fetch_relevant_courses"
-    description: str = "Fetch Coursera courses based on skill and job role"
+    description: str = "Fetch the top Coursera courses for each of the given skills and the job role in one lookup"
     args_schema: type[BaseModel] = FetchRelevantCoursesInput
 
 
-    def _run(self, skill: str, job_role: str) -> str:
+    @timed("tool_fetch_relevant_courses")
+    def _run(self, skills: list[str], job_role: str, per_skill: int = COURSES_PER_SKILL) -> str:
         try:
-            conn = snowflake.connector.connect(
-                user=os.getenv("SNOWFLAKE_USER"),
-                password=os.getenv("SNOWFLAKE_PASSWORD"),
-                account=os.getenv("SNOWFLAKE_ACCOUNT"),
-                warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
-                database="FINAL_PROJECT",
-                schema="DATA_STORE",
-                role=os.getenv("SNOWFLAKE_ROLE"),
-            )
-            cursor = conn.cursor()
-
-            top_skills = [s.strip() for s in skill.split(",")][:3]
-            skill_conditions = " OR ".join([
-                f"(TITLE ILIKE '%{s}%' OR SKILLS ILIKE '%{s}%')" for s in top_skills
-            ])
-
-            query = f"""
-                SELECT TITLE, URL, RATING
-                FROM COURSES_CLEANED
-                WHERE JOB_ROLE ILIKE '%{job_role}%'
-                AND ({skill_conditions})
-                ORDER BY RATING DESC
-                LIMIT 5;
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            cursor.close()
-            conn.close()
-
-            if not results:
-                return f"No Coursera courses found for top skills: {', '.join(top_skills)}."
-
-            return "\n".join([
-                f"{row[0]} ({row[2]}/5): {row[1]}" for row in results
-            ])
+            # De-duplicate case-insensitively while keeping the caller's order.
+            unique_skills = list({s.strip().lower(): s.strip() for s in skills if s.strip()}.values())
+            unique_skills = unique_skills[:MAX_COURSE_SKILLS]
+            if not unique_skills:
+                return "No skills provided to search courses for."
+
+            # Within a batch, skills already looked up for another candidate are reused.
+            memo = current_tool_memo.get()
+            memo_key = lambda skill: ("fetch_relevant_courses", skill.lower(), job_role.lower(), per_skill)
+            courses_by_skill = {skill: memo.get(memo_key(skill)) if memo else None for skill in unique_skills}
+            to_fetch = [skill for skill, courses in courses_by_skill.items() if courses is None]
+            if to_fetch:
+                fetched = {skill: [] for skill in to_fetch}
+                for skill, title, url, rating in self._lookup(to_fetch, job_role, per_skill):
+                    fetched.setdefault(skill, []).append(f"- {title} ({rating}/5): {url}")
+                for skill, courses in fetched.items():
+                    courses_by_skill[skill] = courses
+                    if memo:
+                        memo.set(memo_key(skill), courses)
+
+            sections = []
+            for skill, courses in courses_by_skill.items():
+                sections.append(f"{skill}:\n" + ("\n".join(courses) if courses else "- No Coursera courses found."))
+            return "\n\n".join(sections)
         except Exception as e:
             return f"Error fetching Coursera courses: {str(e)}"
 
+    def _lookup(self, skills: list[str], job_role: str, per_skill: int) -> list:
+        # Embedding search catches synonyms; skills it finds nothing for fall back to keyword matching.
+        results = semantic_top_courses_per_skill(skills, job_role, per_skill) or []
+        found = {row[0] for row in results}
+        remaining = [s for s in skills if s not in found]
+        if remaining:
+            keyword_results = catalog_replica.top_courses_per_skill(remaining, job_role, per_skill) if catalog_replica else None
+            if keyword_results is None:
+                keyword_results = self._query_snowflake(remaining, job_role, per_skill)
+            results += keyword_results
+        return results
+
+    def _query_snowflake(self, skills: list[str], job_role: str, per_skill: int) -> list:
+        # One round-trip for all skills; bind parameters use pyformat, so literal % is written %%.
+        skill_rows = ", ".join(["(%s)"] * len(skills))
+        query = f"""
+            WITH REQUESTED_SKILLS (SKILL) AS (
+                SELECT COLUMN1 FROM VALUES {skill_rows}
+            )
+            SELECT r.SKILL, c.TITLE, c.URL, c.RATING
+            FROM REQUESTED_SKILLS r
+            JOIN COURSES_CLEANED c
+              ON c.TITLE ILIKE '%%' || r.SKILL || '%%'
+              OR c.SKILLS ILIKE '%%' || r.SKILL || '%%'
+            WHERE c.JOB_ROLE ILIKE %s
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY r.SKILL ORDER BY c.RATING DESC, c.REVIEWS DESC) <= %s
+            ORDER BY r.SKILL, c.RATING DESC;
+        """
+        return query_snowflake(query, (*skills, f"%{job_role}%", per_skill))
+
 # ------------------------- JOB TOOL -------------------------
 
 class FetchMatchingJobsInput(BaseModel):
@@ -75,36 +110,11 @@ class FetchMatchingJobsTool(BaseTool):
     description: str = "Fetch LinkedIn jobs from Snowflake based on job role"
     args_schema: type[BaseModel] = FetchMatchingJobsInput
 
+    @timed("tool_fetch_matching_jobs")
     def _run(self, job_role: str, skills: list[str] = None) -> str:
         try:
-            conn = snowflake.connector.connect(
-                user=os.getenv("SNOWFLAKE_USER"),
-                password=os.getenv("SNOWFLAKE_PASSWORD"),
-                account=os.getenv("SNOWFLAKE_ACCOUNT"),
-                warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
-                database="FINAL_PROJECT",
-                schema="DATA_STORE",
-                role=os.getenv("SNOWFLAKE_ROLE"),
-            )
-            cursor = conn.cursor()
-
-            # Build a flexible WHERE clause using job_role and skill matches
-            conditions = [f"ROLE ILIKE '%{job_role}%'"]
-            if skills:
-                skill_conditions = [f"DESCRIPTION ILIKE '%{s}%'" for s in skills]
-                conditions.append(f"({' OR '.join(skill_conditions)})")
-
-            query = f"""
-                SELECT JOB_TITLE, COMPANY_NAME, LOCATION, JOB_URL
-                FROM CLEANED_LINKEDIN_JOBS
-                WHERE {' AND '.join(conditions)}
-                LIMIT 5;
-            """
-
-            cursor.execute(query)
-            results = cursor.fetchall()
-            cursor.close()
-            conn.close()
+            memo_key = ("fetch_matching_jobs", job_role.lower(), tuple(sorted(s.lower() for s in skills or [])))
+            results = memoized(memo_key, lambda: self._lookup(job_role, skills))
 
             if not results:
                 return f"No job listings found for role '{job_role}' with related skills."
@@ -113,6 +123,30 @@ class FetchMatchingJobsTool(BaseTool):
         except Exception as e:
             return f"Error fetching job listings: {str(e)}"
 
+    def _lookup(self, job_role: str, skills: list[str] = None) -> list:
+        results = semantic_search_jobs(job_role, skills)
+        if not results:
+            results = catalog_replica.search_jobs(job_role, skills) if catalog_replica else None
+        if results is None:
+            results = self._query_snowflake(job_role, skills)
+        return results
+
+    def _query_snowflake(self, job_role: str, skills: list[str] = None) -> list:
+        # Build a flexible WHERE clause using job_role and skill matches; the values are bound, not inlined.
+        conditions = ["ROLE ILIKE %s"]
+        params = [f"%{job_role}%"]
+        if skills:
+            conditions.append(f"({' OR '.join(['DESCRIPTION ILIKE %s'] * len(skills))})")
+            params += [f"%{s}%" for s in skills]
+
+        query = f"""
+            SELECT JOB_TITLE, COMPANY_NAME, LOCATION, JOB_URL
+            FROM CLEANED_LINKEDIN_JOBS
+            WHERE {' AND '.join(conditions)}
+            LIMIT 5;
+        """
+        return query_snowflake(query, params)
+
         
 # ------------------------- WEB SEARCH TOOL -------------------------
 
@@ -124,6 +158,7 @@ class WebSearchTool(BaseTool):
     description: str = "Fetch relevant career prep resources using Tavily search"
     args_schema: type = WebSearchInput
 
+    @timed("tool_web_search_tool")
     def _run(self, query: str) -> str:
         try:
             tavily_key = os.getenv("TAVILY_API_KEY")
@@ -148,91 +183,109 @@ class QuestionGenerationInput(BaseModel):
     user_answer: str = Field(..., description="Candidate's response to the previous question")
     resume_summary: str = Field("", description="Optional resume summary for context in resume-based interviews")
 
+def build_followup_question_prompt(mode: str, role: str, previous_question: str, user_answer: str, resume_summary: str = "") -> str:
+    context = (
+        f"You are acting as a professional interviewer for a {role} role. "
+        f"This is a {mode.lower()} interview. "
+        f"Your goal is to conduct a realistic, structured interview by asking questions that build logically on the candidate's previous response.\n\n"
+    )
+
+    if resume_summary and mode.lower() == "resume":
+        context += f"Here is the summary of the candidate's resume:\n{resume_summary}\n\n"
+
+    context += (
+        f"Previous Question: {previous_question}\n"
+        f"Candidate's Answer: {user_answer}\n\n"
+        "Based on this response, ask the next appropriate follow-up question. "
+        "Keep it relevant, concise, and focused on assessing behavioral or technical skills depending on the interview mode. "
+        "Respond only with the next question — no explanation or comments."
+    )
+    return context
+
 class QuestionGenerationTool(BaseTool):
     name: str = "generate_followup_question"
     description: str = "Generates the next interview question based on previous interaction"
     args_schema: type = QuestionGenerationInput
 
+    @timed("tool_generate_followup_question")
     def _run(self, mode: str, role: str, previous_question: str, user_answer: str, resume_summary: str = "") -> str:
         try:
-            creds = {
-                "model": "xai/grok-2-1212",
-                "api_key": os.getenv("GROK_API_KEY")
-            }
-
-            context = (
-                f"You are acting as a professional interviewer for a {role} role. "
-                f"This is a {mode.lower()} interview. "
-                f"Your goal is to conduct a realistic, structured interview by asking questions that build logically on the candidate's previous response.\n\n"
-            )
-
-            if resume_summary and mode.lower() == "resume":
-                context += f"Here is the summary of the candidate's resume:\n{resume_summary}\n\n"
+            context = build_followup_question_prompt(mode, role, previous_question, user_answer, resume_summary)
 
-            context += (
-                f"Previous Question: {previous_question}\n"
-                f"Candidate's Answer: {user_answer}\n\n"
-                "Based on this response, ask the next appropriate follow-up question. "
-                "Keep it relevant, concise, and focused on assessing behavioral or technical skills depending on the interview mode. "
-                "Respond only with the next question — no explanation or comments."
-            )
-
-            response = completion(
-                model=creds["model"],
-                api_key=creds["api_key"],
+            response = chat_completion(
+                model="grok",
                 messages=[{"role": "user", "content": context}],
                 temperature=0.5,
                 max_tokens=200
             )
-            return response["choices"][0]["message"]["content"].strip()
+            return response.strip()
 
         except Exception as e:
             return f"Error generating follow-up question: {str(e)}"
 
+    def stream(self, mode: str, role: str, previous_question: str, user_answer: str, resume_summary: str = ""):
+        """Same as _run, but yields the question token by token."""
+        context = build_followup_question_prompt(mode, role, previous_question, user_answer, resume_summary)
+        yield from stream_chat_completion(
+            model="grok",
+            messages=[{"role": "user", "content": context}],
+            temperature=0.5,
+            max_tokens=200
+        )
+
 # ------------------------- INTERVIEW EVALUATION TOOL -------------------------
 class InterviewEvaluationInput(BaseModel):
     transcript: List[Tuple[str, str]] = Field(..., description="List of (question, answer) tuples from the interview")
     role: str = Field(..., description="Target job role")
     mode: str = Field(..., description="Type of interview (e.g., Resume, Technical, Behavioral)")
 
+def build_interview_evaluation_prompt(transcript: List[Tuple[str, str]], role: str, mode: str) -> str:
+    transcript = [tuple(pair) for pair in transcript if isinstance(pair, (list, tuple)) and len(pair) == 2]
+    prompt = (
+        f"You are acting as a senior interviewer and evaluator reviewing a {mode.lower()} interview for a {role} role.\n"
+        "Your task is to review the full transcript below and provide a structured evaluation with:\n"
+        "- Strengths (based on responses)\n"
+        "- Weaknesses\n"
+        "- Suggestions for improvement\n"
+        "- Overall readiness level\n"
+        "Be clear and concise, and use a professional tone.\n\n"
+        "Transcript:\n"
+    )
+
+    for i, (q, a) in enumerate(transcript):
+        prompt += f"Q{i+1}: {q}\nA{i+1}: {a}\n"
+    return prompt
+
 class InterviewEvaluationTool(BaseTool):
     name: str = "evaluate_interview"
     description: str = "Evaluates an interview transcript and provides structured feedback"
     args_schema: type = InterviewEvaluationInput
 
+    @timed("tool_evaluate_interview")
     def _run(self, transcript: List[Tuple[str, str]], role: str, mode: str) -> str:
         try:
-            transcript = [tuple(pair) for pair in transcript if isinstance(pair, (list, tuple)) and len(pair) == 2]
-            creds = {
-                "model": "xai/grok-2-1212",
-                "api_key": os.getenv("GROK_API_KEY")
-            }
+            prompt = build_interview_evaluation_prompt(transcript, role, mode)
 
-            prompt = (
-                f"You are acting as a senior interviewer and evaluator reviewing a {mode.lower()} interview for a {role} role.\n"
-                "Your task is to review the full transcript below and provide a structured evaluation with:\n"
-                "- Strengths (based on responses)\n"
-                "- Weaknesses\n"
-                "- Suggestions for improvement\n"
-                "- Overall readiness level\n"
-                "Be clear and concise, and use a professional tone.\n\n"
-                "Transcript:\n"
-            )
-
-            for i, (q, a) in enumerate(transcript):
-                prompt += f"Q{i+1}: {q}\nA{i+1}: {a}\n"
-
-            response = completion(
-                model=creds["model"],
-                api_key=creds["api_key"],
+            response = chat_completion(
+                model="grok",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.4,
                 max_tokens=1200
             )
-            return response["choices"][0]["message"]["content"].strip()
+            return response.strip()
 
         except Exception as e:
             return f"Error evaluating interview: {str(e)}"
+
+    def stream(self, transcript: List[Tuple[str, str]], role: str, mode: str):
+        """Same as _run, but yields the evaluation report token by token."""
+        prompt = build_interview_evaluation_prompt(transcript, role, mode)
+        yield from stream_chat_completion(
+            model="grok",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.4,
+            max_tokens=1200
+        )
         
 # ------------------------- REDDIT INTERVIEW TIPS TOOL -------------------------
 
@@ -246,9 +299,10 @@ class FetchRelevantChunksFromPineconeTool(BaseTool):
     description: str = "Fetch relevant Reddit discussion chunks from Pinecone using semantic search and optional filters"
     args_schema: type = FetchRelevantChunksInput
 
+    @timed("tool_fetch_relevant_chunks")
     def _run(self, query: str, role: str = None, company: str = None) -> str:
         try:
-            results = query_pinecone_chunks(
+            results = retrieve_chunks(
                 query=query,
                 role=role,
                 company=company,
@@ -290,6 +344,7 @@ class FetchNextLeetQuestionTool(BaseTool):
     description: str = "Fetch a LeetCode question from leetscrape microservice"
     args_schema: type[BaseModel] = FetchNextLeetQuestionInput
 
+    @timed("tool_fetch_next_leet_question")
     def _run(self, topic: str, index: int = 0) -> str:
         try:
             res = requests.get(f"{LEETSERVICE}/questions/{topic}")
@@ -329,9 +384,8 @@ class CodeFeedbackTool(BaseTool):
     description: str = "Feedback on submitted code"
     args_schema: type[BaseModel] = CodeFeedbackInput
 
+    @timed("tool_get_code_feedback")
     def _run(self, problem: str, code: str) -> str:
-        openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
         prompt = f"""
 You are a coding interview assistant.
 
@@ -354,7 +408,7 @@ CODE:
 Return your answer in a clear, structured markdown format.
 """
 
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "user", "content": prompt}
@@ -362,4 +416,4 @@ Return your answer in a clear, structured markdown format.
             temperature=0.4
         )
 
-        return response.choices[0].message.content.strip()
\ No newline at end of file
+        return response.strip()
\ No newline at end of file
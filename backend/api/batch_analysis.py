@@ -0,0 +1,172 @@
+import contextvars
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dotenv import load_dotenv
+from api.resume_analysis import analyze_resume_content
+from data_processing.resume_processing import parse_resume
+from data_processing.skill_extractor import extract_jd_skills
+from utils.metrics import POOL_OCCUPANCY, timed_stage
+from utils.tool_memo import shared_tool_results
+
+load_dotenv()
+
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "50"))
+# PDF parsing is CPU-bound, so it runs in worker processes; 0 parses in the calling thread.
+BATCH_PARSE_PROCESSES = int(os.getenv("BATCH_PARSE_PROCESSES", str(min(4, os.cpu_count() or 1))))
+# Candidates mostly wait on the LLM and the catalog, so threads are enough for them.
+BATCH_CANDIDATE_WORKERS = int(os.getenv("BATCH_CANDIDATE_WORKERS", "4"))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+# Parses submitted to the process pool and not yet finished, across all batches.
+_parses_in_flight = 0
+_parses_completed = 0
+POOL_OCCUPANCY.labels(pool="parse", state="running").set_function(lambda: min(_parses_in_flight, BATCH_PARSE_PROCESSES))
+POOL_OCCUPANCY.labels(pool="parse", state="queued").set_function(lambda: max(_parses_in_flight - BATCH_PARSE_PROCESSES, 0))
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn rather than fork: the parent holds threads, locks and open connections.
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=BATCH_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+def _parse_finished(_future):
+    global _parses_in_flight, _parses_completed
+    with _parse_pool_lock:
+        _parses_in_flight -= 1
+        _parses_completed += 1
+
+
+def parse_pool_stats() -> dict:
+    with _parse_pool_lock:
+        return {
+            "name": "parse",
+            "max_workers": BATCH_PARSE_PROCESSES,
+            "running": min(_parses_in_flight, BATCH_PARSE_PROCESSES),
+            "queued": max(_parses_in_flight - BATCH_PARSE_PROCESSES, 0),
+            "completed": _parses_completed,
+        }
+
+
+def parse_resumes(files: list) -> list:
+    """Parse every resume, returning each parse_resume result or the exception it raised."""
+    global _parses_in_flight
+    if BATCH_PARSE_PROCESSES <= 0:
+        futures = None
+    else:
+        pool = get_parse_pool()
+        futures = []
+        for name, content in files:
+            with _parse_pool_lock:
+                _parses_in_flight += 1
+            future = pool.submit(parse_resume, content, name)
+            future.add_done_callback(_parse_finished)
+            futures.append(future)
+
+    parsed = []
+    for i, (name, content) in enumerate(files):
+        try:
+            parsed.append(futures[i].result() if futures else parse_resume(content, name))
+        except Exception as e:
+            parsed.append(e)
+    return parsed
+
+
+def analyze_resume_batch(files: list, job_description: str, location: str, progress_callback=None) -> dict:
+    """
+    Analyze many resumes against one job description and rank the candidates.
+
+    The JD's skills are extracted once, the resumes are parsed in parallel worker
+    processes, and the candidates' analyses share catalog lookups for the same skills.
+    Runs as a batch job on the job workers (api.jobs), not on the request path.
+
+    Args:
+        files (list): (file name, file content) pairs.
+        job_description (str): Target job description text.
+        location (str): Preferred job location.
+        progress_callback (callable): Optional callback invoked with each stage name and,
+            while analyzing, the number of candidates done out of the total.
+
+    Returns:
+        dict: The JD skills and the candidates ranked by match score; failed candidates come last.
+    """
+    progress_callback = progress_callback or (lambda stage, done=0, total=1: None)
+    progress_callback("extracting_jd_skills")
+    with timed_stage("batch_extract_jd_skills"):
+        jd_skills = extract_jd_skills(job_description)
+    progress_callback("parsing_resumes")
+    with timed_stage("batch_parse_resumes"):
+        parsed_resumes = parse_resumes(files)
+
+    def analyze(file_name: str, file_content: bytes, parsed):
+        if isinstance(parsed, Exception):
+            raise parsed
+        return analyze_resume_content(
+            file_content=file_content,
+            file_name=file_name,
+            job_description=job_description,
+            location=location,
+            jd_skills=jd_skills,
+            parsed_resume=parsed
+        )
+
+    candidates = []
+    progress_callback("analyzing_candidates", 0, len(files))
+    with shared_tool_results() as memo:
+        with ThreadPoolExecutor(max_workers=BATCH_CANDIDATE_WORKERS, thread_name_prefix="batch-candidate") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, analyze, name, content, parsed)
+                for (name, content), parsed in zip(files, parsed_resumes)
+            ]
+            for (file_name, _), future in zip(files, futures):
+                try:
+                    result = future.result()
+                    candidates.append({
+                        "file_name": file_name,
+                        "candidate_name": result["candidate_name"],
+                        "match_score": result["match_score"],
+                        "matched_skills": result["matched_skills"],
+                        "missing_skills": result["missing_skills"],
+                        "summary": result["summary"],
+                        "report_url": result["report_url"],
+                        "status": "completed",
+                        "error": None
+                    })
+                except Exception as e:
+                    print(f"Batch analysis failed for {file_name}: {str(e)}")
+                    candidates.append({
+                        "file_name": file_name,
+                        "candidate_name": None,
+                        "match_score": None,
+                        "matched_skills": [],
+                        "missing_skills": [],
+                        "summary": None,
+                        "report_url": None,
+                        "status": "failed",
+                        "error": str(e)
+                    })
+                progress_callback("analyzing_candidates", len(candidates), len(files))
+
+    # Stable sort: ties keep upload order, failures go to the end.
+    candidates.sort(key=lambda c: (c["status"] != "completed", -(c["match_score"] or 0)))
+    for rank, candidate in enumerate(candidates, start=1):
+        candidate["rank"] = rank
+
+    return {"jd_skills": jd_skills, "candidates": candidates, "shared_lookups": memo.stats()}
@@ -0,0 +1,183 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.metrics import POOL_OCCUPANCY, POOL_QUEUE_WAIT
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool already holds as many requests as it is allowed to admit."""
+
+    def __init__(self, pool_name: str, retry_after: int = 5):
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+        super().__init__(f"Worker pool '{pool_name}' is saturated. Please retry later.")
+
+
+class BoundedExecutor:
+    """
+    Thread pool with admission control for blocking pipeline calls.
+
+    At most `max_workers` calls run concurrently and at most `max_queue` more
+    wait for a free worker. Anything beyond that is rejected immediately with
+    PoolSaturatedError instead of piling up on the event loop.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        POOL_OCCUPANCY.labels(pool=name, state="running").set_function(lambda: self._running)
+        POOL_OCCUPANCY.labels(pool=name, state="queued").set_function(lambda: self._admitted - self._running)
+
+    def _admit(self):
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturatedError(self.name)
+            self._admitted += 1
+
+    def _release(self, _future=None):
+        # Runs when the call finishes or is cancelled while still queued, so a
+        # client that disconnects before its turn does not keep the slot.
+        with self._lock:
+            self._admitted -= 1
+
+    def _invoke(self, enqueued_at: float, ctx: contextvars.Context, fn, args, kwargs):
+        wait = time.perf_counter() - enqueued_at
+        with self._lock:
+            self._running += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        POOL_QUEUE_WAIT.labels(pool=self.name).observe(wait)
+        try:
+            return ctx.run(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Raises:
+            PoolSaturatedError: If the pool and its queue are already full.
+        """
+        self._admit()
+        call = functools.partial(
+            self._invoke, time.perf_counter(), contextvars.copy_context(), fn, args, kwargs
+        )
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        # Cancelling the awaiting task cancels the job too if it has not started yet.
+        return await asyncio.wrap_future(future)
+
+    def stream(self, fn, *args, **kwargs):
+        """
+        Drain a blocking iterator on the pool and relay its items as an async iterator.
+
+        Admission happens here, before a streaming response starts, so a full pool
+        still surfaces as PoolSaturatedError. The call keeps its slot and worker until
+        the iterator is exhausted, fails or the consumer stops reading.
+
+        Raises:
+            PoolSaturatedError: If the pool and its queue are already full.
+        """
+        self._admit()
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        abandoned = threading.Event()
+
+        def drain():
+            iterator = iter(fn(*args, **kwargs))
+            try:
+                for item in iterator:
+                    if abandoned.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, ("item", item))
+            except Exception as e:
+                loop.call_soon_threadsafe(items.put_nowait, ("error", e))
+            finally:
+                # Closing the iterator ends a provider stream the consumer walked away from.
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+                loop.call_soon_threadsafe(items.put_nowait, ("done", None))
+
+        call = functools.partial(
+            self._invoke, time.perf_counter(), contextvars.copy_context(), drain, (), {}
+        )
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        async def relay():
+            try:
+                while True:
+                    kind, value = await items.get()
+                    if kind == "item":
+                        yield value
+                    elif kind == "error":
+                        raise value
+                    else:
+                        return
+            finally:
+                abandoned.set()
+                future.cancel()
+
+        return relay()
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_seconds": round(self._total_wait / started, 4) if started else 0.0,
+                "max_queue_wait_seconds": round(self._max_wait, 4),
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# Interview turns get their own pool so a burst of resume reports cannot starve them.
+interactive_pool = BoundedExecutor(
+    name="interactive",
+    max_workers=int(os.getenv("INTERACTIVE_POOL_WORKERS", "8")),
+    max_queue=int(os.getenv("INTERACTIVE_POOL_QUEUE", "32")),
+)
+
+heavy_pool = BoundedExecutor(
+    name="heavy",
+    max_workers=int(os.getenv("HEAVY_POOL_WORKERS", "2")),
+    max_queue=int(os.getenv("HEAVY_POOL_QUEUE", "4")),
+)
+
+
+def pool_stats() -> list:
+    return [interactive_pool.stats(), heavy_pool.stats()]
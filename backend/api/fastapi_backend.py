@@ -1,18 +1,37 @@
 
-from fastapi import FastAPI, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from utils.interview_helpers import generate_next_question, evaluate_interview
 from utils.resume_summarizer import generate_resume_summary
-from agents.crew_config import run_interview_orchestration_pipeline, run_oa_session, run_recommendation_pipeline, run_faq_pipeline
-from utils.pdf_utils import generate_pdf_report_with_details
-import io
+from agents.crew_config import run_interview_orchestration_pipeline, run_oa_session, run_faq_pipeline, stream_faq_pipeline
+from api.executor import PoolSaturatedError, interactive_pool, heavy_pool, pool_stats
+from api.jobs import get_job_store, start_worker_threads
+from api.resume_analysis import analyze_resume_content, ResumeAnalysisError
+from api.batch_analysis import BATCH_MAX_RESUMES, parse_pool_stats, shutdown_parse_pool
+from api.reports import build_report_response
+from api.streaming import SSE_HEADERS, sse_from_tokens
+from agents.tools.tools import QuestionGenerationTool, InterviewEvaluationTool
+from utils.metrics import REQUEST_DURATION, current_endpoint, current_trace_id, new_trace_id, render_metrics
+from utils.snowflake_pool import snowflake_pool
+from utils.faq_cache import faq_answer_cache
+from utils.pinecone_query import VECTOR_STORE
+from utils.local_vector_store import local_vector_store
+from starlette.routing import Match
 from typing import Optional, List, Tuple
+import asyncio
+import logging
+import os
+import threading
+import time
 import traceback
 
 app = FastAPI()
 
+job_worker_stop = threading.Event()
+logger = logging.getLogger("backend.api")
+
 # Allow CORS for all origins (you can restrict this to specific origins if needed)
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +41,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def resolve_route_path(request: Request) -> str:
+    # Label metrics by route template (e.g. /jobs/{job_id}) to keep cardinality bounded.
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    trace_id = request.headers.get("x-trace-id") or new_trace_id()
+    endpoint = resolve_route_path(request)
+    current_trace_id.set(trace_id)
+    current_endpoint.set(endpoint)
+
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        REQUEST_DURATION.labels(endpoint=endpoint, method=request.method, status=str(status)).observe(time.perf_counter() - start)
+    response.headers["X-Trace-Id"] = trace_id
+    return response
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 class OASessionRequest(BaseModel):
     user_input: str
     code: str | None = None
@@ -45,20 +97,50 @@ class EvaluationInput(BaseModel):
     role: str
     mode: str
 
+@app.on_event("startup")
+def start_job_workers():
+    # Workers can also run as separate processes (python -m api.jobs) sharing JOB_DB_PATH.
+    worker_count = int(os.getenv("JOB_WORKERS_INPROCESS", "1"))
+    if worker_count > 0:
+        start_worker_threads(get_job_store(), worker_count, job_worker_stop)
+
+@app.on_event("startup")
+def load_vector_store():
+    # Map the store before the first FAQ question instead of during it.
+    if VECTOR_STORE == "local" and local_vector_store.load() is None:
+        logger.warning("VECTOR_STORE=local but no vector store file is available at %s", local_vector_store.path)
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    job_worker_stop.set()
+    snowflake_pool.close_all()
+    shutdown_parse_pool()
+
+@app.get("/metrics")
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/executor/stats")
+def executor_stats():
+    return {
+        "pools": pool_stats() + [parse_pool_stats()],
+        "snowflake_pool": snowflake_pool.stats(),
+        "faq_cache": faq_answer_cache.stats() if faq_answer_cache else None
+    }
+
 @app.post("/oa-session/")
-def oa_session(request: OASessionRequest):
-    print("USER INPUT:", request.user_input)
-    print("SESSION STATE:", request.session_state)
-    print("CODE:", request.code)
+async def oa_session(request: OASessionRequest):
+    logger.debug("OA session input: %s, state: %s", request.user_input, request.session_state)
 
-    response = run_oa_session(
+    response = await interactive_pool.run(
+        run_oa_session,
         user_input=request.user_input,
         code=request.code,
         problem=request.problem,
         state=request.session_state
     )
 
-    print("RETURNING:", response)
     return JSONResponse(content=response)
 
 @app.post("/analyze-resume/")
@@ -69,39 +151,94 @@ async def analyze_resume(
 ):
     file_content = await file.read()
 
-    result = run_recommendation_pipeline(
-        file_content=file_content,
-        file_name=file.filename,
-        job_description=job_description,
-        location=location
+    try:
+        response = await heavy_pool.run(
+            analyze_resume_content,
+            file_content=file_content,
+            file_name=file.filename,
+            job_description=job_description,
+            location=location
+        )
+    except ResumeAnalysisError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return JSONResponse(content=response)
+
+@app.post("/analyze-resumes/batch", status_code=202)
+async def analyze_resumes_batch(
+    files: List[UploadFile],
+    job_description: str = Form(...),
+    location: str = Form(...)
+):
+    if len(files) > BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_RESUMES} resumes can be analyzed per batch")
+    resumes = [(file.filename, await file.read()) for file in files]
+
+    # Batches run on the job workers; per-candidate failures are reported in the job result.
+    job_id = await asyncio.to_thread(
+        lambda: get_job_store().submit_batch(resumes, job_description, location)
+    )
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "result_url": f"/jobs/{job_id}/result"
+    }
+
+@app.post("/analyze-resume/jobs", status_code=202)
+async def submit_resume_analysis_job(
+    file: UploadFile,
+    job_description: str = Form(...),
+    location: str = Form(...)
+):
+    file_content = await file.read()
+    # File and SQLite writes stay off the event loop.
+    job_id = await asyncio.to_thread(
+        lambda: get_job_store().submit(file_content, file.filename, job_description, location)
     )
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "result_url": f"/jobs/{job_id}/result"
+    }
 
-    full_text = result["recommendation_report"].raw
-    summary = result["summary"]
-    candidate_name = result["candidate_name"]
-    match_result = {
-        "resume_skills": result["resume_skills"],
-        "jd_skills": result["jd_skills"],
-        "matched_skills": result["matched_skills"],
-        "missing_skills": result["missing_skills"],
-        "match_score": result["match_score"]
+@app.get("/jobs/{job_id}")
+def get_job_status(job_id: str):
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
     }
 
-    # Generate enhanced PDF report in memory
-    pdf_buffer = io.BytesIO()
-    generate_pdf_report_with_details(candidate_name, match_result, full_text, output_stream=pdf_buffer)
-    pdf_bytes = pdf_buffer.getvalue()
+@app.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"] or "Job failed")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is still {job['status']} (stage: {job['stage']})")
+    return JSONResponse(content=job["result"])
 
-    return JSONResponse(content={
-        "summary": summary,
-        "pdf_base64": pdf_bytes.decode("latin1"),
-        "markdown_s3_url": result["markdown_s3_url"]
-    })
+@app.get("/reports/{report_id}.pdf")
+def get_report(report_id: str, request: Request):
+    return build_report_response(request, report_id)
 
 @app.post("/faq")
-def get_faq_answer(req: FAQRequest):
+async def get_faq_answer(req: FAQRequest):
     try:
-        result = run_faq_pipeline(
+        result = await heavy_pool.run(
+            run_faq_pipeline,
             faq_query=req.query,
             job_role=req.role,
             company=req.company
@@ -111,18 +248,38 @@ def get_faq_answer(req: FAQRequest):
             raise HTTPException(status_code=400, detail=result.get("message", "Request failed."))
         
         return {"status": "success", "data": result}
+    except (HTTPException, PoolSaturatedError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/faq/stream")
+async def stream_faq(req: FAQRequest):
+    # Cache lookup and retrieval run on the pool; the stream then only waits on the LLM.
+    try:
+        tokens = await interactive_pool.run(
+            stream_faq_pipeline,
+            faq_query=req.query,
+            job_role=req.role,
+            company=req.company
+        )
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    events = interactive_pool.stream(sse_from_tokens, tokens)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
 @app.post("/generate_next_question/")
-def ask_next(payload:QuestionInput):
-    print(f"mode selected is {payload.mode}")
+async def ask_next(payload:QuestionInput):
+    logger.debug("Interview mode selected: %s", payload.mode)
     resume_summary = ""
     if payload.mode == "Resume":
-        resume_summary = generate_resume_summary(payload.resume_s3_path)
+        resume_summary = await interactive_pool.run(generate_resume_summary, payload.resume_s3_path)
     
     
-    next_question = generate_next_question(
+    next_question = await interactive_pool.run(
+        generate_next_question,
         mode=payload.mode,
         role=payload.role,
         previous_question=payload.previous_question,
@@ -136,8 +293,9 @@ def ask_next(payload:QuestionInput):
 
 
 @app.post("/evaluate_interview/")
-def evaluate(payload:EvaluationInput):
-    evaluation_report = evaluate_interview(
+async def evaluate(payload:EvaluationInput):
+    evaluation_report = await interactive_pool.run(
+        evaluate_interview,
         transcript=payload.transcript,
         role=payload.role,
         mode=payload.mode
@@ -148,16 +306,15 @@ def evaluate(payload:EvaluationInput):
     }
 
 @app.post("/generates_next_question/")
-def ask_next_question(payload: QuestionInput):
+async def ask_next_question(payload: QuestionInput):
     try:
         resume_summary = ""
         if payload.mode.lower() == "resume":
             if not payload.resume_s3_path:
                 raise HTTPException(status_code=400, detail="Resume S3 path required for Resume mode")
-            resume_summary = generate_resume_summary(payload.resume_s3_path)
-        print("running interview orchestration pipeline")
-        print(payload)
-        result = run_interview_orchestration_pipeline(
+            resume_summary = await interactive_pool.run(generate_resume_summary, payload.resume_s3_path)
+        result = await interactive_pool.run(
+            run_interview_orchestration_pipeline,
             action="next_question",
             role=payload.role,
             mode=payload.mode,
@@ -166,20 +323,20 @@ def ask_next_question(payload: QuestionInput):
             resume_summary=resume_summary,
             transcript=[]
         )
-        print(f"Next question generated: {result}")
-        print("TYPE OF RESULT:", type(result))
         return {"next_question": result}
 
+    except (HTTPException, PoolSaturatedError):
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/evaluates_interview/")
-def evaluate_interview(payload: EvaluationInput):
+async def evaluates_interview(payload: EvaluationInput):
     try:
-        print(payload)
-        result = run_interview_orchestration_pipeline(
+        result = await interactive_pool.run(
+            run_interview_orchestration_pipeline,
             action="evaluate",
             role=payload.role,
             mode=payload.mode,
@@ -188,5 +345,37 @@ def evaluate_interview(payload: EvaluationInput):
 
         return {"evaluation_report": result}
 
+    except PoolSaturatedError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/generates_next_question/stream")
+async def stream_next_question(payload: QuestionInput):
+    resume_summary = ""
+    if payload.mode.lower() == "resume":
+        if not payload.resume_s3_path:
+            raise HTTPException(status_code=400, detail="Resume S3 path required for Resume mode")
+        resume_summary = await interactive_pool.run(generate_resume_summary, payload.resume_s3_path)
+
+    tokens = QuestionGenerationTool().stream(
+        mode=payload.mode,
+        role=payload.role,
+        previous_question=payload.previous_question,
+        user_answer=payload.user_answer,
+        resume_summary=resume_summary
+    )
+    # The generation runs on the interactive pool, which holds a slot until the stream ends.
+    events = interactive_pool.stream(sse_from_tokens, tokens)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/evaluates_interview/stream")
+async def stream_interview_evaluation(payload: EvaluationInput):
+    tokens = InterviewEvaluationTool().stream(
+        transcript=payload.transcript,
+        role=payload.role,
+        mode=payload.mode
+    )
+    events = interactive_pool.stream(sse_from_tokens, tokens)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,314 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import uuid4
+from dotenv import load_dotenv
+from utils.metrics import current_endpoint, current_trace_id
+
+load_dotenv()
+
+logger = logging.getLogger("backend.jobs")
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", "job_uploads")
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# Jobs left in "running" longer than this (e.g. after a worker crash) are put back in the queue.
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "1800"))
+# A job that has been claimed this many times without finishing is failed instead of requeued,
+# so a resume that crashes its worker cannot take the workers down over and over.
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Ordered stages of a resume analysis job, mapped to an approximate completion percentage.
+JOB_STAGES = {
+    "queued": 0,
+    "parsing_resume": 10,
+    "extracting_jd_skills": 25,
+    "matching_skills": 35,
+    "running_crew": 45,
+    "summarizing": 80,
+    "rendering_report": 90,
+    "completed": 100,
+}
+
+# Stages of a batch job; candidates finishing during "analyzing_candidates" move it towards 100.
+BATCH_JOB_STAGES = {
+    "queued": 0,
+    "extracting_jd_skills": 5,
+    "parsing_resumes": 10,
+    "analyzing_candidates": 20,
+    "completed": 100,
+}
+
+
+class JobStore:
+    """
+    Persistent queue of resume analysis jobs backed by SQLite.
+
+    The web tier only inserts rows and reads status; any number of worker
+    processes pointed at the same database claim queued jobs atomically.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, upload_dir: str = JOB_UPLOAD_DIR):
+        self.db_path = db_path
+        self.upload_dir = Path(upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL DEFAULT 'resume',
+                    status TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    file_name TEXT,
+                    upload_path TEXT,
+                    job_description TEXT,
+                    location TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            # Columns added after the first release, for databases created before them.
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "attempts" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            if "kind" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN kind TEXT NOT NULL DEFAULT 'resume'")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, file_content: bytes, file_name: str, job_description: str, location: str) -> str:
+        job_id = uuid4().hex
+        upload_path = self.upload_dir / f"{job_id}.pdf"
+        upload_path.write_bytes(file_content)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, stage, progress, file_name, upload_path, job_description, location, created_at, updated_at) "
+                "VALUES (?, 'queued', 'queued', 0, ?, ?, ?, ?, ?, ?)",
+                (job_id, file_name, str(upload_path), job_description, location, now, now)
+            )
+        return job_id
+
+    def submit_batch(self, files: list, job_description: str, location: str) -> str:
+        """
+        Queue a batch analysis of several resumes against one job description.
+
+        Args:
+            files (list): (file name, file content) pairs.
+
+        Returns:
+            str: The job id; the uploads are kept in a directory of that name until the job ends.
+        """
+        job_id = uuid4().hex
+        upload_path = self.upload_dir / job_id
+        upload_path.mkdir()
+        for i, (_, content) in enumerate(files):
+            (upload_path / f"{i:03d}.pdf").write_bytes(content)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, stage, progress, file_name, upload_path, job_description, location, created_at, updated_at) "
+                "VALUES (?, 'batch', 'queued', 'queued', 0, ?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps([name for name, _ in files]), str(upload_path), job_description, location, now, now)
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def claim_next(self) -> dict | None:
+        """Atomically move the oldest queued job to running and return it."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (time.time(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return dict(row) if row is not None else None
+
+    def update_stage(self, job_id: str, stage: str, progress: int = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, progress = ?, updated_at = ? WHERE id = ?",
+                (stage, JOB_STAGES.get(stage, 0) if progress is None else progress, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'completed', stage = 'completed', progress = 100, result = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id)
+            )
+        self._remove_upload(job_id)
+
+    def fail(self, job_id: str, error: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                (error, time.time(), job_id)
+            )
+        self._remove_upload(job_id)
+
+    def requeue_stale(self, older_than: float = JOB_STALE_AFTER, max_attempts: int = JOB_MAX_ATTEMPTS) -> int:
+        """
+        Put jobs stuck in "running" back in the queue, failing those already tried max_attempts times.
+
+        Returns:
+            int: Number of jobs requeued.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                abandoned = [row["id"] for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'running' AND updated_at < ? AND attempts >= ?",
+                    (now - older_than, max_attempts)
+                )]
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+                    "WHERE status = 'running' AND updated_at < ? AND attempts >= ?",
+                    (f"Job did not finish after {max_attempts} attempts", now, now - older_than, max_attempts)
+                )
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = 'queued', progress = 0, updated_at = ? "
+                    "WHERE status = 'running' AND updated_at < ?",
+                    (now, now - older_than)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for job_id in abandoned:
+            self._remove_upload(job_id)
+        return cursor.rowcount
+
+    def _remove_upload(self, job_id: str):
+        upload_path = self.upload_dir / f"{job_id}.pdf"
+        if upload_path.exists():
+            upload_path.unlink()
+        # Batch jobs keep their uploads in a directory.
+        shutil.rmtree(self.upload_dir / job_id, ignore_errors=True)
+
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Process-wide job store, opened on first use so importing the API does not create files."""
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobStore()
+        return _job_store
+
+
+def process_batch_job(store: JobStore, job: dict) -> dict:
+    from api.batch_analysis import analyze_resume_batch
+
+    upload_path = Path(job["upload_path"])
+    files = [
+        (name, (upload_path / f"{i:03d}.pdf").read_bytes())
+        for i, name in enumerate(json.loads(job["file_name"]))
+    ]
+
+    def report_progress(stage: str, done: int = 0, total: int = 1):
+        start = BATCH_JOB_STAGES.get(stage, 0)
+        store.update_stage(job["id"], stage, start + (95 - start) * done // max(total, 1))
+
+    return analyze_resume_batch(files, job["job_description"], job["location"], progress_callback=report_progress)
+
+
+def process_job(store: JobStore, job: dict):
+    # Imported lazily so the web tier can use JobStore without loading the CrewAI stack.
+    from api.resume_analysis import analyze_resume_content
+
+    job_id = job["id"]
+    current_endpoint.set("job_worker")
+    current_trace_id.set(job_id)
+    try:
+        if job.get("kind") == "batch":
+            store.complete(job_id, process_batch_job(store, job))
+            return
+        file_content = Path(job["upload_path"]).read_bytes()
+        result = analyze_resume_content(
+            file_content=file_content,
+            file_name=job["file_name"],
+            job_description=job["job_description"],
+            location=job["location"],
+            progress_callback=lambda stage: store.update_stage(job_id, stage)
+        )
+        store.complete(job_id, result)
+    except Exception as e:
+        traceback.print_exc()
+        store.fail(job_id, str(e))
+
+
+def run_worker(store: JobStore, stop_event: threading.Event = None, poll_interval: float = JOB_POLL_INTERVAL):
+    """
+    Poll the job store and process queued jobs one at a time until stop_event is set.
+    Run several of these (threads or processes) to scale analysis independently of the web tier.
+    """
+    stop_event = stop_event or threading.Event()
+    store.requeue_stale()
+    while not stop_event.is_set():
+        job = store.claim_next()
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        logger.info("Processing %s job %s", job["kind"], job["id"])
+        process_job(store, job)
+
+
+def start_worker_threads(store: JobStore, count: int, stop_event: threading.Event) -> list:
+    threads = []
+    for i in range(count):
+        thread = threading.Thread(
+            target=run_worker,
+            args=(store, stop_event),
+            name=f"resume-job-worker-{i}",
+            daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+if __name__ == "__main__":
+    # Standalone worker: PYTHONPATH=. python -m api.jobs
+    run_worker(JobStore())
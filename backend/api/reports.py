@@ -0,0 +1,99 @@
+import os
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse, RedirectResponse
+from utils.report_store import (
+    REPORT_STORE_BACKEND,
+    get_report_path,
+    get_report_presigned_url,
+    is_valid_report_id,
+)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range_header(range_header: str, file_size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range "bytes=start-end" header.
+
+    Returns:
+        tuple: Inclusive (start, end) offsets, or None if the header is absent or not a byte range.
+
+    Raises:
+        HTTPException: 416 if the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            # Suffix range: the last N bytes.
+            length = int(end_text)
+            start, end = max(file_size - length, 0), file_size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else file_size - 1
+    except ValueError:
+        return None
+
+    end = min(end, file_size - 1)
+    if start > end or start >= file_size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    return start, end
+
+
+def iter_file_range(path, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def build_report_response(request: Request, report_id: str) -> Response:
+    if not is_valid_report_id(report_id):
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    report_path = get_report_path(report_id)
+    if not report_path.exists():
+        if REPORT_STORE_BACKEND == "s3":
+            url = get_report_presigned_url(report_id)
+            if url:
+                return RedirectResponse(url, status_code=307)
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    # Reports are content-addressed, so the id itself is a strong validator.
+    etag = f'"{report_id}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Content-Disposition": 'inline; filename="career_recommendation_report.pdf"'
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    file_size = os.path.getsize(report_path)
+    byte_range = parse_range_header(request.headers.get("range"), file_size)
+    if byte_range is None:
+        start, end, status_code = 0, file_size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(report_path, start, end),
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers
+    )
@@ -0,0 +1,73 @@
+import io
+from agents.crew_config import run_recommendation_pipeline
+from utils.pdf_utils import generate_pdf_report_with_details
+from utils.report_store import save_report
+
+
+class ResumeAnalysisError(Exception):
+    """Raised when the recommendation pipeline reports a failure."""
+
+
+def analyze_resume_content(
+    file_content: bytes,
+    file_name: str,
+    job_description: str,
+    location: str,
+    progress_callback=None,
+    jd_skills: list = None,
+    parsed_resume: dict = None
+) -> dict:
+    """
+    Run the full resume analysis chain: recommendation pipeline followed by PDF rendering.
+
+    Args:
+        file_content (bytes): Raw PDF bytes of the resume.
+        file_name (str): Original file name of the upload.
+        job_description (str): Target job description text.
+        location (str): Preferred job location.
+        progress_callback (callable): Optional callback invoked with the name of each stage as it starts.
+        jd_skills (list): Optional JD skills extracted beforehand.
+        parsed_resume (dict): Optional parse_resume output for this file.
+
+    Returns:
+        dict: The analysis response body (summary, match results, report link and markdown location).
+    """
+    result = run_recommendation_pipeline(
+        file_content=file_content,
+        file_name=file_name,
+        job_description=job_description,
+        location=location,
+        progress_callback=progress_callback,
+        jd_skills=jd_skills,
+        parsed_resume=parsed_resume
+    )
+    if result.get("status") == "error":
+        raise ResumeAnalysisError(result.get("message", "Resume analysis failed."))
+
+    full_text = result["recommendation_report"].raw
+    match_result = {
+        "resume_skills": result["resume_skills"],
+        "jd_skills": result["jd_skills"],
+        "matched_skills": result["matched_skills"],
+        "missing_skills": result["missing_skills"],
+        "match_score": result["match_score"]
+    }
+
+    if progress_callback:
+        progress_callback("rendering_report")
+
+    # Generate enhanced PDF report in memory
+    pdf_buffer = io.BytesIO()
+    generate_pdf_report_with_details(result["candidate_name"], match_result, full_text, output_stream=pdf_buffer)
+    report_id = save_report(pdf_buffer.getvalue())
+
+    return {
+        "summary": result["summary"],
+        "candidate_name": result["candidate_name"],
+        "match_score": result["match_score"],
+        "matched_skills": result["matched_skills"],
+        "missing_skills": result["missing_skills"],
+        "report_id": report_id,
+        "report_url": f"/reports/{report_id}.pdf",
+        "markdown_s3_url": result["markdown_s3_url"]
+    }
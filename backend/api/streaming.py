@@ -0,0 +1,32 @@
+import json
+import traceback
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop reverse proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: dict, event: str = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
+def sse_from_tokens(tokens):
+    """
+    Wrap a token iterator as Server-Sent Events.
+
+    Emits one `data: {"token": ...}` message per token, then a `done` event carrying
+    the full text, or an `error` event if generation fails part-way.
+    """
+    parts = []
+    try:
+        for token in tokens:
+            parts.append(token)
+            yield format_sse({"token": token})
+        yield format_sse({"text": "".join(parts).strip()}, event="done")
+    except Exception as e:
+        traceback.print_exc()
+        yield format_sse({"message": str(e)}, event="error")
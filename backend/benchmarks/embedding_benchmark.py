@@ -0,0 +1,102 @@
+"""
+Compare the PyTorch and int8 ONNX embedding backends: parity, throughput and memory on CPU.
+
+Each backend runs in its own fresh process so its resident memory is measured alone.
+Parity is the cosine similarity between the two backends' vectors for the same sentence,
+and how often both agree on each sentence's nearest neighbour.
+
+Usage (from backend/, after exporting the model with `PYTHONPATH=. python -m utils.embeddings`):
+    PYTHONPATH=. python benchmarks/embedding_benchmark.py
+    PYTHONPATH=. python benchmarks/embedding_benchmark.py --sentences questions.txt --batch-size 64
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+import numpy as np
+from utils.embeddings import create_embedder
+
+SAMPLE_SENTENCES = [
+    "How should I prepare for a system design interview at Amazon?",
+    "What questions are asked in the Google data engineer onsite?",
+    "Tell me about a time you disagreed with your manager.",
+    "Explain the difference between a left join and an inner join.",
+    "Which Python libraries are used for machine learning pipelines?",
+    "How many rounds are there in the Meta software engineer interview loop?",
+    "Describe how you would design a URL shortener.",
+    "What is the expected salary range for a data analyst in Boston?",
+    "How do I answer behavioural questions using the STAR method?",
+    "Experience with Apache Spark, Kafka and Airflow on AWS.",
+    "Built dashboards in Tableau and Power BI for the sales team.",
+    "Trained and deployed PyTorch models behind a FastAPI service on Kubernetes.",
+]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend: str, sentences: list, batch_size: int, repeats: int) -> dict:
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    embedder = create_embedder(backend)
+    load_seconds = time.perf_counter() - start
+
+    vectors = embedder.encode(sentences, batch_size=batch_size)  # warm-up, and the vectors compared for parity
+    start = time.perf_counter()
+    for _ in range(repeats):
+        embedder.encode(sentences, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "vectors": vectors,
+        "load_seconds": load_seconds,
+        "sentences_per_second": len(sentences) * repeats / elapsed,
+        "model_rss_mb": peak_rss_mb() - baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", help="Text file with one sentence per line; defaults to built-in samples")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.sentences:
+        with open(args.sentences, encoding="utf-8") as f:
+            sentences = [line.strip() for line in f if line.strip()]
+    else:
+        sentences = SAMPLE_SENTENCES
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for backend in ["torch", "onnx"]:
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, sentences, args.batch_size, args.repeats))
+
+    print(f"{len(sentences)} sentences, batch size {args.batch_size}, {args.repeats} repeats\n")
+    print(f"{'backend':<9}{'load s':>8}{'sent/s':>10}{'model MB':>10}{'peak MB':>9}")
+    for backend, result in results.items():
+        print(
+            f"{backend:<9}{result['load_seconds']:>8.2f}{result['sentences_per_second']:>10.1f}"
+            f"{result['model_rss_mb']:>10.0f}{result['peak_rss_mb']:>9.0f}"
+        )
+
+    reference, candidate = results["torch"]["vectors"], results["onnx"]["vectors"]
+    cosines = np.sum(reference * candidate, axis=1)
+    # Nearest neighbour of each sentence among the others, under each backend.
+    reference_sim, candidate_sim = reference @ reference.T, candidate @ candidate.T
+    np.fill_diagonal(reference_sim, -np.inf)
+    np.fill_diagonal(candidate_sim, -np.inf)
+    agreement = np.mean(reference_sim.argmax(axis=1) == candidate_sim.argmax(axis=1))
+    print(
+        f"\nparity: cosine min {cosines.min():.4f}, mean {cosines.mean():.4f}; "
+        f"nearest-neighbour agreement {agreement:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare end-to-end latency of the direct RAG and agentic FAQ pipelines.
+
+Both modes answer the same questions with the semantic answer cache bypassed, so every
+run does its full retrieval and generation. Questions alternate between modes to spread
+provider latency drift evenly.
+
+Usage (from backend/, with the LLM and Pinecone credentials set):
+    PYTHONPATH=. python benchmarks/faq_pipeline_benchmark.py
+    PYTHONPATH=. python benchmarks/faq_pipeline_benchmark.py --repeats 3 --show-answers
+"""
+import argparse
+import statistics
+import time
+from agents.crew_config import run_faq_pipeline
+
+SAMPLE_QUESTIONS = [
+    ("How many interview rounds are there?", "Data Engineer", "Amazon"),
+    ("What is the L5 onsite loop like?", "Software Engineer", "Google"),
+    ("Are LC hard problems common in the coding rounds?", "Software Engineer", "Meta"),
+    ("How should I prepare for the system design interview?", "Machine Learning Engineer", "Netflix"),
+    ("What behavioural questions come up most?", "Data Scientist", "Apple"),
+]
+MODES = ["direct", "agentic"]
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def answer_text(result: dict) -> str:
+    response = result.get("faq_response")
+    if isinstance(response, dict):
+        return response["raw"]
+    return getattr(response, "raw", "") or result.get("message", "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=1, help="Times each question is asked per mode")
+    parser.add_argument("--show-answers", action="store_true")
+    args = parser.parse_args()
+
+    latencies = {mode: [] for mode in MODES}
+    failures = {mode: 0 for mode in MODES}
+    print(f"{'question':<52}{'mode':<9}{'seconds':>9}{'chars':>7}")
+    for _ in range(args.repeats):
+        for question, role, company in SAMPLE_QUESTIONS:
+            for mode in MODES:
+                start = time.perf_counter()
+                result = run_faq_pipeline(question, role, company, pipeline_mode=mode, use_cache=False)
+                seconds = time.perf_counter() - start
+                if result.get("status") == "error":
+                    failures[mode] += 1
+                latencies[mode].append(seconds)
+                answer = answer_text(result)
+                print(f"{question[:51]:<52}{mode:<9}{seconds:>9.2f}{len(answer):>7}")
+                if args.show_answers:
+                    print(f"    {answer[:300]}")
+
+    print()
+    for mode in MODES:
+        values = latencies[mode]
+        print(
+            f"{mode:<9} median {statistics.median(values):.2f} s, p95 {percentile(values, 0.95):.2f} s, "
+            f"mean {statistics.mean(values):.2f} s, errors {failures[mode]}/{len(values)}"
+        )
+    speedup = statistics.median(latencies["agentic"]) / statistics.median(latencies["direct"])
+    print(f"\ndirect mode median speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
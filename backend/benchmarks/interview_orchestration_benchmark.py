@@ -0,0 +1,128 @@
+"""
+Compare per-turn latency and LLM token usage of the interview orchestration modes.
+
+Usage (from backend/, with GROK_API_KEY and OPENAI_API_KEY set):
+    PYTHONPATH=. python benchmarks/interview_orchestration_benchmark.py --turns 5
+"""
+import argparse
+import statistics
+import threading
+import time
+import litellm
+from agents.crew_config import run_interview_orchestration_pipeline
+from utils.llm_gateway import PROVIDERS
+from utils.metrics import LLM_REQUEST_DURATION, LLM_TOKENS
+
+SAMPLE_TURNS = [
+    ("Tell me about yourself.", "I'm a data engineer with four years of experience building Spark pipelines on AWS."),
+    ("What was the hardest pipeline you built?", "A streaming ingestion job from Kafka into Snowflake with exactly-once semantics."),
+    ("How did you handle late-arriving data?", "We used watermarking in Spark Structured Streaming and a daily backfill job."),
+    ("How did you monitor data quality?", "Great Expectations checks in Airflow, with alerts to Slack on failures."),
+    ("Describe a conflict with a teammate.", "We disagreed on schema design; I proposed a short spike to compare both options."),
+]
+
+usage_lock = threading.Lock()
+usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+
+def track_usage(kwargs, completion_response, start_time, end_time):
+    token_usage = getattr(completion_response, "usage", None)
+    if token_usage is None:
+        return
+    with usage_lock:
+        usage["calls"] += 1
+        usage["prompt_tokens"] += token_usage.prompt_tokens or 0
+        usage["completion_tokens"] += token_usage.completion_tokens or 0
+
+
+def reset_usage():
+    with usage_lock:
+        for key in usage:
+            usage[key] = 0
+
+
+def gateway_usage() -> dict:
+    """
+    Calls and tokens so far through the gateway's pooled provider clients.
+
+    Those calls never reach litellm, so its callback only sees the crew agents' own calls.
+    Gateway calls to other providers go through litellm and are already counted there.
+    """
+    totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    for metric in LLM_REQUEST_DURATION.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["provider"] in PROVIDERS:
+                totals["calls"] += int(sample.value)
+    for metric in LLM_TOKENS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total") and sample.labels["provider"] in PROVIDERS:
+                totals[f"{sample.labels['kind']}_tokens"] += int(sample.value)
+    return totals
+
+
+def run_mode(orchestration_mode: str, turns: int, role: str, mode: str) -> dict:
+    reset_usage()
+    gateway_before = gateway_usage()
+    latencies = []
+    transcript = []
+    for previous_question, user_answer in SAMPLE_TURNS[:turns]:
+        start = time.perf_counter()
+        run_interview_orchestration_pipeline(
+            action="next_question",
+            role=role,
+            mode=mode,
+            previous_question=previous_question,
+            user_answer=user_answer,
+            orchestration_mode=orchestration_mode
+        )
+        latencies.append(time.perf_counter() - start)
+        transcript.append((previous_question, user_answer))
+
+    start = time.perf_counter()
+    run_interview_orchestration_pipeline(
+        action="evaluate",
+        role=role,
+        mode=mode,
+        transcript=transcript,
+        orchestration_mode=orchestration_mode
+    )
+    evaluation_latency = time.perf_counter() - start
+
+    # litellm runs success callbacks on a background thread; give them a moment to land.
+    time.sleep(1)
+    gateway_after = gateway_usage()
+    with usage_lock:
+        snapshot = {key: usage[key] + gateway_after[key] - gateway_before[key] for key in usage}
+    return {
+        "mode": orchestration_mode,
+        "turn_p50": statistics.median(latencies),
+        "turn_max": max(latencies),
+        "evaluation": evaluation_latency,
+        "llm_calls": snapshot["calls"],
+        "tokens": snapshot["prompt_tokens"] + snapshot["completion_tokens"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=len(SAMPLE_TURNS))
+    parser.add_argument("--role", default="Data Engineer")
+    parser.add_argument("--mode", default="Behavioral")
+    args = parser.parse_args()
+
+    litellm.success_callback = [track_usage]
+    turns = min(args.turns, len(SAMPLE_TURNS))
+    results = [run_mode(m, turns, args.role, args.mode) for m in ("agentic", "direct")]
+
+    print(f"{'mode':<10}{'turn p50 (s)':>14}{'turn max (s)':>14}{'evaluate (s)':>14}{'LLM calls':>11}{'tokens':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['turn_p50']:>14.2f}{r['turn_max']:>14.2f}{r['evaluation']:>14.2f}{r['llm_calls']:>11}{r['tokens']:>10}")
+
+    agentic, direct = results
+    if agentic["tokens"]:
+        saved = 1 - direct["tokens"] / agentic["tokens"]
+        print(f"\nDirect dispatch saves {agentic['turn_p50'] - direct['turn_p50']:.2f}s per turn (p50) and {saved:.0%} of LLM tokens.")
+
+
+if __name__ == "__main__":
+    main()
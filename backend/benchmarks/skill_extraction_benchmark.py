@@ -0,0 +1,84 @@
+"""
+Compare latency and recall of the local dictionary skill extractor against the LLM extraction.
+
+Recall is measured against the LLM's skills, after mapping both through the alias table.
+
+Usage (from backend/, with OPENAI_API_KEY set):
+    PYTHONPATH=. python benchmarks/skill_extraction_benchmark.py --kind resume resumes/*.pdf
+    PYTHONPATH=. python benchmarks/skill_extraction_benchmark.py --kind jd
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+from data_processing.resume_processing import extract_text_from_pdf
+from data_processing.skill_extractor import extract_skills_locally, get_skill_extractor
+from data_processing.skill_matcher import extract_jd_skills_with_openai, extract_resume_skills_with_openai
+
+SAMPLE_JDS = [
+    "We are hiring a Data Engineer to build batch and streaming pipelines with Apache Spark, Kafka and Airflow on AWS. "
+    "Strong SQL and Python required; experience with Snowflake, dbt and Terraform is a plus.",
+    "Machine Learning Engineer: train and deploy deep learning models in PyTorch, serve them with FastAPI and Docker "
+    "on Kubernetes, and monitor them in production. Familiarity with NLP and large language models preferred.",
+    "Data Analyst with advanced Excel, SQL and Tableau or Power BI skills. You will build dashboards, run A/B test "
+    "analyses in R or Python, and present findings to stakeholders.",
+]
+
+
+def load_texts(paths: list) -> list:
+    texts = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix.lower() == ".pdf":
+            texts.append((path.name, extract_text_from_pdf(path.read_bytes())))
+        else:
+            texts.append((path.name, path.read_text(encoding="utf-8")))
+    return texts
+
+
+def timed_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="Resume PDFs or text/markdown files; defaults to built-in sample JDs")
+    parser.add_argument("--kind", choices=["resume", "jd"], default="jd")
+    args = parser.parse_args()
+
+    texts = load_texts(args.paths) if args.paths else [(f"sample_jd_{i + 1}", jd) for i, jd in enumerate(SAMPLE_JDS)]
+    llm_extract = extract_resume_skills_with_openai if args.kind == "resume" else extract_jd_skills_with_openai
+
+    # Build the lexicon up front so its one-off cost is not charged to the first document.
+    _, lexicon_seconds = timed_call(get_skill_extractor)
+    extractor = get_skill_extractor()
+    print(f"Lexicon: {len(extractor.lexicon)} surface forms, built in {lexicon_seconds * 1000:.1f} ms\n")
+
+    local_latencies, llm_latencies, recalls = [], [], []
+    print(f"{'document':<28}{'local ms':>10}{'llm ms':>10}{'local':>7}{'llm':>6}{'recall':>8}")
+    for name, text in texts:
+        local_skills, local_seconds = timed_call(extract_skills_locally, text)
+        llm_skills, llm_seconds = timed_call(lambda t: llm_extract(t, use_cache=False), text)
+
+        local_set = {extractor.canonicalize(s).lower() for s in local_skills}
+        llm_set = {extractor.canonicalize(s).lower() for s in llm_skills}
+        recall = len(local_set & llm_set) / len(llm_set) if llm_set else 1.0
+
+        local_latencies.append(local_seconds)
+        llm_latencies.append(llm_seconds)
+        recalls.append(recall)
+        print(f"{name[:27]:<28}{local_seconds * 1000:>10.2f}{llm_seconds * 1000:>10.0f}{len(local_set):>7}{len(llm_set):>6}{recall:>8.2f}")
+        missed = sorted(llm_set - local_set)
+        if missed:
+            print(f"    missed by local: {', '.join(missed)}")
+
+    print(
+        f"\nmedian latency: local {statistics.median(local_latencies) * 1000:.2f} ms, "
+        f"llm {statistics.median(llm_latencies) * 1000:.0f} ms; mean recall {statistics.mean(recalls):.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import os
 import re
+import shutil
+import tempfile
 import fitz  # PyMuPDF
 import logging
 from uuid import uuid4
@@ -7,14 +9,14 @@ from dotenv import load_dotenv
 from pathlib import Path
 from markitdown import MarkItDown
 from utils.s3_utils import upload_file_to_s3
-from data_processing.skill_matcher import extract_resume_skills_with_openai
-import openai
+from data_processing.skill_extractor import extract_resume_skills
+from utils.metrics import timed
 
 # Load environment variables
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
+@timed("pdf_extraction")
 def extract_text_from_pdf(file_content: bytes) -> str:
     temp_path = f"temp_resume_{uuid4().hex[:6]}.pdf"
     with open(temp_path, "wb") as f:
@@ -27,6 +29,7 @@ def extract_text_from_pdf(file_content: bytes) -> str:
     return raw_text
 
 
+@timed("markdown_conversion")
 def convert_text_to_markdown(text: str, html_path: Path, md_path: Path) -> str:
     with open(html_path, "w", encoding="utf-8") as f:
         f.write(f"<html><body><pre>{text}</pre></body></html>")
@@ -64,32 +67,53 @@ def extract_name_from_resume(markdown_text: str) -> str:
             return line
     return "Candidate"
 
-def process_pdf(file_content: bytes, file_name: str) -> dict:
-    logging.basicConfig(level=logging.DEBUG)
-    try:
-        logging.debug("Starting PDF processing using PyMuPDF + MarkItDown.")
-
-        raw_text = extract_text_from_pdf(file_content)
-
-        # Filenames
-        pdf_filename = Path(file_name).stem.replace(" ", "_").upper().split('_')[0]
-        html_path = Path(f"temp_{uuid4().hex[:6]}.html")
-        md_path = Path(f"{pdf_filename}_resume.md")
+def parse_resume(file_content: bytes, file_name: str) -> dict:
+    """
+    Extract the resume text and convert it to markdown, without any LLM or S3 work.
 
-        # Convert text to markdown via HTML
-        markdown_text = convert_text_to_markdown(raw_text, html_path, md_path)
-        logging.debug(f"Converted to markdown: {md_path}")
+    The markdown is also written to a temporary directory for upload_resume_markdown; callers
+    that may not reach the upload remove it with discard_resume_markdown.
+    """
+    logging.debug("Starting PDF processing using PyMuPDF + MarkItDown.")
 
-        name = extract_name_from_resume(markdown_text)
-        logging.debug(f"Extracted name: {name}")
+    raw_text = extract_text_from_pdf(file_content)
 
-        # Extract skills
-        extracted_skills = extract_resume_skills_with_openai(markdown_text)
-        logging.debug(f"Extracted skills: {extracted_skills}")
+    # Filenames
+    pdf_filename = Path(file_name).stem.replace(" ", "_").upper().split('_')[0]
+    html_path = Path(f"temp_{uuid4().hex[:6]}.html")
+    # Own directory per call so concurrent analyses of same-named resumes don't share the file;
+    # the file name itself is kept since it becomes the S3 object name.
+    md_path = Path(tempfile.mkdtemp(prefix="resume_")) / f"{pdf_filename}_resume.md"
 
-        # Upload to S3
+    # Convert text to markdown via HTML
+    try:
+        markdown_text = convert_text_to_markdown(raw_text, html_path, md_path)
+    except BaseException:
+        discard_resume_markdown(str(md_path))
+        raise
+    finally:
+        html_path.unlink(missing_ok=True)
+    logging.debug(f"Converted to markdown: {md_path}")
+
+    name = extract_name_from_resume(markdown_text)
+    logging.debug(f"Extracted name: {name}")
+
+    return {
+        "candidate_name": name,
+        "markdown_text": markdown_text,
+        "md_path": str(md_path),
+        "pdf_filename": pdf_filename,
+    }
+
+def discard_resume_markdown(md_path: str):
+    """Remove the temporary directory parse_resume wrote the markdown to; safe to call twice."""
+    shutil.rmtree(Path(md_path).parent, ignore_errors=True)
+
+def upload_resume_markdown(md_path: str, file_name: str) -> str:
+    """Upload the markdown written by parse_resume to S3 and remove the local copy."""
+    try:
         markdown_s3_url = upload_file_to_s3(
-            file_path=str(md_path),
+            file_path=md_path,
             source="resumes/markdown",
             metadata={
                 "file_type": "markdown",
@@ -97,15 +121,26 @@ def process_pdf(file_content: bytes, file_name: str) -> dict:
             }
         )
         logging.debug(f"Markdown uploaded to S3: {markdown_s3_url}")
+        return markdown_s3_url
+    finally:
+        discard_resume_markdown(md_path)
 
-        # Clean up
-        os.remove(html_path)
-        os.remove(md_path)
+def process_pdf(file_content: bytes, file_name: str) -> dict:
+    logging.basicConfig(level=logging.DEBUG)
+    try:
+        parsed = parse_resume(file_content, file_name)
+
+        # Extract skills
+        extracted_skills = extract_resume_skills(parsed["markdown_text"])
+        logging.debug(f"Extracted skills: {extracted_skills}")
+
+        # Upload to S3
+        markdown_s3_url = upload_resume_markdown(parsed["md_path"], file_name)
 
         return {
-            "candidate_name": name,
+            "candidate_name": parsed["candidate_name"],
             "markdown_s3_url": markdown_s3_url,
-            "pdf_filename": pdf_filename,
+            "pdf_filename": parsed["pdf_filename"],
             "extracted_skills": extracted_skills,
             "status": "success",
             "message": "Resume processed successfully using PyMuPDF + MarkItDown."
@@ -113,4 +148,4 @@ def process_pdf(file_content: bytes, file_name: str) -> dict:
 
     except Exception as e:
         logging.error(f"Error in resume processing: {e}", exc_info=True)
-        raise RuntimeError(f"Resume processing failed: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Resume processing failed: {str(e)}")
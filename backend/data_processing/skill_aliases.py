@@ -0,0 +1,61 @@
+# Canonical skill name -> other ways resumes and job descriptions write it.
+# Shared by the local skill extractor and skill matching, so both agree on one name per skill.
+SKILL_ALIASES = {
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure"],
+    "GCP": ["Google Cloud Platform", "Google Cloud"],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": [],
+    "Node.js": ["NodeJS", "Node JS"],
+    "React": ["React.js", "ReactJS"],
+    "Kubernetes": ["K8s"],
+    "PostgreSQL": ["Postgres"],
+    "Machine Learning": ["ML"],
+    "Deep Learning": [],
+    "Natural Language Processing": ["NLP"],
+    "Large Language Models": ["LLM", "LLMs"],
+    "Artificial Intelligence": ["AI"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "Power BI": ["PowerBI"],
+    "Tableau": [],
+    "CI/CD": ["Continuous Integration", "Continuous Delivery"],
+    "Apache Spark": ["Spark", "PySpark"],
+    "Apache Kafka": ["Kafka"],
+    "Apache Airflow": ["Airflow"],
+    "Snowflake": [],
+    "dbt": [],
+    "SQL": [],
+    "NoSQL": [],
+    "MongoDB": ["Mongo"],
+    "Python": [],
+    "Java": [],
+    "C++": ["CPP"],
+    "C#": ["CSharp"],
+    "C": [],
+    "R": [],
+    "Go": ["Golang"],
+    "Docker": [],
+    "Git": [],
+    "Linux": [],
+    "Excel": ["Microsoft Excel", "MS Excel"],
+    "Pandas": [],
+    "NumPy": [],
+    "FastAPI": [],
+    "Flask": [],
+    "Django": [],
+    "REST APIs": ["REST API", "RESTful APIs", "REST"],
+    "GraphQL": [],
+    "Terraform": [],
+    "Data Analysis": [],
+    "Data Visualization": ["Data Visualisation"],
+    "Statistics": [],
+    "ETL": [],
+    "Computer Vision": [],
+    "Agile": ["Scrum"],
+}
+
+# Surface forms that are also everyday English words ("rest assured", "excel at", "go the extra
+# mile"); the skill extractor only matches these with the exact casing given here.
+CASE_SENSITIVE_ALIASES = {"REST", "Excel", "Go", "Spark", "React"}
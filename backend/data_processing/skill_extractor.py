@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from collections import deque
+from dotenv import load_dotenv
+from data_processing.skill_aliases import CASE_SENSITIVE_ALIASES, SKILL_ALIASES
+from data_processing.skill_matcher import extract_jd_skills_with_openai, extract_resume_skills_with_openai
+from utils.catalog_replica import catalog_replica
+from utils.metrics import timed
+
+load_dotenv()
+
+# "local" never calls the LLM, "llm" always does, "hybrid" only when the local pass finds too little.
+SKILL_EXTRACTION_MODE = os.getenv("SKILL_EXTRACTION_MODE", "hybrid").lower()
+SKILL_EXTRACTION_MIN_SKILLS = int(os.getenv("SKILL_EXTRACTION_MIN_SKILLS", "5"))
+SKILL_LEXICON_REFRESH_SECONDS = float(os.getenv("SKILL_LEXICON_REFRESH_SECONDS", "3600"))
+
+# Catalog entries longer than this are descriptions rather than skills.
+MAX_SKILL_WORDS = 4
+MAX_SKILL_CHARS = 40
+# Terms this short ("R", "C", "AI", "ML") are only matched with the exact casing in the lexicon,
+# as are the CASE_SENSITIVE_ALIASES that double as English words.
+CASE_SENSITIVE_MAX_CHARS = 2
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton finding every occurrence of a set of patterns in one pass over a text."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append(pattern)
+
+    def _build(self):
+        # Children of the root fail back to the root; deeper states are filled in breadth-first.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end) spans, end exclusive, and the matched pattern."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._output[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+
+def build_lexicon(catalog_terms: list = None) -> dict:
+    """
+    Map every surface form (lowercased) to its canonical skill name.
+
+    Args:
+        catalog_terms (list): Skill names harvested from the course catalog.
+
+    Returns:
+        dict: surface form -> (canonical name, exact surface form).
+    """
+    lexicon = {}
+
+    def add(surface: str, canonical: str):
+        surface = surface.strip()
+        if surface and surface.lower() not in lexicon:
+            lexicon[surface.lower()] = (canonical, surface)
+
+    # Aliases first so their canonical names win over catalog spellings.
+    for canonical, aliases in SKILL_ALIASES.items():
+        add(canonical, canonical)
+        for alias in aliases:
+            add(alias, canonical)
+    for term in catalog_terms or []:
+        if CASE_SENSITIVE_MAX_CHARS < len(term) <= MAX_SKILL_CHARS and len(term.split()) <= MAX_SKILL_WORDS:
+            add(term, term)
+    return lexicon
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+def is_case_sensitive(surface: str) -> bool:
+    return len(surface) <= CASE_SENSITIVE_MAX_CHARS or surface in CASE_SENSITIVE_ALIASES
+
+
+class SkillExtractor:
+    """Dictionary-based skill extraction over a fixed lexicon."""
+
+    def __init__(self, lexicon: dict):
+        self.lexicon = lexicon
+        self._automaton = AhoCorasick(lexicon.keys())
+
+    def extract(self, text: str) -> list:
+        """Canonical names of the lexicon skills mentioned in the text, in order of first mention."""
+        lowered = text.lower()
+        spans = []
+        for start, end, pattern in self._automaton.iter_matches(lowered):
+            # Whole words only: "Go" must not match inside "Google".
+            if start > 0 and is_word_char(lowered[start - 1]) and is_word_char(pattern[0]):
+                continue
+            if end < len(lowered) and is_word_char(lowered[end]) and is_word_char(pattern[-1]):
+                continue
+            canonical, surface = self.lexicon[pattern]
+            if is_case_sensitive(surface) and text[start:end] != surface:
+                continue
+            spans.append((start, end, canonical))
+
+        # Keep the longest match where matches overlap ("Google Cloud Platform" over "Cloud").
+        spans.sort(key=lambda span: (span[0], -(span[1] - span[0])))
+        skills, covered_until = [], 0
+        for start, end, canonical in spans:
+            if start < covered_until:
+                continue
+            covered_until = end
+            if canonical not in skills:
+                skills.append(canonical)
+        return skills
+
+    def canonicalize(self, skill: str) -> str:
+        entry = self.lexicon.get(skill.strip().lower())
+        return entry[0] if entry else skill.strip()
+
+
+_extractor = None
+_extractor_built_at = None
+_extractor_lock = threading.Lock()
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Process-wide extractor over the alias table and the course catalog's skills, rebuilt periodically."""
+    global _extractor, _extractor_built_at
+    with _extractor_lock:
+        now = time.monotonic()
+        if _extractor is None or now - _extractor_built_at > SKILL_LEXICON_REFRESH_SECONDS:
+            catalog_terms = catalog_replica.course_skill_terms() if catalog_replica else None
+            _extractor = SkillExtractor(build_lexicon(catalog_terms))
+            _extractor_built_at = now
+        return _extractor
+
+
+def merge_skills(extractor: SkillExtractor, *skill_lists) -> list:
+    merged = []
+    for skills in skill_lists:
+        for skill in skills:
+            canonical = extractor.canonicalize(skill)
+            if canonical.lower() not in {s.lower() for s in merged}:
+                merged.append(canonical)
+    return merged
+
+
+@timed("local_skill_extraction")
+def extract_skills_locally(text: str) -> list:
+    return get_skill_extractor().extract(text)
+
+
+def extract_skills(text: str, llm_fallback, mode: str = None) -> list:
+    mode = (mode or SKILL_EXTRACTION_MODE).lower()
+    if mode == "llm":
+        return llm_fallback(text)
+    skills = extract_skills_locally(text)
+    if mode == "hybrid" and len(skills) < SKILL_EXTRACTION_MIN_SKILLS:
+        # Low coverage usually means the text uses skills the lexicon doesn't know yet.
+        skills = merge_skills(get_skill_extractor(), skills, llm_fallback(text))
+    return skills
+
+
+def extract_jd_skills(jd_text: str, mode: str = None) -> list:
+    return extract_skills(jd_text, extract_jd_skills_with_openai, mode)
+
+
+def extract_resume_skills(markdown: str, mode: str = None) -> list:
+    return extract_skills(markdown, extract_resume_skills_with_openai, mode)
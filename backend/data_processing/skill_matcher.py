@@ -1,11 +1,21 @@
 import os
-import openai
+import re
+import numpy as np
+from dotenv import load_dotenv
+from data_processing.skill_aliases import SKILL_ALIASES
+from utils.embeddings import get_embedder
+from utils.metrics import timed, timed_stage
+from utils.llm_gateway import chat_completion
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+load_dotenv()
+
+SKILL_MATCH_EMBEDDINGS = os.getenv("SKILL_MATCH_EMBEDDINGS", "true").lower() == "true"
+SKILL_MATCH_SIMILARITY_THRESHOLD = float(os.getenv("SKILL_MATCH_SIMILARITY_THRESHOLD", "0.8"))
 
 # --- JD Skill Extraction ---
 
-def extract_jd_skills_with_openai(jd_text: str) -> list:
+@timed("llm_jd_skill_extraction")
+def extract_jd_skills_with_openai(jd_text: str, use_cache: bool = True) -> list:
     prompt = f"""
 Extract the technical skills, tools, or platforms required in this job description.
 Return them as a comma-separated list.
@@ -13,17 +23,18 @@ Return them as a comma-separated list.
 JD:
 {jd_text}
 """
-    response = openai.chat.completions.create(
+    skills = chat_completion(
         model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    skills = response.choices[0].message.content.strip()
+        messages=[{"role": "user", "content": prompt}],
+        cache=use_cache
+    ).strip()
     return [s.strip() for s in skills.split(",") if s.strip()]
 
 
 # --- Resume Skill Extraction ---
 
-def extract_resume_skills_with_openai(markdown: str) -> list:
+@timed("llm_resume_skill_extraction")
+def extract_resume_skills_with_openai(markdown: str, use_cache: bool = True) -> list:
     prompt = f"""
 You are an AI assistant for resume analysis.
 
@@ -34,21 +45,110 @@ Return them as a clean, comma-separated list.
 Markdown:
 {markdown}
 """
-    response = openai.chat.completions.create(
+    content = chat_completion(
         model="gpt-3.5-turbo",
         messages=[{"role": "user", "content": prompt}],
-        temperature=0.2
-    )
-    content = response.choices[0].message.content.strip()
+        temperature=0.2,
+        cache=use_cache
+    ).strip()
     return [s.strip() for s in content.split(",") if s.strip()]
 
 
 # --- Skill Matching ---
 
-def compare_skills(resume_skills: list, jd_skills: list) -> dict:
-    matched = list(set(resume_skills) & set(jd_skills))
-    missing = list(set(jd_skills) - set(resume_skills))
-    score = round(len(matched) / max(len(jd_skills), 1), 2)
+# Trailing versions: "Python 3", "python3.10", "Java 8", "Angular 2+". Glued-on digits are only
+# stripped after a word of 4+ letters, so names like S3, EC2 and ES6 survive.
+VERSION_SUFFIX = re.compile(r"(?:(?<=[a-z]{4})|\s+)v?\d+(?:\.\d+)*\+?$")
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, drop parentheticals, punctuation and version suffixes."""
+    s = skill.strip().lower()
+    s = re.sub(r"\(.*?\)", " ", s)
+    # Keep the characters that are part of names like C++, C#, Node.js and CI/CD.
+    s = re.sub(r"[^\w+#./ -]", " ", s)
+    s = re.sub(r"[\s_-]+", " ", s).strip(" ./")
+    return VERSION_SUFFIX.sub("", s).strip()
+
+
+ALIAS_INDEX = {
+    normalize_skill(name): normalize_skill(canonical)
+    for canonical, aliases in SKILL_ALIASES.items()
+    for name in [canonical, *aliases]
+}
+
+
+def canonicalize_skill(skill: str) -> str:
+    """Comparison key for a skill: normalized, then mapped through the alias table."""
+    normalized = normalize_skill(skill)
+    return ALIAS_INDEX.get(normalized, normalized)
+
+
+def embed_skills(skills: list) -> np.ndarray:
+    return get_embedder().encode(skills)
+
+
+def similarity_matches(resume_skills: list, jd_skills: list, threshold: float) -> dict:
+    """
+    Best resume skill for each JD skill by embedding similarity, computed as one
+    resume x JD cosine matrix.
+
+    Returns:
+        dict: JD skill -> (resume skill, score) for pairs at or above the threshold.
+    """
+    if not resume_skills or not jd_skills:
+        return {}
+    with timed_stage("skill_similarity_matrix"):
+        vectors = embed_skills(resume_skills + jd_skills)
+        similarity = vectors[:len(resume_skills)] @ vectors[len(resume_skills):].T
+    best = similarity.argmax(axis=0)
+    return {
+        jd_skill: (resume_skills[best[j]], float(similarity[best[j], j]))
+        for j, jd_skill in enumerate(jd_skills)
+        if similarity[best[j], j] >= threshold
+    }
+
+
+def compare_skills(resume_skills: list, jd_skills: list, use_embeddings: bool = SKILL_MATCH_EMBEDDINGS) -> dict:
+    """
+    Match JD skills against resume skills.
+
+    A JD skill matches when its canonical form (see canonicalize_skill) equals a resume
+    skill's, or, failing that, when the closest resume skill by embedding similarity
+    scores at least SKILL_MATCH_SIMILARITY_THRESHOLD.
+
+    Returns:
+        dict: The skill lists, match_score, matched/missing JD skills, per-JD-skill
+        `skill_matches` (resume skill, score and method) and the prompt context.
+    """
+    resume_by_key = {}
+    for skill in resume_skills:
+        resume_by_key.setdefault(canonicalize_skill(skill), skill)
+
+    # De-duplicate JD skills that only differ in spelling ("Python 3" and "python").
+    jd_by_key = {}
+    for skill in jd_skills:
+        jd_by_key.setdefault(canonicalize_skill(skill), skill)
+
+    skill_matches = {}
+    for key, jd_skill in jd_by_key.items():
+        if key in resume_by_key:
+            skill_matches[jd_skill] = {"resume_skill": resume_by_key[key], "score": 1.0, "method": "canonical"}
+
+    unmatched = [s for s in jd_by_key.values() if s not in skill_matches]
+    unused_resume = [s for k, s in resume_by_key.items() if k not in jd_by_key]
+    if use_embeddings and unmatched and unused_resume:
+        try:
+            for jd_skill, (resume_skill, score) in similarity_matches(
+                unused_resume, unmatched, SKILL_MATCH_SIMILARITY_THRESHOLD
+            ).items():
+                skill_matches[jd_skill] = {"resume_skill": resume_skill, "score": round(score, 3), "method": "embedding"}
+        except Exception as e:
+            print(f"Embedding skill matching failed, using canonical matches only: {str(e)}")
+
+    matched = [s for s in jd_by_key.values() if s in skill_matches]
+    missing = [s for s in jd_by_key.values() if s not in skill_matches]
+    score = round(len(matched) / max(len(jd_by_key), 1), 2)
 
     return {
         "resume_skills": resume_skills,
@@ -56,6 +156,7 @@ def compare_skills(resume_skills: list, jd_skills: list) -> dict:
         "match_score": score,
         "matched_skills": matched,
         "missing_skills": missing,
+        "skill_matches": skill_matches,
         "prompt_context": (
             f"Candidate has skills: {', '.join(resume_skills)}.\n"
             f"JD requires: {', '.join(jd_skills)}.\n"
@@ -63,4 +164,4 @@ def compare_skills(resume_skills: list, jd_skills: list) -> dict:
             f"Missing: {', '.join(missing)}.\n"
             f"Score: {score * 100:.0f}%."
         )
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,124 @@
+import importlib
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from utils import bm25_index, embeddings, local_vector_store
+
+# The Airflow image cannot import backend code, so it keeps its own copies of the
+# embedding, vector store and BM25 code; these tests keep the copies in step. They also
+# cover the Airflow-only chunking helpers, since airflow/ has no test suite of its own.
+AIRFLOW_DIR = Path(__file__).resolve().parents[2] / "airflow"
+if not (AIRFLOW_DIR / "scripts").is_dir():
+    pytest.skip("airflow/ is not checked out next to backend/", allow_module_level=True)
+sys.path.insert(0, str(AIRFLOW_DIR))
+
+airflow_embeddings = importlib.import_module("scripts.embeddings")
+airflow_vector_store = importlib.import_module("scripts.local_vector_store")
+airflow_bm25 = importlib.import_module("scripts.bm25_index")
+airflow_chunking = importlib.import_module("scripts.chunking")
+
+TEXTS = [
+    "The L5 onsite loop had two LC hard problems and a system design round.",
+    "Practice LC medium problems in C++ and C# before the phone screen!",
+    "",
+]
+
+
+def test_embedding_settings_and_pooling_match():
+    for name in ["EMBEDDING_MODEL_NAME", "EMBEDDING_DIMENSION", "EMBEDDING_MAX_TOKENS", "ONNX_MODEL_FILE"]:
+        assert getattr(airflow_embeddings, name) == getattr(embeddings, name), name
+
+    tokens = np.random.default_rng(0).normal(size=(3, 5, 8)).astype(np.float32)
+    mask = np.array([[1, 1, 1, 0, 0], [1, 1, 1, 1, 1], [1, 0, 0, 0, 0]])
+    np.testing.assert_array_equal(airflow_embeddings.mean_pool(tokens, mask), embeddings.mean_pool(tokens, mask))
+
+
+def test_vector_store_files_are_identical(tmp_path):
+    ids = ["a", "b"]
+    vectors = np.random.default_rng(1).normal(size=(2, 4))
+    metadatas = [{"text": "amazon swe", "company": "Amazon"}, {"text": "google swe", "company": "Google"}]
+
+    airflow_path = airflow_vector_store.write_vector_store(str(tmp_path / "airflow.bin"), ids, vectors, metadatas, dimension=4)
+    backend_path = local_vector_store.write_vector_store(str(tmp_path / "backend.bin"), ids, vectors, metadatas, dimension=4)
+    assert Path(airflow_path).read_bytes() == Path(backend_path).read_bytes()
+
+    store = local_vector_store.read_vector_store(airflow_path)
+    assert store["ids"] == ids
+    assert store["metadata"] == metadatas
+
+
+def test_bm25_tokenizer_and_index_match():
+    assert airflow_bm25.TOKEN_PATTERN.pattern == bm25_index.TOKEN_PATTERN.pattern
+    assert airflow_bm25.STOPWORDS == bm25_index.STOPWORDS
+    for text in TEXTS:
+        assert airflow_bm25.tokenize(text) == bm25_index.tokenize(text)
+
+    ids, metadatas = ["a", "b", "c"], [{"text": t} for t in TEXTS]
+    assert airflow_bm25.build_bm25_index(ids, TEXTS, metadatas) == bm25_index.build_bm25_index(ids, TEXTS, metadatas)
+
+
+def topic_vector(text):
+    # Sentences about the same company point the same way, so they chunk together.
+    for axis, company in enumerate(["amazon", "google"]):
+        if company in text.lower():
+            return np.eye(3, dtype=np.float32)[axis]
+    return np.eye(3, dtype=np.float32)[2]
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    calls = []
+
+    def compute_embeddings(texts, batch_size=8):
+        calls.append(list(texts))
+        return np.stack([topic_vector(t) for t in texts]) if texts else np.zeros((0, 3), dtype=np.float32)
+
+    monkeypatch.setattr(airflow_chunking, "compute_embeddings", compute_embeddings)
+    return calls
+
+
+def test_pool_chunk_embeddings_is_a_length_weighted_unit_mean():
+    sentences = ["a" * 30, "b" * 10, "c" * 5]
+    embeddings = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, 1.0]], dtype=np.float32)
+    pooled = airflow_chunking.pool_chunk_embeddings(sentences, embeddings, [[0, 1], [2]])
+
+    expected = np.array([30.0, 10.0]) / np.linalg.norm([30.0, 10.0])
+    np.testing.assert_allclose(pooled[0], expected, rtol=1e-6)
+    np.testing.assert_allclose(pooled[1], [0.0, 1.0])
+
+
+def test_batch_chunking_slices_one_encoder_pass_per_document(fake_encoder):
+    documents = [
+        "Amazon has four rounds. Amazon asks LPs. Google was easier.",
+        "Google loops are long.",
+        "Salary talks come last. Negotiate the offer.",
+    ]
+    batched = airflow_chunking.cluster_based_chunking_batch(documents, embedding_mode="pooled")
+    assert len(fake_encoder) == 1
+
+    assert [chunks for chunks, _ in batched] == [
+        ["Amazon has four rounds. Amazon asks LPs.", "Google was easier."],
+        ["Google loops are long."],
+        ["Salary talks come last. Negotiate the offer."],
+    ]
+    for chunks, pooled in batched:
+        np.testing.assert_allclose(pooled, np.stack([topic_vector(chunk) for chunk in chunks]), atol=1e-6)
+        assert pooled.shape == (len(chunks), 3)
+
+    for document, (chunks, pooled) in zip(documents, batched):
+        single_chunks, single_pooled = airflow_chunking.cluster_based_chunking_with_embeddings(document)
+        assert single_chunks == chunks
+        np.testing.assert_allclose(single_pooled, pooled)
+
+
+def test_batch_chunking_reencode_and_none_modes(fake_encoder):
+    documents = ["Amazon has four rounds. Google was easier.", "Negotiate the offer."]
+    reencoded = airflow_chunking.cluster_based_chunking_batch(documents, embedding_mode="reencode")
+    assert fake_encoder[1] == ["Amazon has four rounds.", "Google was easier.", "Negotiate the offer."]
+    assert [vectors.shape[0] for _, vectors in reencoded] == [2, 1]
+
+    assert all(vectors is None for _, vectors in airflow_chunking.cluster_based_chunking_batch(documents, embedding_mode="none"))
+    assert airflow_chunking.cluster_based_chunking_batch([]) == []
+    with pytest.raises(ValueError):
+        airflow_chunking.cluster_based_chunking_batch(documents, embedding_mode="mean")
@@ -1,7 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
+from api.executor import PoolSaturatedError
 from api.fastapi_backend import app
+from api.jobs import JobStore, process_job
 from agents.crew_config import run_oa_session, run_recommendation_pipeline, run_faq_pipeline
 from utils.resume_summarizer import generate_resume_summary
 
@@ -25,9 +27,10 @@ def test_oa_session(mock_oa):
     assert res.status_code == 200
     assert res.json()["response"] == "ok"
 
-@patch("agents.crew_config.run_recommendation_pipeline")
-@patch("utils.pdf_utils.generate_pdf_report_with_details")
-def test_analyze_resume(mock_pdf, mock_pipeline):
+@patch("api.resume_analysis.run_recommendation_pipeline")
+@patch("api.resume_analysis.generate_pdf_report_with_details")
+def test_analyze_resume(mock_pdf, mock_pipeline, tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.report_store.REPORTS_DIR", tmp_path)
     mock_report = MagicMock()
     mock_report.raw = "Report content"
     mock_pipeline.return_value = {
@@ -38,6 +41,7 @@ def test_analyze_resume(mock_pdf, mock_pipeline):
         "matched_skills": ["Python"],
         "missing_skills": ["SQL"],
         "match_score": 80,
+        "markdown_s3_url": "https://bucket.s3.amazonaws.com/resumes/markdown/JOHN_resume.md",
         "recommendation_report": mock_report
     }
     mock_pdf.return_value = None
@@ -48,7 +52,49 @@ def test_analyze_resume(mock_pdf, mock_pipeline):
 
     assert res.status_code == 200
     assert "summary" in res.json()
-    assert "pdf_base64" in res.json()
+    assert "pdf_base64" not in res.json()
+    assert res.json()["report_url"] == f"/reports/{res.json()['report_id']}.pdf"
+
+def test_get_report_supports_etag_and_range(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.report_store.REPORTS_DIR", tmp_path)
+    from utils.report_store import save_report
+    report_id = save_report(b"%PDF-1.4 fake report body")
+
+    res = client.get(f"/reports/{report_id}.pdf")
+    assert res.status_code == 200
+    assert res.content == b"%PDF-1.4 fake report body"
+    assert res.headers["content-length"] == str(len(res.content))
+    etag = res.headers["etag"]
+
+    res = client.get(f"/reports/{report_id}.pdf", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    res = client.get(f"/reports/{report_id}.pdf", headers={"Range": "bytes=0-7"})
+    assert res.status_code == 206
+    assert res.content == b"%PDF-1.4"
+    assert res.headers["content-range"].startswith("bytes 0-7/")
+
+    assert client.get(f"/reports/{'0' * 64}.pdf").status_code == 404
+
+def test_resume_analysis_job_submit_and_poll(tmp_path, monkeypatch):
+    store = JobStore(db_path=str(tmp_path / "jobs.db"), upload_dir=str(tmp_path / "uploads"))
+    monkeypatch.setattr("api.fastapi_backend.get_job_store", lambda: store)
+    file = ("resume.pdf", b"fake content", "application/pdf")
+    data = {"job_description": "Job desc", "location": "CA"}
+    res = client.post("/analyze-resume/jobs", files={"file": file}, data=data)
+
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+
+    status = client.get(f"/jobs/{job_id}")
+    assert status.status_code == 200
+    assert status.json()["status"] in ("queued", "running")
+
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.status_code == 409
+
+    assert store.get(job_id)["file_name"] == "resume.pdf"
+    assert client.get("/jobs/does-not-exist").status_code == 404
 
 @patch("agents.crew_config.run_faq_pipeline")
 def test_faq_success(mock_faq):
@@ -115,4 +161,89 @@ def test_generates_next_question_resume_mode(mock_summary, mock_pipeline):
 
     res = client.post("/generates_next_question/", json=payload)
     assert res.status_code == 200
-    assert "next_question" in res.json()
\ No newline at end of file
+    assert "next_question" in res.json()
+
+@patch("agents.tools.tools.InterviewEvaluationTool.stream")
+def test_evaluates_interview_stream(mock_stream):
+    mock_stream.return_value = iter(["Strong ", "candidate"])
+
+    payload = {
+        "transcript": [["Q1", "A1"]],
+        "role": "Backend Engineer",
+        "mode": "Behavioral"
+    }
+
+    res = client.post("/evaluates_interview/stream", json=payload)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    assert 'data: {"token": "Strong "}' in res.text
+    assert 'event: done\ndata: {"text": "Strong candidate"}' in res.text
+
+@patch("agents.tools.tools.QuestionGenerationTool.stream")
+def test_stream_next_question_rejects_when_pool_saturated(mock_stream, monkeypatch):
+    def saturated(*args, **kwargs):
+        raise PoolSaturatedError("interactive")
+
+    monkeypatch.setattr("api.fastapi_backend.interactive_pool.stream", saturated)
+    payload = {
+        "mode": "Technical",
+        "role": "SWE",
+        "previous_question": "Tell me about yourself",
+        "user_answer": "I'm a backend engineer"
+    }
+
+    res = client.post("/generates_next_question/stream", json=payload)
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "5"
+
+def test_metrics_and_trace_id():
+    res = client.get("/executor/stats", headers={"X-Trace-Id": "trace-123"})
+    assert res.status_code == 200
+    assert res.headers["x-trace-id"] == "trace-123"
+    assert client.get("/executor/stats").headers["x-trace-id"]
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert 'backend_request_duration_seconds_count{endpoint="/executor/stats",method="GET",status="200"}' in res.text
+    assert "backend_pool_occupancy" in res.text
+
+@patch("api.batch_analysis.BATCH_PARSE_PROCESSES", 0)
+@patch("api.batch_analysis.extract_jd_skills")
+@patch("api.batch_analysis.parse_resume")
+@patch("api.batch_analysis.analyze_resume_content")
+def test_analyze_resumes_batch_ranks_candidates(mock_analyze, mock_parse, mock_jd, tmp_path, monkeypatch):
+    store = JobStore(db_path=str(tmp_path / "jobs.db"), upload_dir=str(tmp_path / "uploads"))
+    monkeypatch.setattr("api.fastapi_backend.get_job_store", lambda: store)
+    mock_jd.return_value = ["Python", "SQL"]
+    mock_parse.side_effect = lambda content, name: {"candidate_name": name, "markdown_text": "", "md_path": "", "pdf_filename": name}
+
+    def analyze(file_name, parsed_resume, **kwargs):
+        if file_name == "broken.pdf":
+            raise RuntimeError("crew failed")
+        score = {"a.pdf": 50, "b.pdf": 100}[file_name]
+        return {
+            "candidate_name": parsed_resume["candidate_name"], "match_score": score,
+            "matched_skills": ["Python"], "missing_skills": [], "summary": "ok",
+            "report_url": f"/reports/{file_name}.pdf"
+        }
+    mock_analyze.side_effect = lambda **kwargs: analyze(**kwargs)
+
+    files = [("files", (name, b"fake content", "application/pdf")) for name in ["a.pdf", "broken.pdf", "b.pdf"]]
+    res = client.post("/analyze-resumes/batch", files=files, data={"job_description": "Job desc", "location": "CA"})
+
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+    assert client.get(f"/jobs/{job_id}").json()["kind"] == "batch"
+    mock_analyze.assert_not_called()
+
+    process_job(store, store.claim_next())
+    status = client.get(f"/jobs/{job_id}").json()
+    assert (status["status"], status["progress"]) == ("completed", 100)
+    assert not (tmp_path / "uploads" / job_id).exists()
+
+    candidates = client.get(f"/jobs/{job_id}/result").json()["candidates"]
+    assert [(c["rank"], c["file_name"], c["status"]) for c in candidates] == [
+        (1, "b.pdf", "completed"), (2, "a.pdf", "completed"), (3, "broken.pdf", "failed")
+    ]
+    assert mock_jd.call_count == 1
+    assert all(call.kwargs["jd_skills"] == ["Python", "SQL"] for call in mock_analyze.call_args_list)
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+from utils.bm25_index import BM25Index, build_bm25_index, reciprocal_rank_fusion
+from utils.pinecone_query import retrieve_chunks
+
+TEXTS = [
+    "The L5 onsite loop had two LC hard problems and a system design round.",
+    "Behavioural questions focused on leadership principles.",
+    "Practice LC medium problems in C++ before the phone screen.",
+]
+METADATAS = [
+    {"text": TEXTS[0], "company": "Google"},
+    {"text": TEXTS[1], "company": "Amazon"},
+    {"text": TEXTS[2], "company": "Amazon"},
+]
+
+
+def make_index():
+    return BM25Index(build_bm25_index(["a", "b", "c"], TEXTS, METADATAS))
+
+
+def test_bm25_ranks_keyword_matches_and_applies_filters():
+    index = make_index()
+    assert [m["id"] for m in index.search("LC hard L5 loop")] == ["a", "c"]
+    assert [m["id"] for m in index.search("c++ prep")] == ["c"]
+    assert [m["id"] for m in index.search("LC hard", filter={"company": {"$eq": "Amazon"}})] == ["c"]
+    assert index.search("salary negotiation") == []
+
+
+def test_bm25_ignores_stopwords():
+    index = make_index()
+    assert "the" not in index.postings and "a" not in index.postings
+    assert index.search("what is the best way to learn kubernetes for a job") == []
+    assert [m["id"] for m in index.search("what is the L5 loop")] == ["a"]
+    assert BM25Index(build_bm25_index(["a", "b", "c"], TEXTS, METADATAS), min_score=100).search("LC hard L5 loop") == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    dense = [{"id": "x", "score": 0.9, "metadata": {}}, {"id": "y", "score": 0.8, "metadata": {}}]
+    keyword = [{"id": "y", "score": 12.0, "metadata": {}}, {"id": "z", "score": 9.0, "metadata": {}}]
+    assert [m["id"] for m in reciprocal_rank_fusion([dense, keyword])] == ["y", "x", "z"]
+
+
+@patch("utils.pinecone_query.query_pinecone_chunks")
+def test_hybrid_retrieval_returns_keyword_matches_when_dense_finds_nothing(mock_dense):
+    mock_dense.return_value = {"status": "error", "message": "No relevant chunks found.", "matches": []}
+    with patch("utils.pinecone_query.local_bm25_index", make_index()):
+        results = retrieve_chunks("LC hard L5 loop", company="Google", top_k=5, mode="hybrid")
+        assert results["status"] == "success"
+        assert [m["metadata"]["text"] for m in results["matches"]] == [TEXTS[0]]
+
+        assert retrieve_chunks("LC hard", mode="dense") == mock_dense.return_value
+        assert retrieve_chunks("what is the best way to learn kubernetes for a job", mode="hybrid") == mock_dense.return_value
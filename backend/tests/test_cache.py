@@ -0,0 +1,46 @@
+from utils.cache import LRUCache
+
+
+def test_lru_eviction_order():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    cache = LRUCache(maxsize=1, disk_dir=str(tmp_path))
+    cache.set("resumes/markdown/JANE_resume.md:etag1", "summary one")
+    cache.set("resumes/markdown/JOHN_resume.md:etag2", "summary two")
+
+    restarted = LRUCache(maxsize=1, disk_dir=str(tmp_path))
+    assert restarted.get("resumes/markdown/JANE_resume.md:etag1") == "summary one"
+    assert restarted.get("resumes/markdown/JANE_resume.md:etag-changed") is None
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = LRUCache(maxsize=10, disk_dir=str(tmp_path), disk_max_entries=3)
+    for i in range(5):
+        cache.set(f"key{i}", i)
+    assert len(list(tmp_path.glob("*.json"))) == 3
+    assert cache.get("key4") == 4
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_tier_is_not_listed_on_every_write(tmp_path, monkeypatch):
+    cache = LRUCache(maxsize=10, disk_dir=str(tmp_path), disk_max_entries=100)
+    listings = []
+    list_disk = cache._list_disk
+    monkeypatch.setattr(cache, "_list_disk", lambda: listings.append(1) or list_disk())
+
+    for i in range(300):
+        cache.set(f"key{i}", i)
+    assert len(list(tmp_path.glob("*.json"))) <= 100
+    assert len(listings) <= 25
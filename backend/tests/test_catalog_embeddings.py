@@ -0,0 +1,76 @@
+import sqlite3
+import numpy as np
+import pytest
+import utils.catalog_embeddings as catalog_embeddings
+from utils.catalog_embeddings import CatalogEmbeddingIndex, semantic_top_courses_per_skill, top_k_cosine
+from utils.catalog_replica import CatalogReplica
+
+
+def unit(*values):
+    v = np.array(values, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def test_top_k_cosine_returns_best_rows_first():
+    matrix = np.stack([unit(1, 0, 0), unit(0, 1, 0), unit(1, 1, 0)])
+    indices, scores = top_k_cosine(matrix, np.stack([unit(1, 0.1, 0)]), k=2)
+    assert indices.tolist() == [[0, 2]]
+    assert scores[0][0] > scores[0][1]
+
+    indices, _ = top_k_cosine(matrix, np.stack([unit(0, 0, 1)]), k=10)
+    assert indices.shape == (1, 3)
+
+
+@pytest.fixture
+def semantic_catalog(tmp_path, monkeypatch):
+    db_path = tmp_path / "catalog_replica.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE VIRTUAL TABLE courses USING fts5(
+            title, skills, job_role, url UNINDEXED, rating UNINDEXED, reviews UNINDEXED, tokenize = 'trigram'
+        );
+        CREATE TABLE replica_meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO replica_meta VALUES ('build_id', '42');
+    """)
+    conn.executemany("INSERT INTO courses(rowid, title, skills, job_role, url, rating, reviews) VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (1, "AWS Cloud Practitioner", "Amazon Web Services", "Data Engineer", "https://c/aws", 4.7, 9000),
+        (2, "Deep Learning", "PyTorch", "Data Engineer", "https://c/dl", 4.9, 20000),
+        (3, "AWS for Marketers", "Amazon Web Services", "Marketing Analyst", "https://c/mkt", 4.8, 4000),
+    ])
+    conn.commit()
+    conn.close()
+    replica = CatalogReplica(db_path=str(db_path))
+    monkeypatch.setattr(replica, "refresh", lambda force=False: None)
+
+    npz_path = tmp_path / "catalog_embeddings.npz"
+    np.savez(
+        npz_path,
+        course_vectors=np.stack([unit(1, 0, 0), unit(0, 1, 0), unit(0.9, 0, 0.1)]).astype(np.float16),
+        course_ids=np.array([1, 2, 3]),
+        job_vectors=np.zeros((0, 3), dtype=np.float16),
+        job_ids=np.array([], dtype=np.int64),
+        build_id=np.array("42"),
+    )
+    index = CatalogEmbeddingIndex(path=str(npz_path))
+    monkeypatch.setattr(index._file, "refresh", lambda force=False: None)
+
+    monkeypatch.setattr(catalog_embeddings, "catalog_replica", replica)
+    monkeypatch.setattr(catalog_embeddings, "catalog_index", index)
+    # "cloud computing" lands next to the AWS courses, "neural networks" next to deep learning.
+    query_vectors = {"cloud computing": unit(1, 0, 0), "neural networks": unit(0, 1, 0)}
+    monkeypatch.setattr(catalog_embeddings, "embed_queries", lambda texts: np.stack([query_vectors[t] for t in texts]))
+    return replica
+
+
+def test_semantic_courses_match_synonyms_within_job_role(semantic_catalog):
+    rows = semantic_top_courses_per_skill(["cloud computing", "neural networks"], "data engineer", per_skill=2)
+    assert rows == [
+        ("cloud computing", "AWS Cloud Practitioner", "https://c/aws", 4.7),
+        ("neural networks", "Deep Learning", "https://c/dl", 4.9),
+    ]
+
+
+def test_index_from_another_build_is_ignored(semantic_catalog, monkeypatch):
+    monkeypatch.setattr(semantic_catalog, "build_id", lambda: "43")
+    monkeypatch.setattr(catalog_embeddings, "embed_queries", lambda texts: pytest.fail("encoded without a usable index"))
+    assert semantic_top_courses_per_skill(["cloud computing"], "Data Engineer") is None
@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+from unittest.mock import patch
+import pytest
+from agents.tools.tools import FetchMatchingJobsTool
+from utils.catalog_replica import CatalogReplica, S3SyncedFile, build_substring_filter
+
+# Same layout as the replica built by airflow/scripts/catalog_replica.py
+SCHEMA = """
+CREATE VIRTUAL TABLE courses USING fts5(
+    title, skills, job_role,
+    url UNINDEXED, rating UNINDEXED, reviews UNINDEXED,
+    tokenize = 'trigram'
+);
+CREATE VIRTUAL TABLE jobs USING fts5(
+    job_title, description, role,
+    company_name UNINDEXED, location UNINDEXED, job_url UNINDEXED,
+    tokenize = 'trigram'
+);
+"""
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    db_path = tmp_path / "catalog_replica.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?)", [
+        ("Machine Learning Specialization", "Python, Scikit-learn", "Data Scientist", "https://c/ml", 4.9, 20000),
+        ("SQL for Data Science", "SQL, PostgreSQL", "Data Scientist", "https://c/sql", 4.6, 9000),
+        ("Intro to R", "R, Statistics", "Data Scientist", "https://c/r", 4.7, 5000),
+        ("Python for Everybody", "Python", "Software Engineer", "https://c/py", 4.8, 100000),
+    ])
+    conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)", [
+        ("Data Scientist", "Build models in Python and Spark", "Data Scientist", "Acme", "Boston", "https://j/1"),
+        ("Senior Data Scientist", "Own the SQL warehouse", "Data Scientist", "Globex", "NYC", "https://j/2"),
+    ])
+    conn.commit()
+    conn.close()
+
+    replica = CatalogReplica(db_path=str(db_path))
+    monkeypatch.setattr(replica, "refresh", lambda force=False: None)
+    return replica
+
+
+def test_top_courses_per_skill_ranks_each_skill_separately(replica):
+    rows = replica.top_courses_per_skill(["python", "sql"], "data scientist", per_skill=1)
+    assert rows == [
+        ("python", "Machine Learning Specialization", "https://c/ml", 4.9),
+        ("sql", "SQL for Data Science", "https://c/sql", 4.6),
+    ]
+
+
+def test_short_terms_fall_back_to_like(replica):
+    where, params = build_substring_filter([(["skills"], ["R"])])
+    assert "LIKE" in where and params == ["%R%"]
+    rows = replica.top_courses_per_skill(["R"], "Data Scientist")
+    assert ("R", "Intro to R", "https://c/r", 4.7) in rows
+
+
+def test_search_jobs_filters_on_role_and_description(replica):
+    assert replica.search_jobs("Data Scientist", ["spark"]) == [
+        ("Data Scientist", "Acme", "Boston", "https://j/1")
+    ]
+    assert len(replica.search_jobs("data scientist")) == 2
+
+
+def test_missing_replica_returns_none(tmp_path, monkeypatch):
+    replica = CatalogReplica(db_path=str(tmp_path / "missing.db"))
+    monkeypatch.setattr(replica, "refresh", lambda force=False: None)
+    assert replica.top_courses_per_skill(["python"], "Data Scientist") is None
+
+
+def test_readers_keep_the_local_copy_while_a_refresh_downloads(tmp_path):
+    path = tmp_path / "catalog_replica.db"
+    path.write_text("v1")
+    synced = S3SyncedFile(str(path), "catalog/catalog_replica.db", refresh_seconds=3600)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_download(s3_key, local_path):
+        started.set()
+        release.wait(5)
+        with open(local_path, "w") as f:
+            f.write("v2")
+
+    with patch("utils.catalog_replica.get_s3_object_etag", return_value="etag2"), \
+            patch("utils.catalog_replica.download_file_from_s3", side_effect=slow_download):
+        refresher = threading.Thread(target=synced.refresh, kwargs={"force": True})
+        refresher.start()
+        assert started.wait(5)
+        synced.refresh()  # not due, so it returns at once instead of waiting for the download
+        assert path.read_text() == "v1"
+        release.set()
+        refresher.join(5)
+    assert path.read_text() == "v2"
+
+
+def test_due_refresh_downloads_in_the_background_when_a_copy_exists(tmp_path):
+    path = tmp_path / "catalog_replica.db"
+    path.write_text("v1")
+    synced = S3SyncedFile(str(path), "catalog/catalog_replica.db", refresh_seconds=3600)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_download(s3_key, local_path):
+        started.set()
+        release.wait(5)
+        with open(local_path, "w") as f:
+            f.write("v2")
+
+    with patch("utils.catalog_replica.get_s3_object_etag", return_value="etag2"), \
+            patch("utils.catalog_replica.download_file_from_s3", side_effect=slow_download):
+        synced.refresh()  # due, but returns before the download finishes
+        assert started.wait(5)
+        assert path.read_text() == "v1"
+        release.set()
+        synced.refresh(force=True)  # waits for the background sync; the ETag is unchanged
+    assert path.read_text() == "v2"
+
+
+def test_callers_without_a_copy_wait_for_the_first_download(tmp_path):
+    path = tmp_path / "catalog_replica.db"
+    synced = S3SyncedFile(str(path), "catalog/catalog_replica.db", refresh_seconds=3600)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_download(s3_key, local_path):
+        started.set()
+        release.wait(5)
+        with open(local_path, "w") as f:
+            f.write("v1")
+
+    with patch("utils.catalog_replica.get_s3_object_etag", return_value="etag1"), \
+            patch("utils.catalog_replica.download_file_from_s3", side_effect=slow_download):
+        first = threading.Thread(target=synced.refresh)
+        first.start()
+        assert started.wait(5)
+        seen = []
+        second = threading.Thread(target=lambda: synced.refresh() or seen.append(path.exists()))
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+        release.set()
+        first.join(5)
+        second.join(5)
+    assert seen == [True]
+
+
+@patch("agents.tools.tools.query_snowflake", return_value=[])
+def test_job_fallback_query_binds_role_and_skills(mock_query):
+    FetchMatchingJobsTool()._query_snowflake("Data Scientist' OR 1=1 --", ["Python", "O'Reilly"])
+    query, params = mock_query.call_args.args
+    assert "Data Scientist" not in query and "O'Reilly" not in query
+    assert params == ["%Data Scientist' OR 1=1 --%", "%Python%", "%O'Reilly%"]
+    assert query.count("%s") == 3
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from utils.embeddings import OnnxEmbedder, create_embedder, mean_pool
+
+
+def test_mean_pool_ignores_padding_and_normalizes():
+    tokens = np.array([[[3.0, 4.0], [100.0, 100.0]], [[1.0, 0.0], [3.0, 0.0]]])
+    mask = np.array([[1, 0], [1, 1]])
+    np.testing.assert_allclose(mean_pool(tokens, mask), [[0.6, 0.8], [1.0, 0.0]])
+
+
+class FakeTokenizer:
+    def __call__(self, texts, **kwargs):
+        width = max(len(t) for t in texts)
+        return {
+            "input_ids": np.array([[len(t)] * width for t in texts]),
+            "attention_mask": np.array([[1] * len(t) + [0] * (width - len(t)) for t in texts]),
+        }
+
+
+class FakeSession:
+    def run(self, outputs, inputs):
+        ids = inputs["input_ids"]
+        # Token embedding is (text length, 1) so each text maps to a distinct direction.
+        return [np.stack([ids, np.ones_like(ids)], axis=-1).astype(np.float32)]
+
+
+def test_onnx_encode_restores_input_order_across_length_sorted_batches():
+    embedder = OnnxEmbedder.__new__(OnnxEmbedder)
+    embedder.tokenizer, embedder.session, embedder.input_names = FakeTokenizer(), FakeSession(), ["input_ids"]
+    embedder.dimension = 2
+
+    texts = ["ccc", "a", "bb"]
+    vectors = embedder.encode(texts, batch_size=2)
+    expected = mean_pool(np.array([[[len(t), 1.0]] for t in texts]), np.ones((3, 1)))
+    np.testing.assert_allclose(vectors, expected, rtol=1e-6)
+    np.testing.assert_allclose(embedder.encode("bb"), expected[2], rtol=1e-6)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_embedder("tensorrt")
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import pytest
+from api.executor import BoundedExecutor, PoolSaturatedError
+
+
+def test_run_returns_result():
+    pool = BoundedExecutor(name="test", max_workers=2, max_queue=2)
+    result = asyncio.run(pool.run(lambda a, b=0: a + b, 1, b=2))
+    assert result == 3
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
+    pool.shutdown()
+
+
+def test_rejects_when_saturated():
+    pool = BoundedExecutor(name="test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(pool.run(release.wait))
+        second = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait)
+        stats = pool.stats()
+        assert stats["running"] == 1
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    assert pool.stats()["completed"] == 2
+    assert pool.stats()["max_queue_wait_seconds"] > 0
+    pool.shutdown()
+
+
+def test_cancelled_queued_call_releases_its_slot():
+    pool = BoundedExecutor(name="test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        first = asyncio.create_task(pool.run(release.wait))
+        queued = asyncio.create_task(pool.run(ran.append, "queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert pool.stats()["queued"] == 0
+        second = asyncio.create_task(pool.run(ran.append, "second"))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    assert ran == ["second"]
+    assert pool.stats()["completed"] == 2
+    pool.shutdown()
+
+
+def test_stream_holds_its_slot_until_the_iterator_ends():
+    pool = BoundedExecutor(name="test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    def tokens():
+        yield "first"
+        release.wait()
+        yield "second"
+
+    async def scenario():
+        stream = pool.stream(tokens)
+        assert await stream.__anext__() == "first"
+        with pytest.raises(PoolSaturatedError):
+            pool.stream(tokens)
+        assert pool.stats()["running"] == 1
+        release.set()
+        assert [token async for token in stream] == ["second"]
+
+    asyncio.run(scenario())
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["queued"] == 0
+    pool.shutdown()
+
+
+def test_abandoned_stream_closes_the_iterator_and_releases_its_slot():
+    pool = BoundedExecutor(name="test", max_workers=1, max_queue=0)
+    closed = threading.Event()
+
+    def tokens():
+        try:
+            while True:
+                yield "token"
+        finally:
+            closed.set()
+
+    async def scenario():
+        stream = pool.stream(tokens)
+        assert await stream.__anext__() == "token"
+        await stream.aclose()
+        await asyncio.to_thread(closed.wait, 5)
+        await asyncio.sleep(0.05)
+        assert pool.stats()["running"] == 0
+        assert [token async for token in pool.stream(iter, ["again"])] == ["again"]
+
+    asyncio.run(scenario())
+    assert closed.is_set()
+    pool.shutdown()
+
+
+def test_stream_relays_iterator_errors():
+    pool = BoundedExecutor(name="test", max_workers=1, max_queue=1)
+
+    def tokens():
+        yield "partial"
+        raise RuntimeError("provider dropped the stream")
+
+    async def scenario():
+        stream = pool.stream(tokens)
+        assert await stream.__anext__() == "partial"
+        with pytest.raises(RuntimeError):
+            await stream.__anext__()
+
+    asyncio.run(scenario())
+    pool.shutdown()
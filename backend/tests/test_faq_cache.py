@@ -0,0 +1,35 @@
+import numpy as np
+from utils.faq_cache import SemanticAnswerCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_similar_questions_share_answers_within_role_and_company():
+    cache = SemanticAnswerCache(similarity_threshold=0.9)
+    cache.store("Data Engineer", "Amazon", unit(1, 0, 0), {"faq_response": "4 rounds"}, compute_seconds=12.0)
+
+    answer, similarity = cache.lookup(" data engineer", "AMAZON", unit(1, 0.1, 0))
+    assert answer == {"faq_response": "4 rounds"}
+    assert similarity > 0.99
+    assert cache.lookup("Data Engineer", "Amazon", unit(0, 1, 0)) is None
+    assert cache.lookup("Data Engineer", "Google", unit(1, 0, 0)) is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2, "hit_ratio": 0.333, "seconds_saved": 12.0}
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    now = [0.0]
+    cache = SemanticAnswerCache(similarity_threshold=0.9, ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+    cache.store("SWE", "Meta", unit(1, 0), "a", 1.0)
+    cache.store("SWE", "Meta", unit(0, 1), "b", 1.0)
+    assert cache.lookup("SWE", "Meta", unit(1, 0))[0] == "a"
+
+    cache.store("SWE", "Meta", unit(1, 1), "c", 1.0)
+    assert cache.lookup("SWE", "Meta", unit(0, 1)) is None
+    assert cache.lookup("SWE", "Meta", unit(1, 0))[0] == "a"
+
+    now[0] = 61.0
+    assert cache.lookup("SWE", "Meta", unit(1, 0)) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+from agents.faq_rag import answer_faq_directly, estimate_tokens, pack_chunks
+from agents.crew_config import run_faq_pipeline, stream_faq_pipeline
+from utils.faq_cache import SemanticAnswerCache
+
+
+def match(text, title="Post"):
+    return {"metadata": {"text": text, "title": title, "subreddit": "cscareerquestions", "permalink": f"https://reddit.com/{title}"}}
+
+
+def test_pack_chunks_respects_budget_and_skips_duplicates():
+    long_text, short_text = "x" * 400, "Four rounds: OA, two technical, one behavioural."
+    matches = [match(short_text, "a"), match(short_text, "dup"), match(long_text, "b"), match("Bar raiser is last.", "c")]
+
+    context, sources = pack_chunks(matches, token_budget=60)
+    assert [s["title"] for s in sources] == ["a", "c"]
+    assert context.startswith("[1] a (r/cscareerquestions)") and "[2] c" in context
+    assert estimate_tokens(context) <= 60
+
+    context, sources = pack_chunks([match(long_text, "b")], token_budget=20)
+    assert [s["title"] for s in sources] == ["b"] and len(context) == 80
+
+
+@patch("agents.faq_rag.chat_completion", return_value=" Expect four rounds. ")
+@patch("agents.faq_rag.retrieve_chunks")
+def test_direct_answer_makes_one_generation_call(mock_retrieve, mock_chat):
+    mock_retrieve.return_value = {"status": "success", "matches": [match("Four rounds at Amazon.", "a")]}
+    response = answer_faq_directly("How many rounds?", "Data Engineer", "Amazon")
+
+    assert response["raw"] == response["tasks_output"][0]["raw"] == "Expect four rounds."
+    assert response["sources"] == [{"title": "a", "permalink": "https://reddit.com/a"}]
+    assert mock_retrieve.call_args.kwargs["company"] == "Amazon"
+    assert mock_chat.call_count == 1
+    assert "Four rounds at Amazon." in mock_chat.call_args.kwargs["messages"][1]["content"]
+
+    mock_retrieve.return_value = {"status": "error", "message": "No relevant chunks found.", "matches": []}
+    assert answer_faq_directly("Salary?")["raw"] == "No relevant chunks found."
+    assert mock_chat.call_count == 1
+
+
+@patch("agents.crew_config.answer_faq_directly")
+def test_faq_pipeline_direct_mode(mock_direct):
+    mock_direct.return_value = {"raw": "ok", "tasks_output": [{"raw": "ok"}], "sources": []}
+    result = run_faq_pipeline("How many rounds?", "SWE", "Meta", pipeline_mode="direct", use_cache=False)
+    assert result["faq_response"]["tasks_output"][0]["raw"] == "ok"
+    assert result["company"] == "Meta"
+
+
+@patch("agents.crew_config.stream_faq_completion", return_value=iter(["Expect", " four rounds."]))
+@patch("agents.crew_config.retrieve_faq_context", return_value=("[1] a", [{"title": "a", "permalink": "https://reddit.com/a"}], ""))
+@patch("agents.crew_config.embed_query", return_value=[1.0, 0.0])
+def test_streamed_answers_share_the_semantic_cache(mock_embed, mock_retrieve, mock_stream):
+    cache = SemanticAnswerCache()
+    with patch("agents.crew_config.faq_answer_cache", cache):
+        tokens = stream_faq_pipeline("How many rounds?", "Data Engineer", "Amazon")
+        assert mock_retrieve.call_count == 1
+        assert cache.stats()["entries"] == 0
+        assert list(tokens) == ["Expect", " four rounds."]
+        assert cache.stats()["entries"] == 1
+
+        assert list(stream_faq_pipeline("How many rounds?", "Data Engineer", "Amazon")) == ["Expect four rounds."]
+        cached = run_faq_pipeline("How many rounds?", "Data Engineer", "Amazon")
+        assert cached["faq_response"]["sources"] == [{"title": "a", "permalink": "https://reddit.com/a"}]
+    assert mock_retrieve.call_count == 1
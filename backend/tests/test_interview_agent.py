@@ -1,4 +1,4 @@
-from agents.crew_config import orchestrator_agent
+from agents.crew_config import orchestrator_agent, run_interview_orchestration_pipeline
 from unittest.mock import patch
 
 def test_orchestrator_agent_question_generation():
@@ -13,4 +13,18 @@ def test_orchestrator_agent_interview_evaluation():
         mock_run.return_value = "Candidate demonstrated a strong grasp of backend systems."
         response = orchestrator_agent.run("evaluate")
         assert isinstance(response, str)
-        assert "candidate" in response.lower()
\ No newline at end of file
+        assert "candidate" in response.lower()
+
+def test_direct_orchestration_skips_agent():
+    with patch("agents.tools.tools.QuestionGenerationTool._run") as mock_run:
+        mock_run.return_value = "How do you design idempotent pipelines?"
+        response = run_interview_orchestration_pipeline(
+            action="next_question",
+            role="Data Engineer",
+            mode="Behavioral",
+            previous_question="Tell me about yourself",
+            user_answer="I build pipelines",
+            orchestration_mode="direct"
+        )
+        assert response == "How do you design idempotent pipelines?"
+        mock_run.assert_called_once()
@@ -0,0 +1,64 @@
+from api.jobs import JobStore, JOB_STAGES
+
+
+def make_store(tmp_path):
+    return JobStore(db_path=str(tmp_path / "jobs.db"), upload_dir=str(tmp_path / "uploads"))
+
+
+def test_submit_and_claim_job(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.submit(b"%PDF", "resume.pdf", "Data Engineer JD", "Boston")
+
+    job = store.get(job_id)
+    assert job["status"] == "queued"
+    assert job["progress"] == 0
+
+    claimed = store.claim_next()
+    assert claimed["id"] == job_id
+    assert store.get(job_id)["status"] == "running"
+    assert store.claim_next() is None
+
+
+def test_stage_progress_and_result(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.submit(b"%PDF", "resume.pdf", "JD", "Remote")
+    store.claim_next()
+
+    store.update_stage(job_id, "running_crew")
+    job = store.get(job_id)
+    assert job["stage"] == "running_crew"
+    assert job["progress"] == JOB_STAGES["running_crew"]
+
+    store.complete(job_id, {"summary": "ok"})
+    job = store.get(job_id)
+    assert job["status"] == "completed"
+    assert job["result"] == {"summary": "ok"}
+    assert not (tmp_path / "uploads" / f"{job_id}.pdf").exists()
+
+
+def test_failed_and_stale_jobs(tmp_path):
+    store = make_store(tmp_path)
+    failed_id = store.submit(b"%PDF", "a.pdf", "JD", "NYC")
+    stale_id = store.submit(b"%PDF", "b.pdf", "JD", "NYC")
+    store.claim_next()
+    store.fail(failed_id, "boom")
+    assert store.get(failed_id)["error"] == "boom"
+
+    store.claim_next()
+    assert store.requeue_stale(older_than=-1) == 1
+    assert store.get(stale_id)["status"] == "queued"
+
+
+def test_stale_job_fails_after_max_attempts(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.submit(b"%PDF", "crash.pdf", "JD", "NYC")
+
+    for attempt in range(1, 3):
+        assert store.claim_next()["id"] == job_id
+        assert store.get(job_id)["attempts"] == attempt
+        assert store.requeue_stale(older_than=-1, max_attempts=2) == (1 if attempt < 2 else 0)
+
+    job = store.get(job_id)
+    assert job["status"] == "failed"
+    assert "2 attempts" in job["error"]
+    assert not (tmp_path / "uploads" / f"{job_id}.pdf").exists()
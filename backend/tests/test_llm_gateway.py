@@ -0,0 +1,117 @@
+import httpx
+import openai
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from utils import llm_gateway
+from utils.llm_gateway import chat_completion, resolve_model, stream_chat_completion
+from utils.llm_cache import LLMResponseCache, make_cache_key
+
+
+def fake_response(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+    )
+
+
+def test_resolve_model():
+    assert resolve_model("grok") == ("xai", "grok-2-1212")
+    assert resolve_model("xai/grok-2-1212") == ("xai", "grok-2-1212")
+    assert resolve_model("gpt-3.5-turbo") == ("openai", "gpt-3.5-turbo")
+    assert resolve_model("claude") == ("anthropic", "claude-3-5-sonnet-20241022")
+
+
+@patch("utils.llm_gateway.time.sleep")
+@patch("utils.llm_gateway._create")
+def test_retries_transient_errors(mock_create, mock_sleep):
+    request = httpx.Request("POST", "https://api.x.ai/v1/chat/completions")
+    mock_create.side_effect = [openai.APIConnectionError(request=request), fake_response("What is Kafka?")]
+
+    result = chat_completion("grok", [{"role": "user", "content": "hi"}], temperature=0.5, max_tokens=200)
+
+    assert result == "What is Kafka?"
+    assert mock_create.call_count == 2
+    mock_sleep.assert_called_once()
+    assert mock_create.call_args.args[2] == {
+        "messages": [{"role": "user", "content": "hi"}], "temperature": 0.5, "max_tokens": 200
+    }
+
+
+@patch("utils.llm_gateway.time.sleep")
+@patch("utils.llm_gateway._create")
+def test_gives_up_after_max_retries(mock_create, mock_sleep, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_RETRIES", 1)
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    mock_create.side_effect = openai.APITimeoutError(request=request)
+
+    with pytest.raises(openai.APITimeoutError):
+        chat_completion("gpt-3.5-turbo", [{"role": "user", "content": "hi"}])
+    assert mock_create.call_count == 2
+
+
+@patch("utils.llm_gateway._create")
+def test_stream_releases_slot_while_backing_off(mock_create, monkeypatch):
+    request = httpx.Request("POST", "https://api.x.ai/v1/chat/completions")
+    semaphore = llm_gateway.get_semaphore("xai")
+    held_during_sleep = []
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda seconds: held_during_sleep.append(semaphore._value))
+
+    def chunk(text):
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+    mock_create.side_effect = [openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None), iter([chunk("Hi"), chunk(" there")])]
+
+    free_slots = semaphore._value
+    assert list(stream_chat_completion("grok", [{"role": "user", "content": "hi"}])) == ["Hi", " there"]
+    assert held_during_sleep == [free_slots]
+    assert semaphore._value == free_slots
+
+
+@patch("utils.llm_gateway._create")
+def test_non_retryable_errors_fail_fast(mock_create):
+    mock_create.side_effect = ValueError("bad request")
+    with pytest.raises(ValueError):
+        chat_completion("gpt-4", [{"role": "user", "content": "hi"}])
+    assert mock_create.call_count == 1
+
+
+def test_response_cache_hit_miss_and_ttl(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), ttl_seconds=3600, max_entries=10)
+    key = make_cache_key("openai/gpt-3.5-turbo", [{"role": "user", "content": "JD:\n  Python, SQL"}])
+    same_key = make_cache_key("openai/gpt-3.5-turbo", [{"role": "user", "content": "JD: Python, SQL\n"}])
+    assert key == same_key
+    assert key != make_cache_key("openai/gpt-3.5-turbo", [{"role": "user", "content": "JD: Python, SQL"}], temperature=0.2)
+
+    assert cache.get(key) is None
+    cache.set(key, "openai/gpt-3.5-turbo", "Python, SQL")
+    assert cache.get(key) == "Python, SQL"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    cache.ttl_seconds = -1
+    assert cache.get(key) is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), ttl_seconds=3600, max_entries=2)
+    cache.set("a", "m", "1")
+    cache.set("b", "m", "2")
+    cache.get("a")
+    cache.set("c", "m", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["size"] == 2
+
+
+@patch("utils.llm_gateway._create")
+def test_cached_chat_completion_skips_provider(mock_create, tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.llm_gateway.get_llm_cache", lambda: LLMResponseCache(db_path=str(tmp_path / "cache.db")))
+    mock_create.return_value = fake_response("Python, SQL")
+    messages = [{"role": "user", "content": "Extract skills"}]
+
+    assert chat_completion("gpt-3.5-turbo", messages, cache=True) == "Python, SQL"
+    assert chat_completion("gpt-3.5-turbo", messages, cache=True) == "Python, SQL"
+    assert mock_create.call_count == 1
+
+    chat_completion("gpt-3.5-turbo", messages, cache=False)
+    assert mock_create.call_count == 2
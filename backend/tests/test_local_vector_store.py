@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from utils.local_vector_store import LocalVectorStore, read_vector_store, write_vector_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "faq_vectors.bin")
+    vectors = [[1, 0, 0], [0.8, 0.6, 0], [0, 1, 0], [0, 0, 2]]
+    metadatas = [
+        {"text": "amazon swe", "role": "Software Engineer", "company": "Amazon"},
+        {"text": "google swe", "role": "Software Engineer", "company": "Google"},
+        {"text": "amazon ds", "role": "Data Scientist", "company": "Amazon"},
+        {"text": "meta ds", "role": "Data Scientist", "company": "Meta"},
+    ]
+    write_vector_store(path, ["a", "b", "c", "d"], vectors, metadatas, dimension=3)
+    return LocalVectorStore(path, s3_key=None)
+
+
+def test_file_is_memory_mapped_and_normalized(store):
+    data = read_vector_store(store.path)
+    assert isinstance(data["vectors"], np.memmap)
+    np.testing.assert_allclose(data["vectors"][3], [0, 0, 1])
+
+
+def test_query_ranks_by_cosine_and_applies_filters(store):
+    matches = store.query([1, 0, 0], top_k=2)
+    assert [m["id"] for m in matches] == ["a", "b"]
+    assert matches[1]["score"] == pytest.approx(0.8)
+    assert matches[0]["metadata"]["text"] == "amazon swe"
+
+    matches = store.query([1, 0, 0], top_k=5, filter={"company": {"$eq": "Amazon"}})
+    assert [m["id"] for m in matches] == ["a", "c"]
+    matches = store.query([1, 0, 0], filter={"role": {"$eq": "Data Scientist"}, "company": "Meta"})
+    assert [m["id"] for m in matches] == ["d"]
+    assert store.query([1, 0, 0], filter={"company": {"$eq": "Netflix"}}) == []
+
+    with pytest.raises(ValueError):
+        store.query([1, 0, 0], filter={"company": {"$in": ["Amazon"]}})
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert LocalVectorStore(str(tmp_path / "missing.bin"), s3_key=None).query([1, 0, 0]) is None
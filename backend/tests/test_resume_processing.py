@@ -0,0 +1,30 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from agents.crew_config import run_recommendation_pipeline
+from data_processing.resume_processing import parse_resume
+
+
+@patch("data_processing.resume_processing.extract_text_from_pdf", return_value="Jane Doe")
+@patch("data_processing.resume_processing.convert_text_to_markdown", side_effect=RuntimeError("markitdown failed"))
+def test_parse_resume_removes_its_directory_when_conversion_fails(mock_convert, mock_extract):
+    with pytest.raises(RuntimeError):
+        parse_resume(b"%PDF", "jane.pdf")
+    md_path = mock_convert.call_args.args[2]
+    assert not md_path.parent.exists()
+
+
+@patch("agents.crew_config.upload_resume_markdown", return_value="s3://bucket/jane.md")
+@patch("agents.crew_config.compare_skills", side_effect=RuntimeError("matching failed"))
+@patch("agents.crew_config.extract_resume_skills", return_value=["Python"])
+def test_recommendation_pipeline_removes_markdown_when_a_stage_fails(mock_skills, mock_compare, mock_upload):
+    md_dir = Path(tempfile.mkdtemp(prefix="resume_"))
+    md_path = md_dir / "JANE_resume.md"
+    md_path.write_text("# Jane Doe")
+    parsed = {"candidate_name": "Jane Doe", "markdown_text": "# Jane Doe", "md_path": str(md_path), "pdf_filename": "JANE"}
+
+    result = run_recommendation_pipeline(b"%PDF", "jane.pdf", "JD", "Boston", jd_skills=["Python"], parsed_resume=parsed)
+
+    assert result == {"status": "error", "message": "matching failed"}
+    assert not md_dir.exists()
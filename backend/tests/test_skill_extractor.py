@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+import data_processing.skill_extractor as skill_extractor
+from data_processing.skill_extractor import AhoCorasick, SkillExtractor, build_lexicon, extract_skills
+
+
+def test_automaton_finds_overlapping_patterns():
+    matches = sorted(AhoCorasick(["he", "she", "his", "hers"]).iter_matches("ushers"))
+    assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_extractor_maps_aliases_and_respects_word_boundaries():
+    extractor = SkillExtractor(build_lexicon(["Python Programming", "Cloud Computing"]))
+    text = (
+        "Built PySpark jobs on Amazon Web Services and Google Cloud Platform in Go. "
+        "Wrote Google Docs, C++ services and python programming tutorials; deployed on k8s."
+    )
+    assert extractor.extract(text) == [
+        "Apache Spark", "AWS", "GCP", "Go", "C++", "Python Programming", "Kubernetes"
+    ]
+
+
+def test_short_terms_are_case_sensitive():
+    extractor = SkillExtractor(build_lexicon())
+    assert extractor.extract("Statistics in R, ML pipelines") == ["Statistics", "R", "Machine Learning"]
+    assert extractor.extract("r and ml are lowercase here") == []
+
+
+def test_aliases_that_are_english_words_need_exact_casing():
+    extractor = SkillExtractor(build_lexicon())
+    prose = (
+        "You will excel in a fast-paced team and rest assured we go the extra mile "
+        "to react quickly and spark new ideas."
+    )
+    assert extractor.extract(prose) == []
+    assert extractor.extract("work with the rest of the team") == []
+    assert extractor.extract("Built REST services in Go and React, with Spark jobs and Excel reports") == [
+        "REST APIs", "Go", "React", "Apache Spark", "Excel"
+    ]
+
+
+def test_hybrid_mode_only_calls_llm_on_low_coverage(monkeypatch):
+    monkeypatch.setattr(skill_extractor, "get_skill_extractor", lambda: SkillExtractor(build_lexicon()))
+    llm = MagicMock(return_value=["python", "Looker"])
+
+    rich_text = "Python, SQL, Docker, Kubernetes, Terraform and AWS"
+    assert extract_skills(rich_text, llm, mode="hybrid") == ["Python", "SQL", "Docker", "Kubernetes", "Terraform", "AWS"]
+    llm.assert_not_called()
+
+    assert extract_skills("Python dashboards", llm, mode="hybrid") == ["Python", "Looker"]
+    assert extract_skills("Python dashboards", llm, mode="local") == ["Python"]
@@ -0,0 +1,43 @@
+import numpy as np
+import data_processing.skill_matcher as skill_matcher
+from data_processing.skill_matcher import canonicalize_skill, compare_skills
+
+
+def test_canonicalization_strips_case_punctuation_and_versions():
+    assert canonicalize_skill("Python 3") == canonicalize_skill("python") == "python"
+    assert canonicalize_skill("Amazon Web Services") == canonicalize_skill("AWS")
+    assert canonicalize_skill("Java 8") == "java"
+    # Digits that are part of the name are kept.
+    assert canonicalize_skill("S3") == "s3"
+    assert canonicalize_skill("EC2") == "ec2"
+
+
+def test_compare_skills_uses_aliases_before_embeddings():
+    result = compare_skills(["python", "Amazon Web Services", "Docker"], ["Python 3", "AWS", "Kubernetes"], use_embeddings=False)
+    assert result["matched_skills"] == ["Python 3", "AWS"]
+    assert result["missing_skills"] == ["Kubernetes"]
+    assert result["match_score"] == 0.67
+    assert result["skill_matches"]["AWS"] == {"resume_skill": "Amazon Web Services", "score": 1.0, "method": "canonical"}
+    assert "Missing: Kubernetes." in result["prompt_context"]
+
+
+def test_compare_skills_falls_back_to_embedding_similarity(monkeypatch):
+    vectors = {
+        "Tableau": [1.0, 0.0],
+        "Docker": [0.0, 1.0],
+        "Data Visualization": [0.9, 0.1],
+        "Kubernetes": [0.1, 0.9],
+        "Rust": [-1.0, 0.0],
+    }
+
+    def fake_embed(skills):
+        v = np.array([vectors[s] for s in skills])
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+    monkeypatch.setattr(skill_matcher, "embed_skills", fake_embed)
+    result = compare_skills(["Tableau", "Docker"], ["Data Visualization", "Kubernetes", "Rust"])
+    assert result["matched_skills"] == ["Data Visualization", "Kubernetes"]
+    assert result["missing_skills"] == ["Rust"]
+    assert result["skill_matches"]["Data Visualization"]["resume_skill"] == "Tableau"
+    assert result["skill_matches"]["Data Visualization"]["method"] == "embedding"
+    assert 0.8 <= result["skill_matches"]["Kubernetes"]["score"] < 1.0
@@ -0,0 +1,78 @@
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+from utils.snowflake_pool import SnowflakeConnectionPool
+
+
+def make_pool(**kwargs):
+    connections = []
+
+    def connect():
+        conn = MagicMock()
+        conn.is_closed.return_value = False
+        connections.append(conn)
+        return conn
+
+    return SnowflakeConnectionPool(connect_fn=connect, **kwargs), connections
+
+
+def test_connections_are_reused():
+    pool, connections = make_pool(max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert len(connections) == 1
+    assert pool.stats() == {"max_size": 2, "open": 1, "idle": 1}
+
+
+def test_checkout_waits_for_a_returned_connection_and_times_out():
+    pool, connections = make_pool(max_size=1, checkout_timeout=0.1)
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+
+    pool.checkout_timeout = 2
+    release = threading.Event()
+
+    def hold():
+        with pool.connection():
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.05)
+    threading.Timer(0.1, release.set).start()
+    with pool.connection() as conn:
+        assert conn is connections[0]
+    holder.join()
+
+
+def test_idle_and_unhealthy_connections_are_replaced():
+    pool, connections = make_pool(idle_timeout=0)
+    with pool.connection():
+        pass
+    time.sleep(0.01)
+    with pool.connection():
+        pass
+    assert len(connections) == 2
+    connections[0].close.assert_called_once()
+
+    pool, connections = make_pool(health_check_after=0)
+    with pool.connection():
+        pass
+    connections[0].cursor.return_value.execute.side_effect = Exception("session expired")
+    with pool.connection() as conn:
+        assert conn is connections[1]
+
+
+def test_connection_discarded_after_unexpected_error():
+    pool, connections = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("network reset")
+    connections[0].close.assert_called_once()
+    assert pool.stats()["open"] == 0
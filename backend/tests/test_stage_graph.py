@@ -0,0 +1,47 @@
+import time
+import pytest
+from utils.stage_graph import Stage, run_stage_graph
+
+
+def test_independent_stages_overlap_and_results_flow_to_dependents():
+    started = []
+
+    def slow(value):
+        time.sleep(0.2)
+        return value
+
+    stages = [
+        Stage("resume", lambda: slow(["python"])),
+        Stage("jd", lambda: slow(["python", "sql"])),
+        Stage("match", lambda resume, jd: sorted(set(jd) - set(resume)), ["resume", "jd"]),
+    ]
+    start = time.perf_counter()
+    results, timings = run_stage_graph(stages, max_workers=2, on_stage_start=started.append)
+    elapsed = time.perf_counter() - start
+
+    assert results["match"] == ["sql"]
+    assert elapsed < 0.35
+    assert set(timings) == {"resume", "jd", "match"}
+    assert started[-1] == "match"
+
+
+def test_stage_error_propagates_and_skips_dependents():
+    calls = []
+
+    def boom():
+        raise RuntimeError("JD extraction failed")
+
+    stages = [
+        Stage("jd", boom),
+        Stage("match", lambda jd: calls.append(jd), ["jd"]),
+    ]
+    with pytest.raises(RuntimeError, match="JD extraction failed"):
+        run_stage_graph(stages)
+    assert calls == []
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        run_stage_graph([Stage("match", lambda jd: jd, ["jd"])])
+    with pytest.raises(ValueError):
+        run_stage_graph([Stage("a", lambda b: b, ["b"]), Stage("b", lambda a: a, ["a"])])
@@ -0,0 +1,36 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from utils.tool_memo import current_tool_memo, memoized, shared_tool_results
+
+
+def test_memoized_only_shares_inside_block():
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert memoized("key", compute) == 1
+    assert memoized("key", compute) == 2
+
+    with shared_tool_results() as memo:
+        assert memoized("key", compute) == 3
+        assert memoized("key", compute) == 3
+        assert memo.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert current_tool_memo.get() is None
+
+
+def test_concurrent_callers_compute_once():
+    calls = []
+    lock = threading.Lock()
+
+    def compute():
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return "courses"
+
+    with shared_tool_results():
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, memoized, "python", compute) for _ in range(4)]
+            assert [f.result() for f in futures] == ["courses"] * 4
+    assert len(calls) == 1
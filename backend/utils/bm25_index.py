@@ -0,0 +1,142 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+import numpy as np
+from dotenv import load_dotenv
+from utils.catalog_replica import S3SyncedFile
+from utils.local_vector_store import filter_rows, metadata_fields
+
+load_dotenv()
+
+BM25_INDEX_PATH = os.getenv("BM25_INDEX_PATH", "faq_bm25.json")
+# Published by the reddit_to_pinecone_dag next to the vector store snapshot; empty disables syncing.
+BM25_INDEX_S3_KEY = os.getenv("BM25_INDEX_S3_KEY", "rag/faq_bm25.json")
+BM25_INDEX_REFRESH_SECONDS = float(os.getenv("BM25_INDEX_REFRESH_SECONDS", "3600"))
+# Keyword matches scoring below this are dropped; 0 keeps any chunk sharing a non-stopword term.
+BM25_MIN_SCORE = float(os.getenv("BM25_MIN_SCORE", "0"))
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keeps "c++", "c#" and "l5" as single tokens.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+# Function words dropped at build and query time, so a chunk never matches on "the" or "for" alone.
+STOPWORDS = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any", "are",
+    "as", "at", "be", "because", "been", "before", "being", "below", "between", "both", "but",
+    "by", "can", "could", "did", "do", "does", "doing", "down", "during", "each", "few", "for",
+    "from", "further", "had", "has", "have", "having", "he", "her", "here", "hers", "him",
+    "his", "how", "i", "if", "in", "into", "is", "it", "its", "itself", "just", "me", "more",
+    "most", "my", "no", "nor", "not", "of", "off", "on", "once", "only", "or", "other", "our",
+    "ours", "out", "over", "own", "same", "she", "should", "so", "some", "such", "than",
+    "that", "the", "their", "theirs", "them", "then", "there", "these", "they", "this",
+    "those", "through", "to", "too", "under", "until", "up", "very", "was", "we", "were",
+    "what", "when", "where", "which", "while", "who", "whom", "why", "will", "with", "would",
+    "you", "your", "yours",
+})
+
+
+def tokenize(text: str) -> list:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def build_bm25_index(ids: list, texts: list, metadatas: list) -> dict:
+    """
+    Inverted index over the chunk texts, in the JSON form the Airflow DAG publishes.
+
+    Returns:
+        dict: ids, metadata, doc_lengths and postings ({term: [[row, term frequency], ...]}).
+    """
+    postings, doc_lengths = {}, []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text or "")
+        doc_lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            postings.setdefault(term, []).append([row, tf])
+    return {"ids": list(ids), "metadata": list(metadatas), "doc_lengths": doc_lengths, "postings": postings}
+
+
+class BM25Index:
+    """Okapi BM25 search over an index built by build_bm25_index."""
+
+    def __init__(self, payload: dict, k1: float = BM25_K1, b: float = BM25_B, min_score: float = BM25_MIN_SCORE):
+        self.ids = payload["ids"]
+        self.metadata = payload["metadata"]
+        self.fields = metadata_fields(self.metadata)
+        self.doc_lengths = np.asarray(payload["doc_lengths"], dtype=np.float32)
+        self.postings = {
+            term: (np.array([p[0] for p in entries]), np.array([p[1] for p in entries], dtype=np.float32))
+            for term, entries in payload["postings"].items()
+        }
+        self.k1 = k1
+        self.b = b
+        self.min_score = min_score
+        self.average_length = float(self.doc_lengths.mean()) if len(self.ids) else 0.0
+
+    def search(self, query: str, top_k: int = 5, filter: dict = None) -> list:
+        """Matches in Pinecone's shape ({"id", "score", "metadata"}), best first, for chunks sharing a non-stopword query term."""
+        count = len(self.ids)
+        scores = np.zeros(count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            rows, tf = self.postings[term]
+            idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            length_norm = 1 - self.b + self.b * self.doc_lengths[rows] / self.average_length
+            scores[rows] += idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+
+        rows = filter_rows(self.fields, count, filter)
+        rows = rows[(scores[rows] > 0) & (scores[rows] >= self.min_score)]
+        best = rows[np.argsort(-scores[rows], kind="stable")[:top_k]]
+        return [{"id": self.ids[i], "score": float(scores[i]), "metadata": self.metadata[i]} for i in best]
+
+
+class LocalBM25Index:
+    """BM25 index kept in sync with the copy published to S3; searches return None while none is available."""
+
+    def __init__(self, path: str = BM25_INDEX_PATH, s3_key: str = BM25_INDEX_S3_KEY, refresh_seconds: float = BM25_INDEX_REFRESH_SECONDS):
+        self.path = path
+        self._file = S3SyncedFile(path, s3_key, refresh_seconds) if s3_key else None
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._index = None
+
+    def load(self) -> BM25Index | None:
+        if self._file:
+            self._file.refresh()
+        if not os.path.exists(self.path):
+            return None
+        mtime = os.path.getmtime(self.path)
+        with self._lock:
+            if mtime != self._loaded_mtime:
+                with open(self.path, encoding="utf-8") as f:
+                    self._index = BM25Index(json.load(f))
+                self._loaded_mtime = mtime
+            return self._index
+
+    def search(self, query: str, top_k: int = 5, filter: dict = None) -> list | None:
+        index = self.load()
+        return index.search(query, top_k, filter) if index else None
+
+
+def reciprocal_rank_fusion(result_lists: list, k: int = 60) -> list:
+    """
+    Merge ranked match lists by reciprocal rank fusion.
+
+    Each match scores sum(1 / (k + rank)) over the lists it appears in, so agreement between
+    lists counts more than a high raw score in one; raw scores are not comparable across lists.
+
+    Returns:
+        list: Matches ({"id", "score", "metadata"}) ordered by fused score.
+    """
+    fused = {}
+    for matches in result_lists:
+        for rank, match in enumerate(matches, start=1):
+            entry = fused.setdefault(match["id"], {"id": match["id"], "score": 0.0, "metadata": match["metadata"]})
+            entry["score"] += 1 / (k + rank)
+    return sorted(fused.values(), key=lambda m: m["score"], reverse=True)
+
+
+local_bm25_index = LocalBM25Index()
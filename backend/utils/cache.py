@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with an optional on-disk tier.
+
+    When `disk_dir` is set, every write is also persisted as a small JSON file
+    so entries survive restarts; a memory miss falls back to disk and promotes
+    the entry back into memory. The disk tier keeps at most `disk_max_entries`
+    files: once a write goes over, the least recently written ones are dropped
+    until only `DISK_PRUNE_RATIO` of the limit is left. The count of files is
+    tracked as they are written, so the directory is listed once per batch of
+    pruned entries rather than on every write.
+    """
+
+    DISK_PRUNE_RATIO = 0.9
+
+    def __init__(self, maxsize: int = 128, disk_dir: str = None, disk_max_entries: int = 10000):
+        self.maxsize = maxsize
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = disk_max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._disk_entries = 0
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_entries = len(self._list_disk())
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _remember(self, key: str, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._remember(key, value)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def _read_disk(self, key: str):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against (astronomically unlikely) hash collisions.
+        return entry.get("value") if entry.get("key") == key else None
+
+    def _write_disk(self, key: str, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = None
+        try:
+            # A temp file of its own per write, so concurrent writers never share one.
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.disk_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                json.dump({"key": key, "value": value}, f)
+            is_new = not path.exists()
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not persist cache entry to {path}: {e}")
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            if is_new:
+                self._disk_entries += 1
+            over_limit = self._disk_entries > self.disk_max_entries
+        if over_limit:
+            self._prune_disk()
+
+    def _list_disk(self) -> list:
+        return list(self.disk_dir.glob("*.json"))
+
+    def _prune_disk(self):
+        if not self._prune_lock.acquire(blocking=False):
+            return  # Another writer is already pruning.
+        try:
+            files = []
+            for path in self._list_disk():
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except OSError:
+                    pass  # Pruned by another process meanwhile.
+            keep = int(self.disk_max_entries * self.DISK_PRUNE_RATIO)
+            files.sort()
+            for _, path in files[:max(len(files) - keep, 0)]:
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_entries = min(len(files), keep)
+        finally:
+            self._prune_lock.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
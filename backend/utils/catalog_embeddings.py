@@ -0,0 +1,149 @@
+import os
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from utils.catalog_replica import CATALOG_REPLICA_REFRESH_SECONDS, S3SyncedFile, catalog_replica
+from utils.embeddings import get_embedder
+from utils.metrics import timed_stage
+
+load_dotenv()
+
+CATALOG_SEMANTIC_SEARCH = os.getenv("CATALOG_SEMANTIC_SEARCH", "true").lower() == "true"
+CATALOG_EMBEDDINGS_PATH = os.getenv("CATALOG_EMBEDDINGS_PATH", "catalog_embeddings.npz")
+# Published next to the replica by the refresh_catalog_replica Airflow task.
+CATALOG_EMBEDDINGS_S3_KEY = os.getenv("CATALOG_EMBEDDINGS_S3_KEY", "catalog/catalog_embeddings.npz")
+CATALOG_SEMANTIC_MIN_SCORE = float(os.getenv("CATALOG_SEMANTIC_MIN_SCORE", "0.35"))
+# Nearest neighbours considered per query before the job-role filter is applied.
+CATALOG_SEMANTIC_CANDIDATES = int(os.getenv("CATALOG_SEMANTIC_CANDIDATES", "50"))
+
+
+def embed_queries(texts: list) -> np.ndarray:
+    # The catalog was embedded with the same MiniLM model.
+    with timed_stage("query_embedding"):
+        return get_embedder().encode(texts)
+
+
+def top_k_cosine(matrix: np.ndarray, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows of `matrix` for every query by cosine similarity, best first.
+
+    Both inputs must be unit-normalised, so the dot product is the cosine.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (indices, scores), each shaped (n_queries, k).
+    """
+    k = min(k, matrix.shape[0])
+    if k == 0:
+        empty = np.empty((queries.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    scores = queries @ matrix.T
+    # argpartition finds the k best in linear time; only those k are then sorted.
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class CatalogEmbeddingIndex:
+    """
+    Embedding index over the course and job catalogs.
+
+    The file stores unit-normalised float16 vectors plus the replica rowid of each row.
+    Vectors are widened to float32 once on load, since NumPy has no BLAS path for
+    float16 matrix products.
+    """
+
+    def __init__(self, path: str = CATALOG_EMBEDDINGS_PATH, s3_key: str = CATALOG_EMBEDDINGS_S3_KEY, refresh_seconds: float = CATALOG_REPLICA_REFRESH_SECONDS):
+        self._file = S3SyncedFile(path, s3_key, refresh_seconds)
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._data = None
+
+    def load(self) -> dict | None:
+        self._file.refresh()
+        if not self._file.exists():
+            return None
+        mtime = os.path.getmtime(self._file.local_path)
+        with self._lock:
+            if mtime != self._loaded_mtime:
+                with np.load(self._file.local_path) as npz:
+                    self._data = {
+                        "course_vectors": npz["course_vectors"].astype(np.float32),
+                        "course_ids": npz["course_ids"],
+                        "job_vectors": npz["job_vectors"].astype(np.float32),
+                        "job_ids": npz["job_ids"],
+                        "build_id": str(npz["build_id"]),
+                    }
+                self._loaded_mtime = mtime
+            return self._data
+
+    def is_usable(self) -> bool:
+        """Whether an index built from the replica currently on disk is loaded."""
+        data = self.load()
+        return data is not None and catalog_replica is not None and catalog_replica.build_id() == data["build_id"]
+
+    def search(self, kind: str, queries: np.ndarray, k: int) -> list | None:
+        """
+        Nearest catalog rows for each query vector.
+
+        Args:
+            kind (str): "course" or "job".
+            queries (np.ndarray): Unit-normalised query vectors, one per row.
+            k (int): Neighbours to return per query.
+
+        Returns:
+            list: For every query, a list of (replica rowid, score) best first,
+            or None if no index matching the current replica is available.
+        """
+        if not self.is_usable():
+            return None
+        data = self._data
+        with timed_stage(f"catalog_{kind}_vector_search"):
+            indices, scores = top_k_cosine(data[f"{kind}_vectors"], queries, k)
+        ids = data[f"{kind}_ids"]
+        return [
+            [(int(ids[i]), float(score)) for i, score in zip(row_indices, row_scores) if score >= CATALOG_SEMANTIC_MIN_SCORE]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+
+
+catalog_index = CatalogEmbeddingIndex() if CATALOG_SEMANTIC_SEARCH else None
+
+
+def semantic_top_courses_per_skill(skills: list, job_role: str, per_skill: int = 3) -> list | None:
+    """
+    Same rows as CatalogReplica.top_courses_per_skill, (skill, title, url, rating),
+    but ranked by embedding similarity between the skill and the course title + skills.
+    """
+    # Checked before encoding so a missing index or replica costs no model call.
+    if catalog_index is None or not skills or not catalog_index.is_usable():
+        return None
+    hits = catalog_index.search("course", embed_queries(skills), CATALOG_SEMANTIC_CANDIDATES)
+    if hits is None:
+        return None
+    candidates = sorted({rowid for skill_hits in hits for rowid, _ in skill_hits})
+    rows = catalog_replica.courses_by_rowid(candidates, job_role)
+    if rows is None:
+        return None
+    courses = {rowid: (title, url, rating) for rowid, title, url, rating in rows}
+
+    results = []
+    for skill, skill_hits in zip(skills, hits):
+        in_role = [courses[rowid] for rowid, _ in skill_hits if rowid in courses]
+        results.extend((skill, *course) for course in in_role[:per_skill])
+    return results
+
+
+def semantic_search_jobs(job_role: str, skills: list = None, limit: int = 5) -> list | None:
+    """Same rows as CatalogReplica.search_jobs, ranked by similarity to the role and skills."""
+    if catalog_index is None or not catalog_index.is_usable():
+        return None
+    query = job_role if not skills else f"{job_role}. Skills: {', '.join(skills)}"
+    hits = catalog_index.search("job", embed_queries([query]), CATALOG_SEMANTIC_CANDIDATES)
+    if hits is None:
+        return None
+    rows = catalog_replica.jobs_by_rowid([rowid for rowid, _ in hits[0]], job_role)
+    if rows is None:
+        return None
+    jobs = {rowid: job for rowid, *job in rows}
+    return [tuple(jobs[rowid]) for rowid, _ in hits[0] if rowid in jobs][:limit]
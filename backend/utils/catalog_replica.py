@@ -0,0 +1,217 @@
+import os
+import sqlite3
+import threading
+import time
+from dotenv import load_dotenv
+from utils.metrics import timed_stage
+from utils.s3_utils import download_file_from_s3, get_s3_object_etag
+
+load_dotenv()
+
+CATALOG_REPLICA_ENABLED = os.getenv("CATALOG_REPLICA_ENABLED", "true").lower() == "true"
+CATALOG_REPLICA_PATH = os.getenv("CATALOG_REPLICA_PATH", "catalog_replica.db")
+# Published by the refresh_catalog_replica task in the course and job DAGs.
+CATALOG_REPLICA_S3_KEY = os.getenv("CATALOG_REPLICA_S3_KEY", "catalog/catalog_replica.db")
+CATALOG_REPLICA_REFRESH_SECONDS = float(os.getenv("CATALOG_REPLICA_REFRESH_SECONDS", "900"))
+
+# The trigram tokenizer cannot match terms shorter than this through MATCH.
+MIN_TRIGRAM_TERM = 3
+
+
+def fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_substring_filter(groups: list) -> tuple[str, list]:
+    """
+    Build a WHERE clause requiring, for every (columns, terms) group, that one of the
+    terms occurs as a case-insensitive substring of one of the columns.
+
+    Uses a single trigram MATCH when every term is long enough, and LIKE otherwise.
+    """
+    groups = [(columns, [t for t in terms if t]) for columns, terms in groups]
+    groups = [(columns, terms) for columns, terms in groups if terms]
+    if not groups:
+        return "1 = 1", []
+
+    if all(len(t) >= MIN_TRIGRAM_TERM for _, terms in groups for t in terms):
+        expression = " AND ".join(
+            f"{{{' '.join(columns)}}} : ({' OR '.join(fts_phrase(t) for t in terms)})"
+            for columns, terms in groups
+        )
+        return "{table} MATCH ?", [expression]
+
+    clauses, params = [], []
+    for columns, terms in groups:
+        clauses.append("(" + " OR ".join(f"{c} LIKE ?" for t in terms for c in columns) + ")")
+        params.extend(f"%{t}%" for t in terms for _ in columns)
+    return " AND ".join(clauses), params
+
+
+class S3SyncedFile:
+    """
+    Local copy of an S3 object that is re-downloaded only when its ETag changes.
+
+    The ETag is checked at most every `refresh_seconds`. Failed checks or downloads
+    keep whatever copy is already on disk.
+    """
+
+    def __init__(self, local_path: str, s3_key: str, refresh_seconds: float):
+        self.local_path = local_path
+        self.s3_key = s3_key
+        self.refresh_seconds = refresh_seconds
+        self._etag = None
+        self._checked_at = None
+        self._syncing = False
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+
+    def refresh(self, force: bool = False):
+        """
+        Check S3 for a new version if the interval has passed.
+
+        With a copy on disk the check and download run on a background thread and
+        callers keep reading that copy meanwhile. Without one, callers wait for the
+        sync in flight, so they do not fall back just because it has not finished yet.
+        A forced refresh always runs in the calling thread.
+        """
+        with self._lock:
+            if force:
+                self._synced.wait_for(lambda: not self._syncing)
+            now = time.monotonic()
+            due = not self._syncing and (
+                force or self._checked_at is None or now - self._checked_at >= self.refresh_seconds
+            )
+            if due:
+                self._checked_at = now
+                self._syncing = True
+            elif not os.path.exists(self.local_path):
+                self._synced.wait_for(lambda: not self._syncing)
+                return
+        if not due:
+            return
+        if os.path.exists(self.local_path) and not force:
+            threading.Thread(target=self._sync_and_notify, name="s3-synced-file", daemon=True).start()
+        else:
+            self._sync_and_notify()
+
+    def _sync_and_notify(self):
+        try:
+            self._sync()
+        finally:
+            with self._lock:
+                self._syncing = False
+                self._synced.notify_all()
+
+    def _sync(self):
+        etag = get_s3_object_etag(self.s3_key)
+        if etag is None or (etag == self._etag and os.path.exists(self.local_path)):
+            return
+        tmp_path = f"{self.local_path}.download"
+        try:
+            download_file_from_s3(self.s3_key, tmp_path)
+            os.replace(tmp_path, self.local_path)
+            self._etag = etag
+        except Exception as e:
+            print(f"Could not refresh {self.local_path} from S3: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.local_path)
+
+
+class CatalogReplica:
+    """
+    Read-only local copy of the course and job catalogs, kept in sync with the
+    replica the Airflow DAGs publish to S3.
+
+    Searches return None whenever no replica is available so callers can fall back to Snowflake.
+    """
+
+    def __init__(self, db_path: str = CATALOG_REPLICA_PATH, s3_key: str = CATALOG_REPLICA_S3_KEY, refresh_seconds: float = CATALOG_REPLICA_REFRESH_SECONDS):
+        self.db_path = db_path
+        self._file = S3SyncedFile(db_path, s3_key, refresh_seconds)
+
+    def refresh(self, force: bool = False):
+        self._file.refresh(force)
+
+    def _execute(self, query: str, params: list) -> list | None:
+        self.refresh()
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            try:
+                with timed_stage("catalog_replica_query"):
+                    return conn.execute(query, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Catalog replica query failed: {str(e)}")
+            return None
+
+    def top_courses_per_skill(self, skills: list, job_role: str, per_skill: int = 3) -> list | None:
+        """
+        Best rated courses for each skill in one query, as (skill, title, url, rating) rows.
+
+        Each skill gets its own indexed branch with its own LIMIT, so a skill with many
+        matching courses cannot crowd out the others.
+        """
+        if not skills:
+            return []
+        branches, params = [], []
+        for skill in skills:
+            where, where_params = build_substring_filter([(["job_role"], [job_role]), (["title", "skills"], [skill])])
+            branches.append(
+                "SELECT * FROM (SELECT ? AS skill, title, url, rating FROM courses "
+                f"WHERE {where.format(table='courses')} "
+                "ORDER BY CAST(rating AS REAL) DESC, CAST(reviews AS INTEGER) DESC LIMIT ?)"
+            )
+            params.extend([skill, *where_params, per_skill])
+        return self._execute(" UNION ALL ".join(branches), params)
+
+    def build_id(self) -> str | None:
+        """Identifier of the Airflow refresh that produced the current replica."""
+        rows = self._execute("SELECT value FROM replica_meta WHERE key = 'build_id'", [])
+        return rows[0][0] if rows else None
+
+    def course_skill_terms(self) -> list | None:
+        """Every distinct entry of the comma-separated course SKILLS column."""
+        rows = self._execute("SELECT skills FROM courses", [])
+        if rows is None:
+            return None
+        return sorted({term.strip() for (skills,) in rows if skills for term in skills.split(",") if term.strip()})
+
+    def courses_by_rowid(self, rowids: list, job_role: str) -> list | None:
+        """(rowid, title, url, rating) for the given courses that belong to the job role."""
+        if not rowids:
+            return []
+        where, params = build_substring_filter([(["job_role"], [job_role])])
+        placeholders = ", ".join("?" * len(rowids))
+        return self._execute(
+            f"SELECT rowid, title, url, rating FROM courses WHERE rowid IN ({placeholders}) AND {where.format(table='courses')}",
+            [*rowids, *params]
+        )
+
+    def jobs_by_rowid(self, rowids: list, job_role: str) -> list | None:
+        """(rowid, job_title, company_name, location, job_url) for the given jobs with the role."""
+        if not rowids:
+            return []
+        where, params = build_substring_filter([(["role"], [job_role])])
+        placeholders = ", ".join("?" * len(rowids))
+        return self._execute(
+            f"SELECT rowid, job_title, company_name, location, job_url FROM jobs WHERE rowid IN ({placeholders}) AND {where.format(table='jobs')}",
+            [*rowids, *params]
+        )
+
+    def search_jobs(self, job_role: str, skills: list = None, limit: int = 5) -> list | None:
+        """Jobs for the role whose description mentions any of the skills."""
+        where, params = build_substring_filter([(["role"], [job_role]), (["description"], skills or [])])
+        return self._execute(
+            f"SELECT job_title, company_name, location, job_url FROM jobs WHERE {where.format(table='jobs')} LIMIT ?",
+            [*params, limit]
+        )
+
+
+catalog_replica = CatalogReplica() if CATALOG_REPLICA_ENABLED else None
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from dotenv import load_dotenv
+from utils.metrics import FAQ_CACHE_REQUESTS, FAQ_CACHE_SECONDS_SAVED
+
+load_dotenv()
+
+FAQ_CACHE_ENABLED = os.getenv("FAQ_CACHE_ENABLED", "true").lower() == "true"
+# Cosine similarity between question embeddings above which a stored answer is reused.
+FAQ_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("FAQ_CACHE_SIMILARITY_THRESHOLD", "0.92"))
+FAQ_CACHE_TTL_SECONDS = float(os.getenv("FAQ_CACHE_TTL_SECONDS", str(24 * 3600)))
+FAQ_CACHE_MAX_ENTRIES = int(os.getenv("FAQ_CACHE_MAX_ENTRIES", "1000"))
+
+
+def partition_key(role: str = None, company: str = None) -> tuple:
+    return ((role or "").strip().lower(), (company or "").strip().lower())
+
+
+class SemanticAnswerCache:
+    """
+    In-memory cache of FAQ answers, looked up by question similarity.
+
+    Answers are only shared between questions for the same role and company. Entries
+    expire after `ttl_seconds`; beyond `max_entries` the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = FAQ_CACHE_SIMILARITY_THRESHOLD,
+        ttl_seconds: float = FAQ_CACHE_TTL_SECONDS,
+        max_entries: int = FAQ_CACHE_MAX_ENTRIES,
+        clock=time.monotonic
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._partitions = {}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        partition = self._partitions[entry["partition"]]
+        partition.discard(entry_id)
+        if not partition:
+            del self._partitions[entry["partition"]]
+
+    def lookup(self, role: str, company: str, vector) -> tuple | None:
+        """
+        Most similar stored answer for the role and company, if it clears the threshold.
+
+        Args:
+            role (str): Job role the question was asked for.
+            company (str): Company the question was asked for.
+            vector (list): Unit-normalised question embedding.
+
+        Returns:
+            tuple: (answer, similarity), or None on a miss.
+        """
+        now = self._clock()
+        with self._lock:
+            candidates = []
+            for entry_id in list(self._partitions.get(partition_key(role, company), ())):
+                if now - self._entries[entry_id]["created_at"] > self.ttl_seconds:
+                    self._remove(entry_id)
+                else:
+                    candidates.append(entry_id)
+
+            best_id, best_similarity = None, None
+            if candidates:
+                similarities = np.stack([self._entries[i]["vector"] for i in candidates]) @ np.asarray(vector, dtype=np.float32)
+                best = int(np.argmax(similarities))
+                best_id, best_similarity = candidates[best], float(similarities[best])
+
+            if best_id is None or best_similarity < self.similarity_threshold:
+                self.misses += 1
+                FAQ_CACHE_REQUESTS.labels(result="miss").inc()
+                return None
+
+            entry = self._entries[best_id]
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.seconds_saved += entry["compute_seconds"]
+        FAQ_CACHE_REQUESTS.labels(result="hit").inc()
+        FAQ_CACHE_SECONDS_SAVED.inc(entry["compute_seconds"])
+        return entry["answer"], best_similarity
+
+    def store(self, role: str, company: str, vector, answer, compute_seconds: float):
+        """Store an answer along with how long it took to produce, which a hit saves."""
+        key = partition_key(role, company)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "partition": key,
+                "vector": np.asarray(vector, dtype=np.float32),
+                "answer": answer,
+                "compute_seconds": compute_seconds,
+                "created_at": self._clock(),
+            }
+            self._partitions.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / requests, 3) if requests else None,
+                "seconds_saved": round(self.seconds_saved, 1),
+            }
+
+
+faq_answer_cache = SemanticAnswerCache() if FAQ_CACHE_ENABLED else None
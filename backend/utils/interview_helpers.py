@@ -1,17 +1,12 @@
-from litellm import completion
-import os
 from dotenv import load_dotenv
+from utils.metrics import timed
+from utils.llm_gateway import chat_completion
 
 #from crewai.tasks.task_output import TaskOutput
 
 load_dotenv()
 
-MODEL_API_KEYS = {
-    "gpt-4o": {"model": "gpt-4o", "api_key": os.getenv("OPENAI_API_KEY")},   
-    "claude": {"model": "claude-3-5-sonnet-20241022", "api_key": os.getenv("ANTHROPIC_API_KEY")},  
-    "grok": {"model": "xai/grok-2-1212", "api_key": os.getenv("GROK_API_KEY")},  
-}
-
+@timed("llm_next_question")
 def generate_next_question(mode, role, previous_question, user_answer, resume_summary=""):
     context = (
         f"You are acting as a professional interviewer for a {role} role. "
@@ -33,16 +28,15 @@ def generate_next_question(mode, role, previous_question, user_answer, resume_su
         "Respond only with the next question — no explanation or comments."
     )
 
-    creds = MODEL_API_KEYS["grok"]
-    response = completion(
-        model=creds["model"],
-        api_key=creds["api_key"],
+    response = chat_completion(
+        model="grok",
         messages=[{"role": "user", "content": context}],
         temperature=0.5,
         max_tokens=200
     )
-    return response["choices"][0]["message"]["content"].strip()
+    return response.strip()
 
+@timed("llm_interview_evaluation")
 def evaluate_interview(transcript, role, mode):
 
     prompt = (
@@ -59,12 +53,10 @@ def evaluate_interview(transcript, role, mode):
     for i, (q, a) in enumerate(transcript):
         prompt += f"Q{i+1}: {q}\nA{i+1}: {a}\n"
 
-    creds = MODEL_API_KEYS["grok"]
-    response = completion(
-        model=creds["model"],
-        api_key=creds["api_key"],
+    response = chat_completion(
+        model="grok",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.4,
         max_tokens=1200
     )
-    return response["choices"][0]["message"]["content"].strip()
+    return response.strip()
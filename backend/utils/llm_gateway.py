@@ -0,0 +1,220 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+import httpx
+import openai
+from openai import OpenAI
+from dotenv import load_dotenv
+from utils.metrics import LLM_ERRORS, LLM_IN_FLIGHT, LLM_REQUEST_DURATION, LLM_RETRIES, LLM_TOKENS
+from utils.llm_cache import get_llm_cache, make_cache_key
+
+load_dotenv()
+
+# Short names used across the backend for the models we call.
+MODEL_ALIASES = {
+    "gpt-4o": "gpt-4o",
+    "claude": "claude-3-5-sonnet-20241022",
+    "grok": "xai/grok-2-1212",
+}
+
+# OpenAI-compatible providers served through a shared, pooled client.
+PROVIDERS = {
+    "openai": {"api_key_env": "OPENAI_API_KEY", "base_url": None},
+    "xai": {"api_key_env": "GROK_API_KEY", "base_url": "https://api.x.ai/v1"},
+}
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_DEFAULT_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+_clients = {}
+_semaphores = {}
+_registry_lock = threading.Lock()
+
+
+def resolve_model(model: str) -> tuple[str, str]:
+    """
+    Split a model reference into (provider, provider model name).
+
+    Accepts aliases from MODEL_ALIASES ("grok"), litellm-style prefixed names
+    ("xai/grok-2-1212") and bare OpenAI model names ("gpt-3.5-turbo").
+    """
+    model = MODEL_ALIASES.get(model, model)
+    if "/" in model:
+        provider, name = model.split("/", 1)
+        return provider, name
+    if model.startswith("claude"):
+        return "anthropic", model
+    return "openai", model
+
+
+def get_client(provider: str) -> OpenAI:
+    with _registry_lock:
+        if provider not in _clients:
+            config = PROVIDERS[provider]
+            max_connections = get_concurrency_limit(provider) * 2
+            _clients[provider] = OpenAI(
+                api_key=os.getenv(config["api_key_env"]),
+                base_url=config["base_url"],
+                timeout=LLM_TIMEOUT_SECONDS,
+                # Retries are handled here so they share the backoff policy and metrics.
+                max_retries=0,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                    timeout=LLM_TIMEOUT_SECONDS,
+                ),
+            )
+        return _clients[provider]
+
+
+def get_concurrency_limit(provider: str) -> int:
+    return int(os.getenv(f"LLM_MAX_CONCURRENCY_{provider.upper()}", LLM_DEFAULT_CONCURRENCY))
+
+
+def get_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _registry_lock:
+        if provider not in _semaphores:
+            _semaphores[provider] = threading.BoundedSemaphore(get_concurrency_limit(provider))
+        return _semaphores[provider]
+
+
+def backoff_delay(attempt: int) -> float:
+    # Full jitter: spreads retries from concurrent callers instead of synchronising them.
+    return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _create(provider: str, name: str, request: dict):
+    if provider in PROVIDERS:
+        return get_client(provider).chat.completions.create(model=name, **request)
+
+    # Providers without an OpenAI-compatible endpoint go through litellm.
+    from litellm import completion
+    return completion(model=f"{provider}/{name}", timeout=LLM_TIMEOUT_SECONDS, **request)
+
+
+@contextmanager
+def provider_slot(provider: str):
+    """Hold one of the provider's concurrency slots for the duration of the block."""
+    with get_semaphore(provider):
+        LLM_IN_FLIGHT.labels(provider=provider).inc()
+        try:
+            yield
+        finally:
+            LLM_IN_FLIGHT.labels(provider=provider).dec()
+
+
+@contextmanager
+def _open_with_retries(provider: str, name: str, request: dict):
+    """
+    Yield the provider's response while holding the concurrency slot of the attempt that produced it.
+
+    Each attempt takes its own slot and backoff sleeps happen between slots, so a
+    backing-off call does not block other callers. Only getting the response is
+    retried; errors raised while the caller uses it (e.g. a stream breaking
+    part-way) propagate unchanged.
+    """
+    attempt = 0
+    while True:
+        with provider_slot(provider):
+            try:
+                response = _create(provider, name, request)
+            except RETRYABLE_ERRORS:
+                if attempt >= LLM_MAX_RETRIES:
+                    LLM_ERRORS.labels(provider=provider, model=name).inc()
+                    raise
+            except Exception:
+                LLM_ERRORS.labels(provider=provider, model=name).inc()
+                raise
+            else:
+                yield response
+                return
+        LLM_RETRIES.labels(provider=provider, model=name).inc()
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def _call_with_retries(provider: str, name: str, request: dict):
+    with _open_with_retries(provider, name, request) as response:
+        return response
+
+
+def _build_request(messages: list, temperature: float, max_tokens: int, **extra) -> dict:
+    request = {"messages": messages, **extra}
+    if temperature is not None:
+        request["temperature"] = temperature
+    if max_tokens is not None:
+        request["max_tokens"] = max_tokens
+    return request
+
+
+def chat_completion(model: str, messages: list, temperature: float = None, max_tokens: int = None, cache: bool = False) -> str:
+    """
+    Run a chat completion through the shared gateway.
+
+    Args:
+        model (str): Model alias or name, e.g. "grok", "xai/grok-2-1212" or "gpt-3.5-turbo".
+        messages (list): Chat messages in OpenAI format.
+        temperature (float): Optional sampling temperature.
+        max_tokens (int): Optional cap on generated tokens.
+        cache (bool): Serve identical requests from the persistent response cache.
+            Only use this for prompts whose answer should not vary between calls.
+
+    Returns:
+        str: Content of the first choice.
+    """
+    provider, name = resolve_model(model)
+    response_cache = get_llm_cache() if cache else None
+    if response_cache:
+        cache_key = make_cache_key(f"{provider}/{name}", messages, temperature, max_tokens)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    start = time.perf_counter()
+    try:
+        response = _call_with_retries(provider, name, _build_request(messages, temperature, max_tokens))
+    finally:
+        LLM_REQUEST_DURATION.labels(provider=provider, model=name).observe(time.perf_counter() - start)
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        LLM_TOKENS.labels(provider=provider, model=name, kind="prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels(provider=provider, model=name, kind="completion").inc(usage.completion_tokens or 0)
+    content = response.choices[0].message.content or ""
+    if response_cache and content:
+        response_cache.set(cache_key, f"{provider}/{name}", content)
+    return content
+
+
+def stream_chat_completion(model: str, messages: list, temperature: float = None, max_tokens: int = None):
+    """Same as chat_completion, but yields content deltas as they arrive."""
+    provider, name = resolve_model(model)
+    start = time.perf_counter()
+    completion_chunks = 0
+    try:
+        # The slot is held for the whole stream, since the provider is generating until it ends.
+        # Only opening the stream is retried; a stream that fails part-way surfaces to the caller.
+        request = _build_request(messages, temperature, max_tokens, stream=True)
+        with _open_with_retries(provider, name, request) as response:
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    completion_chunks += 1
+                    yield delta
+    finally:
+        LLM_REQUEST_DURATION.labels(provider=provider, model=name).observe(time.perf_counter() - start)
+        # Streamed responses carry no usage block; each content chunk is roughly one token.
+        LLM_TOKENS.labels(provider=provider, model=name, kind="completion").inc(completion_chunks)
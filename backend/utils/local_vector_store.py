@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from utils.catalog_embeddings import top_k_cosine
+from utils.catalog_replica import S3SyncedFile
+
+load_dotenv()
+
+VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", "faq_vectors.bin")
+# Published by the reddit_to_pinecone_dag after each upload; empty disables syncing from S3.
+VECTOR_STORE_S3_KEY = os.getenv("VECTOR_STORE_S3_KEY", "rag/faq_vectors.bin")
+VECTOR_STORE_REFRESH_SECONDS = float(os.getenv("VECTOR_STORE_REFRESH_SECONDS", "3600"))
+
+# File layout: magic, header length (uint64), JSON header padded to 64 bytes, then the
+# float32 vectors row by row, so the matrix can be memory-mapped straight from the file.
+VECTOR_STORE_MAGIC = b"VSTORE01"
+VECTOR_STORE_ALIGNMENT = 64
+
+
+def write_vector_store(path: str, ids: list, vectors, metadatas: list, dimension: int = 384) -> str:
+    """
+    Write vectors and their metadata to a vector store file, replacing it atomically.
+
+    Vectors are unit-normalised on write so a dot product gives the cosine score Pinecone reports.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), dimension)
+    vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    header = json.dumps({"count": len(ids), "dimension": dimension, "ids": list(ids), "metadata": list(metadatas)}).encode("utf-8")
+    prefix_length = len(VECTOR_STORE_MAGIC) + 8
+    header += b" " * (-(prefix_length + len(header)) % VECTOR_STORE_ALIGNMENT)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(VECTOR_STORE_MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(vectors.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def metadata_fields(metadatas: list) -> dict:
+    """Metadata columns as arrays, so equality filters are one vectorized comparison."""
+    fields = {key for m in metadatas for key in m}
+    return {field: np.array([m.get(field) for m in metadatas], dtype=object) for field in fields}
+
+
+def filter_rows(fields: dict, count: int, filter: dict = None) -> np.ndarray:
+    """
+    Indices of the rows matching Pinecone-style metadata equality filters.
+
+    Args:
+        fields (dict): Output of metadata_fields.
+        count (int): Number of rows.
+        filter (dict): {field: {"$eq": value}} or {field: value}.
+
+    Returns:
+        np.ndarray: Matching row indices in ascending order.
+    """
+    rows = np.arange(count)
+    for field, condition in (filter or {}).items():
+        if isinstance(condition, dict):
+            if set(condition) != {"$eq"}:
+                raise ValueError(f"Unsupported filter for '{field}': {condition}; only $eq is supported")
+            condition = condition["$eq"]
+        values = fields.get(field)
+        rows = rows[values[rows] == condition] if values is not None else rows[:0]
+    return rows
+
+
+def read_vector_store(path: str) -> dict:
+    """Open a vector store file, memory-mapping its vectors rather than reading them into memory."""
+    with open(path, "rb") as f:
+        if f.read(len(VECTOR_STORE_MAGIC)) != VECTOR_STORE_MAGIC:
+            raise ValueError(f"{path} is not a vector store file")
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length))
+
+    count, dimension = header["count"], header["dimension"]
+    if count:
+        offset = len(VECTOR_STORE_MAGIC) + 8 + header_length
+        vectors = np.memmap(path, dtype=np.float32, mode="r", offset=offset, shape=(count, dimension))
+    else:
+        vectors = np.zeros((0, dimension), dtype=np.float32)
+    return {
+        "vectors": vectors,
+        "ids": header["ids"],
+        "metadata": header["metadata"],
+        "fields": metadata_fields(header["metadata"]),
+    }
+
+
+class LocalVectorStore:
+    """
+    In-process replacement for the Pinecone index behind the FAQ retrieval.
+
+    Queries use Pinecone's filter syntax ({"role": {"$eq": ...}}) and return matches in
+    Pinecone's shape ({"id", "score", "metadata"}) with cosine scores, best first.
+    """
+
+    def __init__(self, path: str = VECTOR_STORE_PATH, s3_key: str = VECTOR_STORE_S3_KEY, refresh_seconds: float = VECTOR_STORE_REFRESH_SECONDS):
+        self.path = path
+        self._file = S3SyncedFile(path, s3_key, refresh_seconds) if s3_key else None
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._data = None
+
+    def load(self) -> dict | None:
+        if self._file:
+            self._file.refresh()
+        if not os.path.exists(self.path):
+            return None
+        mtime = os.path.getmtime(self.path)
+        with self._lock:
+            # A refresh replaces the file, so existing maps keep reading the old copy until reloaded here.
+            if mtime != self._loaded_mtime:
+                self._data = read_vector_store(self.path)
+                self._loaded_mtime = mtime
+            return self._data
+
+    def query(self, vector, top_k: int = 5, filter: dict = None) -> list | None:
+        """
+        Nearest stored vectors to the query vector.
+
+        Args:
+            vector (list): Query embedding.
+            top_k (int): Number of matches to return.
+            filter (dict): Metadata equality filters, as {field: {"$eq": value}} or {field: value}.
+
+        Returns:
+            list: Matches best first, or None if no store file is available.
+        """
+        data = self.load()
+        if data is None:
+            return None
+
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / max(np.linalg.norm(query), 1e-12)
+        rows = filter_rows(data["fields"], len(data["ids"]), filter)
+
+        # Without filters the memory-mapped matrix is searched in place rather than copied.
+        matrix = data["vectors"] if len(rows) == len(data["ids"]) else data["vectors"][rows]
+        indices, scores = top_k_cosine(matrix, query[np.newaxis, :], top_k)
+        return [
+            {"id": data["ids"][rows[i]], "score": float(score), "metadata": data["metadata"][rows[i]]}
+            for i, score in zip(indices[0], scores[0])
+        ]
+
+
+local_vector_store = LocalVectorStore()
@@ -0,0 +1,140 @@
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from uuid import uuid4
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+logger = logging.getLogger("backend.metrics")
+
+# Set per request by the API middleware; copied into worker threads with the context.
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="background")
+current_trace_id: ContextVar[str] = ContextVar("current_trace_id", default="-")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+STAGE_DURATION = Histogram(
+    "backend_stage_duration_seconds",
+    "Duration of individual pipeline stages (LLM calls, tools, Snowflake, Pinecone, S3, PDF work).",
+    ["endpoint", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    "backend_stage_errors_total",
+    "Pipeline stages that raised an exception.",
+    ["endpoint", "stage"],
+)
+REQUEST_DURATION = Histogram(
+    "backend_request_duration_seconds",
+    "End-to-end HTTP request duration.",
+    ["endpoint", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+POOL_QUEUE_WAIT = Histogram(
+    "backend_pool_queue_wait_seconds",
+    "Time a request waited for a free worker in an execution pool.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+POOL_OCCUPANCY = Gauge(
+    "backend_pool_occupancy",
+    "Requests currently running or queued in an execution pool.",
+    ["pool", "state"],
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "backend_llm_request_duration_seconds",
+    "Latency of LLM provider calls made through the gateway, including retries.",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "backend_llm_tokens_total",
+    "Tokens consumed through the LLM gateway.",
+    ["provider", "model", "kind"],
+)
+LLM_RETRIES = Counter(
+    "backend_llm_retries_total",
+    "LLM calls retried after a transient provider error.",
+    ["provider", "model"],
+)
+LLM_ERRORS = Counter(
+    "backend_llm_errors_total",
+    "LLM calls that failed after exhausting retries.",
+    ["provider", "model"],
+)
+LLM_IN_FLIGHT = Gauge(
+    "backend_llm_in_flight",
+    "LLM calls currently holding a provider concurrency slot.",
+    ["provider"],
+)
+LLM_CACHE_REQUESTS = Counter(
+    "backend_llm_cache_requests_total",
+    "LLM response cache lookups by result (hit or miss).",
+    ["result"],
+)
+FAQ_CACHE_REQUESTS = Counter(
+    "backend_faq_cache_requests_total",
+    "FAQ semantic answer cache lookups by result (hit or miss).",
+    ["result"],
+)
+FAQ_CACHE_SECONDS_SAVED = Counter(
+    "backend_faq_cache_seconds_saved_total",
+    "Pipeline time saved by FAQ cache hits, measured when the reused answers were first computed.",
+)
+
+SNOWFLAKE_CHECKOUT_WAIT = Histogram(
+    "backend_snowflake_checkout_wait_seconds",
+    "Time spent obtaining a Snowflake connection from the pool, including opening new ones.",
+    buckets=LATENCY_BUCKETS,
+)
+SNOWFLAKE_CONNECTIONS_CREATED = Counter(
+    "backend_snowflake_connections_created_total",
+    "Snowflake connections opened by the pool.",
+)
+SNOWFLAKE_CONNECTIONS_CLOSED = Counter(
+    "backend_snowflake_connections_closed_total",
+    "Snowflake connections closed by the pool, by reason.",
+    ["reason"],
+)
+SNOWFLAKE_CONNECTIONS = Gauge(
+    "backend_snowflake_connections",
+    "Open Snowflake connections in the pool.",
+    ["state"],
+)
+
+
+def new_trace_id() -> str:
+    return uuid4().hex
+
+
+@contextmanager
+def timed_stage(stage: str):
+    """Record the duration of the enclosed block under the current endpoint and the given stage."""
+    endpoint = current_endpoint.get()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(endpoint=endpoint, stage=stage).inc()
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_DURATION.labels(endpoint=endpoint, stage=stage).observe(duration)
+        logger.info("trace=%s endpoint=%s stage=%s duration=%.3fs", current_trace_id.get(), endpoint, stage, duration)
+
+
+def timed(stage: str):
+    """Decorator form of timed_stage."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -10,8 +10,10 @@ from reportlab.platypus import (
 from reportlab.lib.enums import TA_CENTER
 import matplotlib.pyplot as plt
 import os
+from utils.metrics import timed
 
 
+@timed("pdf_rendering")
 def generate_pdf_report_with_details(candidate_name: str, match_result: dict, full_text: str, output_stream=None, output_path=None):
     if output_stream is None and output_path is None:
         raise ValueError("Either output_stream or output_path must be provided.")
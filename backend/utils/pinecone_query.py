@@ -1,7 +1,12 @@
 from pinecone import Pinecone
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
+import re
+from utils.bm25_index import local_bm25_index, reciprocal_rank_fusion
+from utils.embeddings import get_embedder
+from utils.local_vector_store import local_vector_store
+from utils.metrics import timed_stage
 
 # Load from .env assuming it's at the root of your backend directory
 load_dotenv()
@@ -10,28 +15,70 @@ load_dotenv()
 api_key = os.getenv("PINECONE_API_KEY")
 index_name = os.getenv("INDEX_NAME")
 
-embedding_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+# "pinecone" queries the hosted index; "local" searches the in-process copy published by Airflow.
+VECTOR_STORE = os.getenv("VECTOR_STORE", "pinecone").lower()
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+# "dense" uses vector similarity only; "hybrid" fuses it with BM25 keyword matches.
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+# Candidates taken from each retriever before fusion.
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "20"))
+RRF_K = int(os.getenv("RRF_K", "60"))
 
 
-def query_pinecone_chunks(query: str, role=None, company=None, api_key=None, index_name=None, top_k=5, score_threshold=0.5):
-    query_embedding = embedding_model.encode(query).tolist()
-    pc = Pinecone(api_key=api_key)
-    index = pc.Index(index_name)
+@lru_cache(maxsize=8)
+def get_pinecone_index(api_key: str, index_name: str):
+    """Long-lived index handle per (api key, index); it keeps its HTTP connections open between queries."""
+    return Pinecone(api_key=api_key).Index(index_name)
+
+
+def normalize_query(query: str) -> str:
+    # MiniLM is uncased, so case and spacing differences don't change the embedding.
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+@lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_normalized_query(normalized_query: str) -> tuple:
+    with timed_stage("query_embedding"):
+        return tuple(get_embedder().encode(normalized_query).tolist())
 
+
+def embed_query(query: str) -> list:
+    """Embedding of the query, cached on its normalized text."""
+    return list(_embed_normalized_query(normalize_query(query)))
+
+
+def build_metadata_filter(role=None, company=None) -> dict:
     metadata_filter = {}
     if role:
         metadata_filter["role"] = {"$eq": role}
     if company:
         metadata_filter["company"] = {"$eq": company}
+    return metadata_filter
 
-    results = index.query(
-        vector=query_embedding,
-        top_k=top_k,
-        include_metadata=True,
-        filter=metadata_filter if metadata_filter else None,
-    )
 
-    matches = results.get("matches", [])
+def query_pinecone_chunks(query: str, role=None, company=None, api_key=None, index_name=None, top_k=5, score_threshold=0.5):
+    query_embedding = embed_query(query)
+    metadata_filter = build_metadata_filter(role, company)
+
+    if VECTOR_STORE == "local":
+        with timed_stage("local_vector_query"):
+            matches = local_vector_store.query(query_embedding, top_k=top_k, filter=metadata_filter or None)
+        if matches is None:
+            return {
+                "status": "error",
+                "message": "The local vector store is not available.",
+                "matches": []
+            }
+    else:
+        index = get_pinecone_index(api_key, index_name)
+        with timed_stage("pinecone_query"):
+            results = index.query(
+                vector=query_embedding,
+                top_k=top_k,
+                include_metadata=True,
+                filter=metadata_filter if metadata_filter else None,
+            )
+        matches = results.get("matches", [])
     filtered_matches = [m for m in matches if m["score"] >= score_threshold]
 
     if not filtered_matches:
@@ -46,4 +93,35 @@ def query_pinecone_chunks(query: str, role=None, company=None, api_key=None, ind
         "matches": filtered_matches
     }
 
-    #return results
\ No newline at end of file
+    #return results
+
+
+def retrieve_chunks(query: str, role=None, company=None, api_key=None, index_name=None, top_k=5, score_threshold=0.5, mode: str = None):
+    """
+    Retrieve FAQ chunks for a question, fusing dense and BM25 results in hybrid mode.
+
+    Dense matches still have to clear `score_threshold`; keyword matches ("LC hard",
+    "L5 onsite loop") get in through BM25 even when no dense match does.
+
+    Returns:
+        dict: Same shape as query_pinecone_chunks; in hybrid mode scores are fused RRF scores.
+    """
+    mode = (mode or RETRIEVAL_MODE).lower()
+    if mode != "hybrid":
+        return query_pinecone_chunks(query, role, company, api_key, index_name, top_k, score_threshold)
+
+    dense = query_pinecone_chunks(query, role, company, api_key, index_name, RETRIEVAL_CANDIDATES, score_threshold)
+    metadata_filter = build_metadata_filter(role, company)
+    with timed_stage("bm25_query"):
+        keyword_matches = local_bm25_index.search(query, RETRIEVAL_CANDIDATES, metadata_filter or None) or []
+
+    if not keyword_matches:
+        if dense["matches"]:
+            dense["matches"] = dense["matches"][:top_k]
+        return dense
+
+    fused = reciprocal_rank_fusion([dense["matches"], keyword_matches], k=RRF_K)
+    return {
+        "status": "success",
+        "matches": fused[:top_k]
+    }
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "local" keeps reports on disk next to the API; "s3" uploads them and serves presigned links.
+REPORT_STORE_BACKEND = os.getenv("REPORT_STORE_BACKEND", "local").lower()
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", "reports"))
+REPORT_S3_PREFIX = "reports"
+
+_REPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def compute_report_id(pdf_bytes: bytes) -> str:
+    """
+    Derive the content-addressed id of a report.
+
+    Args:
+        pdf_bytes (bytes): Rendered PDF content.
+
+    Returns:
+        str: Hex SHA-256 digest of the content.
+    """
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def is_valid_report_id(report_id: str) -> bool:
+    return bool(_REPORT_ID_PATTERN.match(report_id))
+
+
+def get_report_path(report_id: str) -> Path:
+    return REPORTS_DIR / f"{report_id}.pdf"
+
+
+def get_report_s3_key(report_id: str) -> str:
+    return f"{REPORT_S3_PREFIX}/{report_id}.pdf"
+
+
+def save_report(pdf_bytes: bytes) -> str:
+    """
+    Store a rendered report under its content hash. Identical reports are stored once.
+
+    Args:
+        pdf_bytes (bytes): Rendered PDF content.
+
+    Returns:
+        str: The report id to pass to GET /reports/{id}.pdf.
+    """
+    report_id = compute_report_id(pdf_bytes)
+
+    if REPORT_STORE_BACKEND == "s3":
+        # Imported lazily so local deployments do not need AWS credentials.
+        from utils.s3_utils import upload_file_to_s3
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir) / f"{report_id}.pdf"
+            tmp_path.write_bytes(pdf_bytes)
+            upload_file_to_s3(
+                file_path=str(tmp_path),
+                source=REPORT_S3_PREFIX,
+                metadata={"file_type": "pdf", "content_sha256": report_id}
+            )
+        return report_id
+
+    report_path = get_report_path(report_id)
+    if not report_path.exists():
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so a concurrent reader never sees a partial report.
+        fd, tmp_name = tempfile.mkstemp(dir=REPORTS_DIR, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_name, report_path)
+    return report_id
+
+
+def get_report_presigned_url(report_id: str, expiration: int = 3600) -> str | None:
+    from utils.s3_utils import generate_presigned_url
+
+    return generate_presigned_url(get_report_s3_key(report_id), expiration=expiration)
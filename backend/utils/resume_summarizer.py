@@ -1,28 +1,49 @@
-from litellm import completion
 import os
 from dotenv import load_dotenv
-from utils.s3_utils import fetch_markdown_from_s3
+from utils.s3_utils import fetch_markdown_from_s3, get_s3_object_etag
+from utils.metrics import timed_stage
+from utils.cache import LRUCache
+from utils.llm_gateway import chat_completion
+import hashlib
 import requests
 
 load_dotenv()
 
-MODEL_API_KEYS = {
-    "gpt-4o": {"model": "gpt-4o", "api_key": os.getenv("OPENAI_API_KEY")},   
-    "claude": {"model": "claude-3-5-sonnet-20241022", "api_key": os.getenv("ANTHROPIC_API_KEY")},  
-    "grok": {"model": "xai/grok-2-1212", "api_key": os.getenv("GROK_API_KEY")},  
-}
+# Summaries are keyed by S3 key + ETag (or content hash), so an unchanged resume is summarized once.
+# Set RESUME_SUMMARY_CACHE_DIR to keep summaries across restarts.
+summary_cache = LRUCache(
+    maxsize=int(os.getenv("RESUME_SUMMARY_CACHE_SIZE", "256")),
+    disk_dir=os.getenv("RESUME_SUMMARY_CACHE_DIR") or None
+)
 
 def generate_resume_summary(resume_s3_path: str)-> str:
     if resume_s3_path.startswith("s3://"):
         resume_s3_path = "/".join(resume_s3_path.split("/")[3:])
-        
+
+    etag = get_s3_object_etag(resume_s3_path)
+    if etag:
+        cached = summary_cache.get(f"{resume_s3_path}:{etag}")
+        if cached:
+            return cached
+
     resume_text = fetch_markdown_from_s3(resume_s3_path)
 
     if not resume_text:
         raise ValueError(f"Could not fetch resume markdown from {resume_s3_path}")
-    
-    model_id = "grok"
-    creds = MODEL_API_KEYS[model_id]
+
+    if etag:
+        cache_key = f"{resume_s3_path}:{etag}"
+    else:
+        cache_key = f"{resume_s3_path}:sha256:{hashlib.sha256(resume_text.encode('utf-8')).hexdigest()}"
+        cached = summary_cache.get(cache_key)
+        if cached:
+            return cached
+
+    summary = summarize_resume_text(resume_text)
+    summary_cache.set(cache_key, summary)
+    return summary
+
+def summarize_resume_text(resume_text: str) -> str:
     prompt = f"""
 You are an expert resume summarizer. Read the resume text and produce a structured summary in the following format:
 
@@ -43,14 +64,13 @@ Resume:
 {resume_text}
     """
 
-    response = completion(
-        model=creds["model"],
-        api_key=creds["api_key"],
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=500,
-        temperature=0.3
-    )
-    print(response)
+    with timed_stage("llm_resume_summary"):
+        response = chat_completion(
+            model="grok",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=500,
+            temperature=0.3
+        )
 
-    return response["choices"][0]["message"]["content"].strip()
+    return response.strip()
 
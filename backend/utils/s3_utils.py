@@ -2,6 +2,7 @@ import boto3
 import os
 from dotenv import load_dotenv
 from botocore.exceptions import NoCredentialsError
+from utils.metrics import timed_stage
 
 # Load environment variables from .env file
 load_dotenv()
@@ -71,10 +72,11 @@ def upload_file_to_s3(file_path: str, source: str, metadata: dict = None) -> str
 
     try:
         # Upload file to S3
-        s3_client.upload_file(
-            file_path, S3_BUCKET_NAME, object_key,
-            ExtraArgs={"Metadata": metadata or {}, "ServerSideEncryption": "AES256"}
-        )
+        with timed_stage("s3_upload"):
+            s3_client.upload_file(
+                file_path, S3_BUCKET_NAME, object_key,
+                ExtraArgs={"Metadata": metadata or {}, "ServerSideEncryption": "AES256"}
+            )
         return f"https://{S3_BUCKET_NAME}.s3.amazonaws.com/{object_key}"
     except Exception as e:
         raise RuntimeError(f"Error uploading {file_path} to S3: {str(e)}")
@@ -113,8 +115,47 @@ def fetch_markdown_from_s3(s3_path):
         str: Markdown content as a string.
     """
     try:
-        obj = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=s3_path)
-        return obj["Body"].read().decode("utf-8")
+        with timed_stage("s3_download"):
+            obj = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=s3_path)
+            return obj["Body"].read().decode("utf-8")
     except Exception as e:
         print(f"Error fetching {s3_path} from S3: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_s3_object_etag(s3_path):
+    """
+    Fetch the ETag of an S3 object without downloading it.
+
+    Args:
+        s3_path (str): S3 object key.
+
+    Returns:
+        str: The object's ETag, or None if it could not be retrieved.
+    """
+    try:
+        with timed_stage("s3_head"):
+            obj = s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=s3_path)
+        return obj["ETag"].strip('"')
+    except Exception as e:
+        print(f"Error fetching ETag for {s3_path} from S3: {e}")
+        return None
+
+
+def download_file_from_s3(s3_path, local_path):
+    """
+    Download an S3 object to a local file.
+
+    Args:
+        s3_path (str): S3 object key.
+        local_path (str): Destination path on disk.
+
+    Returns:
+        str: The local path.
+    """
+    try:
+        with timed_stage("s3_download"):
+            s3_client.download_file(S3_BUCKET_NAME, s3_path, local_path)
+        return local_path
+    except Exception as e:
+        raise RuntimeError(f"Error downloading {s3_path} from S3: {str(e)}")
@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import snowflake.connector
+from snowflake.connector.errors import ProgrammingError
+from dotenv import load_dotenv
+from utils.metrics import (
+    SNOWFLAKE_CHECKOUT_WAIT,
+    SNOWFLAKE_CONNECTIONS,
+    SNOWFLAKE_CONNECTIONS_CLOSED,
+    SNOWFLAKE_CONNECTIONS_CREATED,
+    timed_stage,
+)
+
+load_dotenv()
+
+SNOWFLAKE_POOL_MAX_SIZE = int(os.getenv("SNOWFLAKE_POOL_MAX_SIZE", "4"))
+SNOWFLAKE_POOL_IDLE_TIMEOUT = float(os.getenv("SNOWFLAKE_POOL_IDLE_TIMEOUT", "600"))
+SNOWFLAKE_POOL_CHECKOUT_TIMEOUT = float(os.getenv("SNOWFLAKE_POOL_CHECKOUT_TIMEOUT", "30"))
+SNOWFLAKE_POOL_HEALTH_CHECK_AFTER = float(os.getenv("SNOWFLAKE_POOL_HEALTH_CHECK_AFTER", "60"))
+
+
+def connect_to_snowflake():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
+        database="FINAL_PROJECT",
+        schema="DATA_STORE",
+        role=os.getenv("SNOWFLAKE_ROLE"),
+    )
+
+
+class SnowflakeConnectionPool:
+    """
+    Process-wide pool of warm Snowflake connections.
+
+    At most `max_size` connections are open at once; callers beyond that wait up to
+    `checkout_timeout` seconds for one to be returned. Connections idle for longer than
+    `idle_timeout` are closed, and one that has sat idle for `health_check_after`
+    seconds is pinged with SELECT 1 before it is handed out again.
+    """
+
+    def __init__(
+        self,
+        connect_fn=connect_to_snowflake,
+        max_size: int = SNOWFLAKE_POOL_MAX_SIZE,
+        idle_timeout: float = SNOWFLAKE_POOL_IDLE_TIMEOUT,
+        checkout_timeout: float = SNOWFLAKE_POOL_CHECKOUT_TIMEOUT,
+        health_check_after: float = SNOWFLAKE_POOL_HEALTH_CHECK_AFTER,
+    ):
+        self.connect_fn = connect_fn
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+        # (connection, returned_at); the most recently returned connection is reused first.
+        self._idle = deque()
+        self._open = 0
+        self._cond = threading.Condition()
+        SNOWFLAKE_CONNECTIONS.labels(state="idle").set_function(lambda: len(self._idle))
+        SNOWFLAKE_CONNECTIONS.labels(state="in_use").set_function(lambda: self._open - len(self._idle))
+
+    def _close(self, conn, reason: str):
+        SNOWFLAKE_CONNECTIONS_CLOSED.labels(reason=reason).inc()
+        try:
+            conn.close()
+        except Exception as e:
+            print(f"Error closing Snowflake connection: {str(e)}")
+
+    def _evict_idle(self) -> list:
+        """Drop connections idle past the timeout. Must be called with the lock held."""
+        expired = []
+        cutoff = time.monotonic() - self.idle_timeout
+        # The oldest connections sit at the left end.
+        while self._idle and self._idle[0][1] < cutoff:
+            expired.append(self._idle.popleft()[0])
+            self._open -= 1
+        return expired
+
+    def _is_healthy(self, conn) -> bool:
+        try:
+            if conn.is_closed():
+                return False
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self):
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                expired = self._evict_idle()
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._open < self.max_size:
+                    # Reserve the slot; the connection itself is opened outside the lock.
+                    self._open += 1
+                    conn, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out after {self.checkout_timeout}s waiting for a Snowflake connection"
+                    )
+                self._cond.wait(remaining)
+
+        for stale in expired:
+            self._close(stale, reason="idle")
+
+        try:
+            if conn is not None and time.monotonic() - returned_at > self.health_check_after:
+                if not self._is_healthy(conn):
+                    self._close(conn, reason="unhealthy")
+                    conn = None
+            if conn is None:
+                conn = self.connect_fn()
+                SNOWFLAKE_CONNECTIONS_CREATED.inc()
+        except Exception:
+            self._release_slot()
+            raise
+        finally:
+            SNOWFLAKE_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+        return conn
+
+    def _release_slot(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _checkin(self, conn):
+        if conn.is_closed():
+            SNOWFLAKE_CONNECTIONS_CLOSED.labels(reason="error").inc()
+            self._release_slot()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block and return it to the pool afterwards."""
+        conn = self._checkout()
+        try:
+            yield conn
+        except ProgrammingError:
+            # A bad query leaves the session usable.
+            self._checkin(conn)
+            raise
+        except Exception:
+            self._close(conn, reason="error")
+            self._release_slot()
+            raise
+        else:
+            self._checkin(conn)
+
+    def close_all(self):
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn in idle:
+            self._close(conn, reason="shutdown")
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"max_size": self.max_size, "open": self._open, "idle": len(self._idle)}
+
+
+snowflake_pool = SnowflakeConnectionPool()
+
+
+def query_snowflake(query: str, params=None) -> list:
+    """Run a query on a pooled connection and return all rows."""
+    with snowflake_pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            with timed_stage("snowflake_query"):
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        finally:
+            cursor.close()
@@ -0,0 +1,85 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from utils.metrics import timed_stage
+
+
+class Stage:
+    """
+    One node of a stage graph.
+
+    `fn` is called with the results of `deps`, in order, once all of them have finished.
+    """
+
+    def __init__(self, name: str, fn, deps: list = None):
+        self.name = name
+        self.fn = fn
+        self.deps = deps or []
+
+
+def _check_graph(stages: list):
+    names = {stage.name for stage in stages}
+    if len(names) != len(stages):
+        raise ValueError("Stage names must be unique")
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+
+def run_stage_graph(stages: list, max_workers: int = 4, on_stage_start=None) -> tuple[dict, dict]:
+    """
+    Run a dependency graph of blocking stages, starting each one as soon as its
+    dependencies are done so that independent branches overlap.
+
+    Args:
+        stages (list): Stage objects; dependencies must refer to other stages in the list.
+        max_workers (int): Upper bound on stages running at the same time.
+        on_stage_start (callable): Optional callback invoked with the stage name when it starts.
+
+    Returns:
+        tuple[dict, dict]: Results keyed by stage name, and wall-clock seconds per stage.
+
+    Raises:
+        Exception: The first exception raised by a stage; stages not yet started are skipped.
+    """
+    _check_graph(stages)
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+    timings = {}
+
+    def execute(stage: Stage, args: list):
+        start = time.perf_counter()
+        try:
+            with timed_stage(stage.name):
+                return stage.fn(*args)
+        finally:
+            timings[stage.name] = round(time.perf_counter() - start, 4)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as executor:
+        running = {}
+        while pending or running:
+            ready = [stage for stage in pending.values() if all(dep in results for dep in stage.deps)]
+            for stage in ready:
+                del pending[stage.name]
+                if on_stage_start:
+                    on_stage_start(stage.name)
+                # Each stage runs in a copy of the caller's context so metrics keep the endpoint label.
+                ctx = contextvars.copy_context()
+                args = [results[dep] for dep in stage.deps]
+                running[executor.submit(ctx.run, execute, stage, args)] = stage.name
+
+            if not running:
+                raise ValueError(f"Stage graph has a dependency cycle among: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                results[name] = future.result()
+
+    return results, timings
@@ -0,0 +1,76 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class ToolResultMemo:
+    """
+    Thread-safe store of tool results shared by the analyses in one batch.
+
+    `get_or_compute` runs the computation once per key even when several candidates
+    ask for the same key at the same time; the others wait for that result.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._results[key] = value
+            self.misses += 1
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._results:
+                    self.hits += 1
+                    return self._results[key]
+            value = compute()
+            with self._lock:
+                self._results[key] = value
+                self.misses += 1
+            return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._results), "hits": self.hits, "misses": self.misses}
+
+
+# Set while a batch runs; copied into the batch's worker threads with the context.
+current_tool_memo: ContextVar[ToolResultMemo | None] = ContextVar("current_tool_memo", default=None)
+
+
+@contextmanager
+def shared_tool_results():
+    """Share catalog tool results between every analysis started inside the block."""
+    memo = ToolResultMemo()
+    token = current_tool_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        current_tool_memo.reset(token)
+
+
+def memoized(key, compute):
+    """Return compute(), reusing the result for the same key within a shared_tool_results block."""
+    memo = current_tool_memo.get()
+    if memo is None:
+        return compute()
+    return memo.get_or_compute(key, compute)
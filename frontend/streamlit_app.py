@@ -11,6 +11,7 @@ import requests
 from scripts.pdf_helper import create_pdf
 import markdown
 import html
+import json
 from streamlit_ace import st_ace
 
 # Load environment variables
@@ -122,6 +123,26 @@ def call_upload_api(uploaded_file,job_description, location):
     except Exception as e:
         return f"Error: {e}"
 
+def fetch_report_pdf(report_url):
+    response = requests.get(f"{FASTAPI_URL}{report_url}")
+    response.raise_for_status()
+    return response.content
+
+def stream_sse_tokens(url, payload):
+    with requests.post(url, json=payload, stream=True) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                if event == "error":
+                    raise RuntimeError(data.get("message", "Streaming failed"))
+                if event is None:
+                    yield data["token"]
+                event = None
+
 def call_recommendation_api():
     try:
         response = requests.get(f"{FASTAPI_URL}/get_recommendations")
@@ -390,7 +411,7 @@ def main_app(username):
                 with st.spinner("Analyzing your resume..."):
                     data = call_upload_api(uploaded_file, job_description, location)
                     st.session_state.summary = data.get("summary")
-                    st.session_state.pdf_bytes = data["pdf_base64"].encode("latin1")
+                    st.session_state.pdf_bytes = fetch_report_pdf(data["report_url"])
                     st.session_state.markdown_s3_url = data.get("markdown_s3_url")
             if st.session_state.summary:
                 st.subheader("Summary")
@@ -576,18 +597,18 @@ def main_app(username):
                         if st.session_state.interview_done and not st.session_state.evaluation_result:
                             st.success("✅ Interview complete! Click below to get your evaluation.")
                             if st.button("Evaluate Interview"):
-                                with st.spinner("Evaluating your responses..."):
-                                    payload = {
-                                        "transcript": st.session_state.interview_transcript,
-                                        "role": role,
-                                        "mode": st.session_state.interview_mode
-                                    }
-                                    print(f"payload is {payload}")
-                                    print(f"transcript is {payload['transcript']}")
+                                payload = {
+                                    "transcript": st.session_state.interview_transcript,
+                                    "role": role,
+                                    "mode": st.session_state.interview_mode
+                                }
+                                print(f"payload is {payload}")
+                                print(f"transcript is {payload['transcript']}")
 
-                                    result = requests.post(f"{FASTAPI_URL}/evaluates_interview/", json=payload)
-                                    st.session_state.evaluation_result = result.json()["evaluation_report"]
-                                    st.rerun()
+                                st.session_state.evaluation_result = st.write_stream(
+                                    stream_sse_tokens(f"{FASTAPI_URL}/evaluates_interview/stream", payload)
+                                )
+                                st.rerun()
                     if st.session_state.evaluation_result:
                         st.markdown("### Evaluation Report")
                         #st.text_area("Evaluation Report", st.session_state.evaluation_result, height=300)